@@ -5,10 +5,11 @@ Only contains data access functions, no table creation
 
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool, QueuePool
 import os
 from dotenv import load_dotenv
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Mapping
 from urllib.parse import quote_plus
 
 # Load environment variables
@@ -18,8 +19,45 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Read scheduled calls from the mv_calls_todo snapshot instead of executing
+# getcallstobedone() on every poll (see scripts/migrations/001_calls_todo_matview.sql).
+# The view is refreshed out of band by scripts/refresh_calls_todo.py, never on the read path
+USE_CALLS_TODO_MATVIEW = os.getenv('USE_CALLS_TODO_MATVIEW', 'false').lower() == 'true'
+CALLS_TODO_REFRESH_SECONDS = int(os.getenv('CALLS_TODO_REFRESH_SECONDS', '30'))
+
+# Columns read from each table (keep in sync with the lwl_pg_us_2 schema)
+PARTNER_COLUMNS = (
+    'partner_id', 'partner_name', 'contact_person_name', 'contact_phone',
+    'contact_email', 'contact_type', 'is_active'
+)
+PROGRAM_COLUMNS = (
+    'program_id', 'program_category_id', 'name', 'description', 'is_active', 'payment_link'
+)
+PROGRAM_EVENT_COLUMNS = (
+    'program_event_id', 'program_id', 'event_name', 'start_date', 'end_date',
+    'early_fee', 'regular_fee', 'application_deadline', 'seats', 'eligibility', 'is_active'
+)
+SCHEDULED_JOB_EVENT_COLUMNS = (
+    'scheduled_job_event_id', 'scheduled_job_id', 'partner_id', 'program_event_id',
+    'callback_time', 'call_datetime', 'is_active'
+)
+SYSTEM_PROMPT_COLUMNS = (
+    'system_prompt_id', 'system_prompt', 'ai_temperature', 'ai_model_name', 'is_active'
+)
+
+def _select_list(columns: tuple, alias: Optional[str] = None) -> str:
+    """Render a column tuple as a SELECT list, optionally qualified by a table alias"""
+    prefix = f"{alias}." if alias else ""
+    return ", ".join(f"{prefix}{column}" for column in columns)
+
 class DatabaseAccess:
-    """Database access class for reading data from PostgreSQL tables"""
+    """
+    Database access class for reading data from PostgreSQL tables
+    
+    Inside AWS Lambda the engine uses NullPool, since pooled connections do not
+    survive container freezes; long-lived processes share a QueuePool
+    (pool_size=10, max_overflow=20) so concurrent requests are not serialized.
+    """
     
     def __init__(self):
         # Try multiple environment variable sources
@@ -46,123 +84,117 @@ class DatabaseAccess:
             
             self.connection_string = f"postgresql://{encoded_user}:{encoded_password}@{self.db_host}:{self.db_port}/{self.db_name}"
         
-        # Create engine with Lambda-optimized settings
-        self.engine = create_engine(
-            self.connection_string,
-            pool_pre_ping=True,
-            pool_recycle=300,
-            pool_size=1,
-            max_overflow=0,
-            echo=False
-        )
+        if os.getenv('AWS_LAMBDA_FUNCTION_NAME'):
+            # One connection per invocation, nothing to keep across freezes
+            self.engine = create_engine(
+                self.connection_string,
+                poolclass=NullPool,
+                echo=False
+            )
+        else:
+            self.engine = create_engine(
+                self.connection_string,
+                poolclass=QueuePool,
+                pool_size=10,
+                max_overflow=20,
+                pool_pre_ping=True,
+                pool_recycle=300,
+                echo=False
+            )
         self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
     
     def get_session(self):
-        """Get database session"""
+        """
+        Get database session
+        Use as a context manager (`with db_access.get_session() as session:`)
+        so the connection is returned to the pool even when a query fails
+        """
         return self.SessionLocal()
     
-    def get_partners(self, partner_type: Optional[str] = None) -> List[Dict[str, Any]]:
+    def _fetch_all(self, query: str, params: Optional[Dict[str, Any]] = None,
+                   description: str = "query", as_mappings: bool = False) -> List[Mapping[str, Any]]:
         """
-        Get partners (schools/institutes/agencies) data
-        Args:
-            partner_type: Filter by contact_type ('Institute', 'School', 'Agency')
+        Execute a read query and return every row as a dictionary
+        With as_mappings=True the read-only RowMapping views are returned as-is,
+        skipping the per-row dict copy for callers that only read fields
+        Returns an empty list (and logs the error) if the query fails
         """
         try:
-            session = self.get_session()
-            query = "SELECT * FROM partners WHERE is_active = true"
-            params = {}
-            
-            if partner_type:
-                query += " AND contact_type = :partner_type"
-                params['partner_type'] = partner_type
-            
-            result = session.execute(text(query), params)
-            partners_raw = [dict(row._mapping) for row in result]
-            session.close()
-            
-            # Add compatibility fields for the main system
-            partners = []
-            for partner in partners_raw:
-                # Create a compatible partner record
-                compatible_partner = partner.copy()
-                
-                # Map new column names to expected ones
-                compatible_partner['contact'] = partner.get('contact_phone', '')  # Main compatibility
-                compatible_partner['location'] = partner.get('partner_name', '')  # Use partner name as location for now
-                compatible_partner['partnership_type'] = partner.get('contact_type', 'unknown')
-                
-                # Ensure required fields exist
-                if 'partner_name' not in compatible_partner:
-                    compatible_partner['partner_name'] = 'Unknown Partner'
-                
-                partners.append(compatible_partner)
-            
-            logger.info(f"Retrieved {len(partners)} active partners")
-            return partners
-            
+            with self.engine.connect() as conn:
+                rows = conn.execute(text(query), params or {}).mappings().all()
+                return rows if as_mappings else [dict(row) for row in rows]
         except Exception as e:
-            logger.error(f"Error getting partners: {str(e)}")
+            logger.error(f"Error getting {description}: {str(e)}")
             return []
     
-    def get_partner_by_id(self, partner_id: int) -> Optional[Dict[str, Any]]:
-        """Get specific partner by ID"""
+    def _fetch_one(self, query: str, params: Optional[Dict[str, Any]] = None,
+                   description: str = "query") -> Optional[Dict[str, Any]]:
+        """
+        Execute a read query and return the first row as a dictionary
+        Returns None if there is no row or the query fails
+        """
         try:
-            session = self.get_session()
-            query = "SELECT * FROM partners WHERE partner_id = :partner_id"
-            result = session.execute(text(query), {'partner_id': partner_id})
-            partner = result.fetchone()
-            session.close()
-            
-            if partner:
-                return dict(partner._mapping)
-            return None
-            
+            with self.engine.connect() as conn:
+                row = conn.execute(text(query), params or {}).mappings().first()
+                return dict(row) if row else None
         except Exception as e:
-            logger.error(f"Error getting partner by ID {partner_id}: {str(e)}")
+            logger.error(f"Error getting {description}: {str(e)}")
             return None
     
+    def get_partners(self, partner_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get partners (schools/institutes/agencies) data
+        Args:
+            partner_type: Filter by contact_type ('Institute', 'School', 'Agency')
+        """
+        query = f"SELECT {_select_list(PARTNER_COLUMNS)} FROM partners WHERE is_active = true"
+        params = {}
+        
+        if partner_type:
+            query += " AND contact_type = :partner_type"
+            params['partner_type'] = partner_type
+        
+        partners = self._fetch_all(query, params, "partners")
+        
+        # Add compatibility fields for the main system
+        for partner in partners:
+            # Map new column names to expected ones
+            partner['contact'] = partner.get('contact_phone', '')  # Main compatibility
+            partner['location'] = partner.get('partner_name', '')  # Use partner name as location for now
+            partner['partnership_type'] = partner.get('contact_type', 'unknown')
+            
+            # Ensure required fields exist
+            partner.setdefault('partner_name', 'Unknown Partner')
+        
+        logger.info(f"Retrieved {len(partners)} active partners")
+        return partners
+    
+    def get_partner_by_id(self, partner_id: int) -> Optional[Dict[str, Any]]:
+        """Get specific partner by ID"""
+        query = f"SELECT {_select_list(PARTNER_COLUMNS)} FROM partners WHERE partner_id = :partner_id"
+        return self._fetch_one(query, {'partner_id': partner_id}, f"partner by ID {partner_id}")
+    
     def get_programs(self, program_category_id: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Get programs data
         Args:
             program_category_id: Filter by program category ID if specified
         """
-        try:
-            session = self.get_session()
-            query = "SELECT * FROM programs"
-            params = {}
-            
-            if program_category_id:
-                query += " WHERE program_category_id = :program_category_id"
-                params['program_category_id'] = program_category_id
-            
-            result = session.execute(text(query), params)
-            programs = [dict(row._mapping) for row in result]
-            session.close()
-            
-            logger.info(f"Retrieved {len(programs)} programs")
-            return programs
-            
-        except Exception as e:
-            logger.error(f"Error getting programs: {str(e)}")
-            return []
+        query = f"SELECT {_select_list(PROGRAM_COLUMNS)} FROM programs"
+        params = {}
+        
+        if program_category_id:
+            query += " WHERE program_category_id = :program_category_id"
+            params['program_category_id'] = program_category_id
+        
+        programs = self._fetch_all(query, params, "programs")
+        logger.info(f"Retrieved {len(programs)} programs")
+        return programs
     
     def get_program_by_id(self, program_id: int) -> Optional[Dict[str, Any]]:
         """Get specific program by ID"""
-        try:
-            session = self.get_session()
-            query = "SELECT * FROM programs WHERE program_id = :program_id"
-            result = session.execute(text(query), {'program_id': program_id})
-            program = result.fetchone()
-            session.close()
-            
-            if program:
-                return dict(program._mapping)
-            return None
-            
-        except Exception as e:
-            logger.error(f"Error getting program by ID {program_id}: {str(e)}")
-            return None
+        query = f"SELECT {_select_list(PROGRAM_COLUMNS)} FROM programs WHERE program_id = :program_id"
+        return self._fetch_one(query, {'program_id': program_id}, f"program by ID {program_id}")
     
     def get_program_events(self, program_id: Optional[int] = None) -> List[Dict[str, Any]]:
         """
@@ -170,157 +202,98 @@ class DatabaseAccess:
         Args:
             program_id: Filter by program ID if specified
         """
-        try:
-            session = self.get_session()
-            query = """
-            SELECT pe.*, p.name as program_name, p.description as program_description
-            FROM program_events pe
-            LEFT JOIN programs p ON pe.program_id = p.program_id
-            """
-            params = {}
-            
-            if program_id:
-                query += " WHERE pe.program_id = :program_id"
-                params['program_id'] = program_id
-            
-            query += " ORDER BY pe.start_date"
-            
-            result = session.execute(text(query), params)
-            events = [dict(row._mapping) for row in result]
-            session.close()
-            
-            logger.info(f"Retrieved {len(events)} program events")
-            return events
-            
-        except Exception as e:
-            logger.error(f"Error getting program events: {str(e)}")
-            return []
+        query = f"""
+        SELECT {_select_list(PROGRAM_EVENT_COLUMNS, 'pe')}, p.name as program_name, p.description as program_description
+        FROM program_events pe
+        LEFT JOIN programs p ON pe.program_id = p.program_id
+        """
+        params = {}
+        
+        if program_id:
+            query += " WHERE pe.program_id = :program_id"
+            params['program_id'] = program_id
+        
+        query += " ORDER BY pe.start_date"
+        
+        events = self._fetch_all(query, params, "program events")
+        logger.info(f"Retrieved {len(events)} program events")
+        return events
     
     def get_program_event_by_id(self, event_id: int) -> Optional[Dict[str, Any]]:
         """Get specific program event by ID"""
-        try:
-            session = self.get_session()
-            query = """
-            SELECT pe.*, p.name as program_name, p.description as program_description
-            FROM program_events pe
-            LEFT JOIN programs p ON pe.program_id = p.program_id
-            WHERE pe.program_event_id = :event_id
-            """
-            result = session.execute(text(query), {'event_id': event_id})
-            event = result.fetchone()
-            session.close()
-            
-            if event:
-                return dict(event._mapping)
-            return None
-            
-        except Exception as e:
-            logger.error(f"Error getting program event by ID {event_id}: {str(e)}")
-            return None
+        query = f"""
+        SELECT {_select_list(PROGRAM_EVENT_COLUMNS, 'pe')}, p.name as program_name, p.description as program_description
+        FROM program_events pe
+        LEFT JOIN programs p ON pe.program_id = p.program_id
+        WHERE pe.program_event_id = :event_id
+        """
+        return self._fetch_one(query, {'event_id': event_id}, f"program event by ID {event_id}")
     
     def get_scheduled_jobs(self) -> List[Dict[str, Any]]:
         """Get scheduled jobs data"""
-        try:
-            session = self.get_session()
-            query = "SELECT * FROM scheduled_jobs ORDER BY scheduled_at"
-            result = session.execute(text(query))
-            jobs = [dict(row._mapping) for row in result]
-            session.close()
-            
-            logger.info(f"Retrieved {len(jobs)} scheduled jobs")
-            return jobs
-            
-        except Exception as e:
-            logger.error(f"Error getting scheduled jobs: {str(e)}")
-            return []
+        query = "SELECT * FROM scheduled_jobs ORDER BY scheduled_at"
+        jobs = self._fetch_all(query, description="scheduled jobs")
+        logger.info(f"Retrieved {len(jobs)} scheduled jobs")
+        return jobs
     
-    def get_scheduled_job_events(self, job_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    def get_scheduled_job_events(self, job_id: Optional[int] = None,
+                                 as_mappings: bool = False) -> List[Mapping[str, Any]]:
         """
         Get scheduled job events data
         Args:
             job_id: Filter by job ID if specified
+            as_mappings: Return read-only row mappings instead of dict copies
         """
-        try:
-            session = self.get_session()
-            query = """
-            SELECT sje.*, sj.scheduled_at as job_datetime, 
-                   pe.start_date as event_datetime, pe.early_fee, pe.regular_fee, pe.discount, pe.seats,
-                   p.name as program_name, p.description as program_description,
-                   pt.partner_name, pt.contact_phone, pt.contact_email, pt.contact_person_name, pt.contact_type as partner_type
-            FROM scheduled_job_events sje
-            LEFT JOIN scheduled_jobs sj ON sje.scheduled_job_id = sj.scheduled_job_id
-            LEFT JOIN program_events pe ON sje.program_event_id = pe.program_event_id
-            LEFT JOIN programs p ON pe.program_id = p.program_id
-            LEFT JOIN partners pt ON sje.partner_id = pt.partner_id
-            """
-            params = {}
-            
-            if job_id:
-                query += " WHERE sje.scheduled_job_id = :job_id"
-                params['job_id'] = job_id
-            
-            query += " ORDER BY sj.scheduled_at, sje.scheduled_job_event_id"
-            
-            result = session.execute(text(query), params)
-            events = [dict(row._mapping) for row in result]
-            session.close()
-            
-            logger.info(f"Retrieved {len(events)} scheduled job events")
-            return events
-            
-        except Exception as e:
-            logger.error(f"Error getting scheduled job events: {str(e)}")
-            return []
+        query = f"""
+        SELECT {_select_list(SCHEDULED_JOB_EVENT_COLUMNS, 'sje')}, sj.scheduled_at as job_datetime, 
+               pe.start_date as event_datetime, pe.early_fee, pe.regular_fee, pe.discount, pe.seats,
+               p.name as program_name, p.description as program_description,
+               pt.partner_name, pt.contact_phone, pt.contact_email, pt.contact_person_name, pt.contact_type as partner_type
+        FROM scheduled_job_events sje
+        LEFT JOIN scheduled_jobs sj ON sje.scheduled_job_id = sj.scheduled_job_id
+        LEFT JOIN program_events pe ON sje.program_event_id = pe.program_event_id
+        LEFT JOIN programs p ON pe.program_id = p.program_id
+        LEFT JOIN partners pt ON sje.partner_id = pt.partner_id
+        """
+        params = {}
+        
+        if job_id:
+            query += " WHERE sje.scheduled_job_id = :job_id"
+            params['job_id'] = job_id
+        
+        query += " ORDER BY sj.scheduled_at, sje.scheduled_job_event_id"
+        
+        events = self._fetch_all(query, params, "scheduled job events", as_mappings)
+        logger.info(f"Retrieved {len(events)} scheduled job events")
+        return events
     
     def search_programs_by_name(self, search_term: str) -> List[Dict[str, Any]]:
-        """Search programs by name"""
-        try:
-            session = self.get_session()
-            query = """
-            SELECT p.*, pt.partner_name 
-            FROM programs p
-            LEFT JOIN partners pt ON p.partner_id = pt.partner_id
-            WHERE LOWER(p.program_name) LIKE LOWER(:search_term)
-            """
-            result = session.execute(text(query), {'search_term': f'%{search_term}%'})
-            programs = [dict(row._mapping) for row in result]
-            session.close()
-            
-            return programs
-            
-        except Exception as e:
-            logger.error(f"Error searching programs: {str(e)}")
-            return []
+        """Search programs by name (case-insensitive substring, served by the pg_trgm index)"""
+        query = f"""
+        SELECT {_select_list(PROGRAM_COLUMNS, 'p')}, pt.partner_name
+        FROM programs p
+        LEFT JOIN partners pt ON p.partner_id = pt.partner_id
+        WHERE p.name ILIKE '%' || :search_term || '%'
+        """
+        return self._fetch_all(query, {'search_term': search_term}, "programs by name")
     
     def get_upcoming_events(self, days_ahead: int = 30) -> List[Dict[str, Any]]:
         """Get upcoming program events within specified days"""
-        try:
-            session = self.get_session()
-            query = """
-            SELECT pe.*, p.name as program_name, p.description as program_description
-            FROM program_events pe
-            LEFT JOIN programs p ON pe.program_id = p.program_id
-            WHERE pe.start_date >= CURRENT_DATE 
-            AND pe.start_date <= CURRENT_DATE + INTERVAL '%s days'
-            ORDER BY pe.start_date
-            """ % days_ahead
-            
-            result = session.execute(text(query))
-            events = [dict(row._mapping) for row in result]
-            session.close()
-            
-            return events
-            
-        except Exception as e:
-            logger.error(f"Error getting upcoming events: {str(e)}")
-            return []
+        query = f"""
+        SELECT {_select_list(PROGRAM_EVENT_COLUMNS, 'pe')}, p.name as program_name, p.description as program_description
+        FROM program_events pe
+        LEFT JOIN programs p ON pe.program_id = p.program_id
+        WHERE pe.start_date >= CURRENT_DATE 
+        AND pe.start_date <= CURRENT_DATE + INTERVAL '%s days'
+        ORDER BY pe.start_date
+        """ % days_ahead
+        return self._fetch_all(query, description="upcoming events")
     
     def test_connection(self) -> bool:
         """Test database connection"""
         try:
-            session = self.get_session()
-            result = session.execute(text("SELECT 1"))
-            session.close()
+            with self.engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
             logger.info("Database connection successful")
             return True
         except Exception as e:
@@ -347,40 +320,48 @@ class DatabaseAccess:
                 - system_prompt_id: Prompt ID
                 - system_prompt: AI system prompt
                 - ai_model_name: AI model to use
+        
+        When USE_CALLS_TODO_MATVIEW is enabled the rows are read from the
+        mv_calls_todo materialized view. The snapshot can be up to one refresh
+        interval old, so events that already have a call log are dropped live.
         """
-        try:
-            session = self.get_session()
-            
+        if USE_CALLS_TODO_MATVIEW:
+            source = """
+            mv_calls_todo todo
+            WHERE NOT EXISTS (
+                SELECT 1 FROM call_logs cl
+                WHERE cl.scheduled_job_event_id = todo.scheduled_job_event_id
+            )
+            """
+        else:
             # Call the function without parameters as it doesn't take any
-            query = text("SELECT * FROM getcallstobedone()")
-            result = session.execute(query)
-            
-            calls = []
-            for row in result:
-                call_data = {
-                    'contact_person_name': row.contact_person_name,
-                    'contact_type': row.contact_type,
-                    'contact_email': row.contact_email,
-                    'contact_phone': row.contact_phone.strip() if row.contact_phone else None,  # Clean phone number
-                    'partner_name': row.partner_name,
-                    'scheduled_job_event_id': row.scheduled_job_event_id,
-                    'scheduled_job_id': row.scheduled_job_id,
-                    'call_datetime': row.call_datetime,
-                    'system_prompt_id': row.system_prompt_id,
-                    'system_prompt': row.system_prompt,
-                    'ai_model_name': row.ai_model_name
-                }
-                calls.append(call_data)
-            
-            session.close()
-            logger.info(f"getcallstobedone returned {len(calls)} results")
-            return calls
-            
+            source = "getcallstobedone()"
+        
+        # Phone numbers are cleaned server-side so rows map straight to dicts
+        query = f"""
+        SELECT contact_person_name, contact_type, contact_email,
+               NULLIF(TRIM(contact_phone), '') AS contact_phone,
+               partner_name, scheduled_job_event_id, scheduled_job_id, call_datetime,
+               system_prompt_id, system_prompt, ai_model_name
+        FROM {source}
+        """
+        calls = self._fetch_all(query, description="getcallstobedone results")
+        
+        logger.info(f"getcallstobedone returned {len(calls)} results")
+        return calls
+    
+    def refresh_calls_todo(self) -> bool:
+        """
+        Refresh the mv_calls_todo snapshot of getcallstobedone()
+        Called by scripts/refresh_calls_todo.py on a schedule, not by readers
+        """
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY mv_calls_todo"))
+            return True
         except Exception as e:
-            logger.error(f"Error calling getcallstobedone function: {str(e)}")
-            if 'session' in locals():
-                session.close()
-            return []
+            logger.error(f"Error refreshing mv_calls_todo: {str(e)}")
+            return False
     
     def get_system_prompts(self, is_active: bool = True) -> List[Dict[str, Any]]:
         """
@@ -389,56 +370,40 @@ class DatabaseAccess:
         Args:
             is_active: Filter for active prompts only (default: True)
         """
-        try:
-            session = self.get_session()
-            query = "SELECT * FROM system_prompts"
-            params = {}
-            
-            if is_active:
-                query += " WHERE is_active = :is_active"
-                params['is_active'] = is_active
-            
-            query += " ORDER BY system_prompt_id"
-            
-            result = session.execute(text(query), params)
-            prompts = [dict(row._mapping) for row in result]
-            session.close()
-            
-            logger.info(f"Retrieved {len(prompts)} system prompts")
-            return prompts
-            
-        except Exception as e:
-            logger.error(f"Error getting system prompts: {str(e)}")
-            return []
+        query = f"SELECT {_select_list(SYSTEM_PROMPT_COLUMNS)} FROM system_prompts"
+        params = {}
+        
+        if is_active:
+            query += " WHERE is_active = :is_active"
+            params['is_active'] = is_active
+        
+        query += " ORDER BY system_prompt_id"
+        
+        prompts = self._fetch_all(query, params, "system prompts")
+        logger.info(f"Retrieved {len(prompts)} system prompts")
+        return prompts
     
-    def get_call_logs(self, scheduled_job_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    def get_call_logs(self, scheduled_job_id: Optional[int] = None,
+                      as_mappings: bool = False) -> List[Mapping[str, Any]]:
         """
         Get call logs from the database
         
         Args:
             scheduled_job_id: Filter by scheduled job ID if specified
+            as_mappings: Return read-only row mappings instead of dict copies
         """
-        try:
-            session = self.get_session()
-            query = "SELECT * FROM call_logs"
-            params = {}
-            
-            if scheduled_job_id:
-                query += " WHERE scheduled_job_id = :scheduled_job_id"
-                params['scheduled_job_id'] = scheduled_job_id
-            
-            query += " ORDER BY call_log_id DESC"
-            
-            result = session.execute(text(query), params)
-            logs = [dict(row._mapping) for row in result]
-            session.close()
-            
-            logger.info(f"Retrieved {len(logs)} call logs")
-            return logs
-            
-        except Exception as e:
-            logger.error(f"Error getting call logs: {str(e)}")
-            return []
+        query = "SELECT * FROM call_logs"
+        params = {}
+        
+        if scheduled_job_id:
+            query += " WHERE scheduled_job_id = :scheduled_job_id"
+            params['scheduled_job_id'] = scheduled_job_id
+        
+        query += " ORDER BY call_log_id DESC"
+        
+        logs = self._fetch_all(query, params, "call logs", as_mappings)
+        logger.info(f"Retrieved {len(logs)} call logs")
+        return logs
 
 # Global database instance
-db_access = DatabaseAccess()
+db_access = DatabaseAccess()
\ No newline at end of file
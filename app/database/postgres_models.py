@@ -4,21 +4,78 @@ Handles Partners, Programs, Program Events, Scheduled Jobs, and Scheduled Job Ev
 """
 
 import os
+import hashlib
+import functools
 import psycopg2
+from psycopg2 import sql
 from psycopg2.extras import RealDictCursor
+from psycopg2.pool import PoolError, ThreadedConnectionPool
 from dotenv import load_dotenv
 import logging
+import threading
+import weakref
 from typing import Optional, Dict, Any, List
 from contextlib import contextmanager
+from collections import namedtuple
 from datetime import datetime, timedelta
 
-# Load environment variables
-load_dotenv()
+from app.utils.ttl_cache import TTLCache
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Columns written by create_call_log
+CALL_LOG_INSERT_COLUMNS = (
+    'program_event_id', 'partner_id', 'call_sid', 'caller_number', 'recipient_number',
+    'call_start_time', 'call_end_time', 'call_duration_seconds', 'call_status',
+    'conversation_summary', 'outcome', 'recording_url', 'transcription_path',
+    'ai_prompt_used'
+)
+
+# Columns returned by call log listings; the large ai_prompt_used, recording_url
+# and transcription_path fields are left out
+CALL_LOG_LIST_COLUMNS = (
+    'call_log_id', 'program_event_id', 'partner_id', 'call_sid', 'call_status',
+    'call_start_time', 'call_end_time', 'call_duration_seconds', 'outcome',
+    'conversation_summary', 'created_at'
+)
+CALL_LOG_LIST_SELECT = ", ".join(f"cl.{column}" for column in CALL_LOG_LIST_COLUMNS)
+
+# Prepared as create_call_log; call_data is bound positionally in CALL_LOG_INSERT_COLUMNS order
+CREATE_CALL_LOG_SQL = f"""
+INSERT INTO call_logs ({', '.join(CALL_LOG_INSERT_COLUMNS)}, created_at)
+VALUES ({', '.join(f'${position}' for position in range(1, len(CALL_LOG_INSERT_COLUMNS) + 1))}, CURRENT_TIMESTAMP)
+RETURNING call_log_id"""
+
+# Lightweight row type for get_call_logs(as_rows=True)
+CallLogRow = namedtuple('CallLogRow', CALL_LOG_LIST_COLUMNS + ('partner_name', 'event_datetime', 'program_name'))
+
+@functools.lru_cache(maxsize=128)
+def _call_log_update_sql(columns: tuple, positional: bool = False, key: str = 'call_log_id') -> sql.Composed:
+    """
+    Build the UPDATE call_logs statement for a column set once and reuse it
+    positional=True renders $1..$n placeholders for use in PREPARE;
+    key is the column the last parameter is matched against
+    """
+    placeholders = [sql.SQL(f"${position}") for position in range(1, len(columns) + 2)] if positional \
+        else [sql.Placeholder()] * (len(columns) + 1)
+    set_clauses = [
+        sql.SQL("{} = {}").format(sql.Identifier(column), placeholder)
+        for column, placeholder in zip(columns, placeholders)
+    ]
+    set_clauses.append(sql.SQL("updated_at = CURRENT_TIMESTAMP"))
+    return sql.SQL("UPDATE call_logs SET {} WHERE {} = {}").format(
+        sql.SQL(", ").join(set_clauses), sql.Identifier(key), placeholders[-1]
+    )
+
+@functools.lru_cache(maxsize=128)
+def _call_log_execute_sql(columns: tuple) -> tuple:
+    """Get the prepared statement name and its EXECUTE statement for a column set"""
+    name = "upd_call_logs_" + hashlib.md5("|".join(columns).encode()).hexdigest()[:16]
+    execute = sql.SQL("EXECUTE {} ({})").format(
+        sql.Identifier(name), sql.SQL(", ").join([sql.Placeholder()] * (len(columns) + 1))
+    )
+    return name, execute
+
 class PostgreSQLManager:
     """PostgreSQL database manager for lwl_pg_us_2 database"""
     
@@ -30,43 +87,64 @@ class PostgreSQLManager:
         self.password = os.getenv('DB_PASSWORD', '')
         self.sslmode = os.getenv('DB_SSL_MODE', 'prefer')
         self.schema = os.getenv('DB_SCHEMA', 'public')
-        self._connection = None
+        self.pool_min = int(os.getenv('DB_POOL_MIN', 1))
+        self.pool_max = int(os.getenv('DB_POOL_MAX', 10))
+        self.pool_timeout = float(os.getenv('DB_POOL_TIMEOUT', 2))
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        # ThreadedConnectionPool raises as soon as it is exhausted; callers queue here instead
+        self._pool_slots = threading.BoundedSemaphore(self.pool_max)
+        # Statement names prepared on each pooled connection; entries go away with
+        # the connection object, so a reconnect always prepares again
+        self._prepared = weakref.WeakKeyDictionary()
     
-    @property
+    @functools.cached_property
     def connection_string(self) -> str:
         return f"host={self.host} port={self.port} dbname={self.database} user={self.user} password={self.password} sslmode={self.sslmode}"
     
-    def get_connection(self):
-        """Get database connection"""
-        try:
-            if self._connection is None or self._connection.closed:
-                self._connection = psycopg2.connect(self.connection_string)
-                logger.info(f"Connected to PostgreSQL database: {self.database}")
-            return self._connection
-        except psycopg2.Error as e:
-            logger.error(f"Database connection failed: {e}")
-            raise
+    def get_pool(self) -> ThreadedConnectionPool:
+        """Get the shared connection pool, creating it on first use"""
+        if self._pool is None or self._pool.closed:
+            with self._pool_lock:
+                if self._pool is None or self._pool.closed:
+                    try:
+                        self._pool = ThreadedConnectionPool(self.pool_min, self.pool_max, self.connection_string)
+                        logger.debug("Connected to PostgreSQL database: %s", self.database)
+                    except psycopg2.Error as e:
+                        logger.error(f"Database connection failed: {e}")
+                        raise
+        return self._pool
     
     @contextmanager
     def get_cursor(self, dict_cursor=True):
-        """Context manager for database cursor"""
-        conn = self.get_connection()
-        cursor_class = RealDictCursor if dict_cursor else None
-        cursor = conn.cursor(cursor_factory=cursor_class)
+        """
+        Context manager for a database cursor on a pooled connection
+        Waits up to pool_timeout seconds for a free connection when all are in use
+        """
+        if not self._pool_slots.acquire(timeout=self.pool_timeout):
+            raise PoolError(f"No database connection free after {self.pool_timeout}s (DB_POOL_MAX={self.pool_max})")
         try:
-            yield cursor
-            conn.commit()
-        except Exception as e:
-            conn.rollback()
-            logger.error(f"Database operation failed: {e}")
-            raise
+            pool = self.get_pool()
+            conn = pool.getconn()
+            cursor_class = RealDictCursor if dict_cursor else None
+            try:
+                with conn.cursor(cursor_factory=cursor_class) as cursor:
+                    yield cursor
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"Database operation failed: {e}")
+                raise
+            finally:
+                pool.putconn(conn, close=conn.closed != 0)
         finally:
-            cursor.close()
+            self._pool_slots.release()
     
-    def execute_query(self, query: str, params: tuple = None, fetch: str = 'all') -> Optional[List[Dict[Any, Any]]]:
-        """Execute a query and return results"""
+    def execute_query(self, query: str, params: tuple = None, fetch: str = 'all',
+                      dict_cursor: bool = True) -> Optional[List[Dict[Any, Any]]]:
+        """Execute a query and return results (plain tuples when dict_cursor=False)"""
         try:
-            with self.get_cursor() as cursor:
+            with self.get_cursor(dict_cursor=dict_cursor) as cursor:
                 cursor.execute(query, params)
                 
                 if fetch == 'one':
@@ -81,10 +159,39 @@ class PostgreSQLManager:
             logger.error(f"Query execution failed: {e}")
             raise
     
+    def prepare(self, cursor, name: str, statement: sql.Composable) -> None:
+        """
+        PREPARE a named statement on the cursor's connection unless already done
+        Prepared statements live for the session, so each one is parsed and
+        planned once per pooled connection
+        """
+        prepared = self._prepared.setdefault(cursor.connection, set())
+        if name not in prepared:
+            cursor.execute(sql.SQL("PREPARE {} AS {}").format(sql.Identifier(name), statement))
+            prepared.add(name)
+    
+    def execute_prepared(self, name: str, query: str, params: tuple = (), fetch: str = 'all') -> Optional[List[Dict[Any, Any]]]:
+        """
+        Execute a query through a named server-side prepared statement
+        The query uses $1..$n placeholders and must not end with a semicolon
+        """
+        execute = sql.SQL("EXECUTE {}").format(sql.Identifier(name))
+        if params:
+            execute = sql.SQL("{} ({})").format(execute, sql.SQL(", ").join([sql.Placeholder()] * len(params)))
+        
+        try:
+            with self.get_cursor() as cursor:
+                self.prepare(cursor, name, sql.SQL(query))
+                cursor.execute(execute, params)
+                return cursor.fetchone() if fetch == 'one' else cursor.fetchall()
+        except psycopg2.Error as e:
+            logger.error(f"Prepared query {name} failed: {e}")
+            raise
+    
     def close_connection(self):
-        """Close database connection"""
-        if self._connection and not self._connection.closed:
-            self._connection.close()
+        """Close all pooled database connections"""
+        if self._pool and not self._pool.closed:
+            self._pool.closeall()
             logger.info("Database connection closed")
 
 class TelecallerDBQueries:
@@ -92,6 +199,9 @@ class TelecallerDBQueries:
     
     def __init__(self, db_manager: PostgreSQLManager):
         self.db = db_manager
+        # Programs and partners are read-mostly reference data
+        self._program_cache = TTLCache(ttl=60, maxsize=2048)
+        self._partner_cache = TTLCache(ttl=60, maxsize=2048)
     
     # Programs Queries
     def get_programs(self, limit: int = 50) -> List[Dict[str, Any]]:
@@ -101,9 +211,9 @@ class TelecallerDBQueries:
                created_at, updated_at
         FROM programs 
         ORDER BY created_at DESC 
-        LIMIT %s;
+        LIMIT $1
         """
-        return self.db.execute_query(query, (limit,))
+        return self.db.execute_prepared('get_programs', query, (limit,))
     
     def get_program_by_id(self, program_id: int) -> Optional[Dict[str, Any]]:
         """Get program by ID"""
@@ -111,9 +221,11 @@ class TelecallerDBQueries:
         SELECT program_id, program_name, description, base_fees, category, 
                created_at, updated_at
         FROM programs 
-        WHERE program_id = %s;
+        WHERE program_id = $1
         """
-        return self.db.execute_query(query, (program_id,), fetch='one')
+        return self._program_cache.get_or_load(
+            program_id, lambda: self.db.execute_prepared('get_program_by_id', query, (program_id,), fetch='one')
+        )
     
     def create_program(self, program_data: Dict[str, Any]) -> int:
         """Create a new program"""
@@ -123,6 +235,7 @@ class TelecallerDBQueries:
         RETURNING program_id;
         """
         result = self.db.execute_query(query, program_data, fetch='one')
+        self._program_cache.clear()
         return result['program_id'] if result else None
     
     # Partners Queries
@@ -151,10 +264,37 @@ class TelecallerDBQueries:
         query = """
         SELECT partner_id, partner_name, contact, type, created_at, updated_at
         FROM partners 
-        WHERE partner_id = %s;
+        WHERE partner_id = $1
         """
-        return self.db.execute_query(query, (partner_id,), fetch='one')
-    
+        return self._partner_cache.get_or_load(
+            partner_id, lambda: self.db.execute_prepared('get_partner_by_id', query, (partner_id,), fetch='one')
+        )
+
+    def get_partners_by_ids(self, partner_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Get several partners in one query, skipping ones already cached
+        Returns a dictionary keyed by partner_id; unknown ids are left out
+        """
+        partners = {}
+        missing = []
+        for partner_id in set(partner_ids):
+            partner = self._partner_cache.get(partner_id)
+            if partner:
+                partners[partner_id] = partner
+            else:
+                missing.append(partner_id)
+
+        if missing:
+            query = """
+            SELECT partner_id, partner_name, contact, type, created_at, updated_at
+            FROM partners
+            WHERE partner_id = ANY(%s);
+            """
+            for row in self.db.execute_query(query, (missing,)):
+                self._partner_cache.set(row['partner_id'], row)
+                partners[row['partner_id']] = row
+        return partners
+
     def create_partner(self, partner_data: Dict[str, Any]) -> int:
         """Create a new partner"""
         query = """
@@ -163,6 +303,7 @@ class TelecallerDBQueries:
         RETURNING partner_id;
         """
         result = self.db.execute_query(query, partner_data, fetch='one')
+        self._partner_cache.clear()
         return result['partner_id'] if result else None
     
     # Program Events Queries
@@ -200,9 +341,9 @@ class TelecallerDBQueries:
                p.program_name, p.description, p.base_fees, p.category
         FROM program_events pe
         JOIN programs p ON pe.program_id = p.program_id
-        WHERE pe.program_event_id = %s;
+        WHERE pe.program_event_id = $1
         """
-        return self.db.execute_query(query, (program_event_id,), fetch='one')
+        return self.db.execute_prepared('get_program_event_by_id', query, (program_event_id,), fetch='one')
     
     def create_program_event(self, event_data: Dict[str, Any]) -> int:
         """Create a new program event"""
@@ -242,73 +383,129 @@ class TelecallerDBQueries:
     
     # Call Management Queries
     def create_call_log(self, call_data: Dict[str, Any]) -> int:
-        """Create a call log entry"""
-        query = """
-        INSERT INTO call_logs (
-            program_event_id, partner_id, call_sid, caller_number, recipient_number,
-            call_start_time, call_end_time, call_duration_seconds, call_status,
-            conversation_summary, outcome, recording_url, transcription_path,
-            ai_prompt_used, created_at
-        ) VALUES (
-            %(program_event_id)s, %(partner_id)s, %(call_sid)s, %(caller_number)s, %(recipient_number)s,
-            %(call_start_time)s, %(call_end_time)s, %(call_duration_seconds)s, %(call_status)s,
-            %(conversation_summary)s, %(outcome)s, %(recording_url)s, %(transcription_path)s,
-            %(ai_prompt_used)s, CURRENT_TIMESTAMP
-        ) RETURNING call_log_id;
         """
-        result = self.db.execute_query(query, call_data, fetch='one')
+        Create a call log entry
+        Every column in CALL_LOG_INSERT_COLUMNS must be present in call_data
+        """
+        params = tuple(call_data[column] for column in CALL_LOG_INSERT_COLUMNS)
+        result = self.db.execute_prepared('create_call_log', CREATE_CALL_LOG_SQL, params, fetch='one')
         return result['call_log_id'] if result else None
     
+    def _prepare_call_log_update(self, cursor, columns: tuple) -> sql.Composed:
+        """
+        Get the EXECUTE statement of a server-side prepared UPDATE for this column set
+        Statements are prepared once per pooled connection and then reused
+        """
+        name, execute = _call_log_execute_sql(columns)
+        self.db.prepare(cursor, name, _call_log_update_sql(columns, positional=True))
+        return execute
+    
     def update_call_log(self, call_log_id: int, update_data: Dict[str, Any]) -> bool:
         """Update call log entry"""
-        set_clauses = []
-        params = []
-        
-        for key, value in update_data.items():
-            set_clauses.append(f"{key} = %s")
-            params.append(value)
-        
-        params.append(call_log_id)
-        
-        query = f"""
-        UPDATE call_logs 
-        SET {', '.join(set_clauses)}, updated_at = CURRENT_TIMESTAMP
-        WHERE call_log_id = %s;
-        """
+        columns = tuple(update_data)
+        params = (*update_data.values(), call_log_id)
         
         try:
-            self.db.execute_query(query, tuple(params), fetch='none')
+            with self.db.get_cursor(dict_cursor=False) as cursor:
+                cursor.execute(self._prepare_call_log_update(cursor, columns), params)
             return True
         except Exception as e:
             logger.error(f"Failed to update call log {call_log_id}: {e}")
             return False
     
-    def get_call_logs(self, partner_id: Optional[int] = None, limit: int = 50) -> List[Dict[str, Any]]:
-        """Get call logs, optionally filtered by partner"""
+    def update_call_log_by_sid(self, call_sid: str, update_data: Dict[str, Any]) -> bool:
+        """Update the call log for a Twilio CallSid in one statement; returns whether a row matched"""
+        params = (*update_data.values(), call_sid)
+        
+        try:
+            with self.db.get_cursor(dict_cursor=False) as cursor:
+                cursor.execute(_call_log_update_sql(tuple(update_data), key='call_sid'), params)
+                return cursor.rowcount > 0
+        except Exception as e:
+            logger.error(f"Failed to update call log for {call_sid}: {e}")
+            return False
+    
+    def get_call_log_by_sid(self, call_sid: str) -> Optional[Dict[str, Any]]:
+        """Get the listing columns of the call log for a Twilio CallSid (idx_call_logs_call_sid)"""
+        query = f"""
+        SELECT {CALL_LOG_LIST_SELECT}
+        FROM call_logs cl
+        WHERE cl.call_sid = %s
+        ORDER BY cl.created_at DESC
+        LIMIT 1;
+        """
+        return self.db.execute_query(query, (call_sid,), fetch='one')
+    
+    def get_call_logs(self, partner_id: Optional[int] = None, limit: int = 50,
+                      after_created_at: Optional[datetime] = None,
+                      after_id: Optional[int] = None,
+                      as_rows: bool = False) -> List[Any]:
+        """
+        Get call logs, optionally filtered by partner
+        Pass the created_at and call_log_id of the last row of the previous
+        page as after_created_at/after_id to fetch the next page (keyset
+        pagination), which stays an index range scan however deep the page
+        With as_rows=True rows come back as CallLogRow namedtuples, skipping
+        the per-row dictionary built by RealDictCursor
+        """
+        conditions = []
+        params = []
+        
         if partner_id:
-            query = """
-            SELECT cl.*, p.partner_name, pe.event_datetime, pr.program_name
-            FROM call_logs cl
-            LEFT JOIN partners p ON cl.partner_id = p.partner_id
-            LEFT JOIN program_events pe ON cl.program_event_id = pe.program_event_id
-            LEFT JOIN programs pr ON pe.program_id = pr.program_id
-            WHERE cl.partner_id = %s
-            ORDER BY cl.created_at DESC
-            LIMIT %s;
-            """
-            return self.db.execute_query(query, (partner_id, limit))
-        else:
-            query = """
-            SELECT cl.*, p.partner_name, pe.event_datetime, pr.program_name
+            conditions.append("cl.partner_id = %s")
+            params.append(partner_id)
+        
+        if after_created_at is not None and after_id is not None:
+            conditions.append("(cl.created_at, cl.call_log_id) < (%s, %s)")
+            params.extend([after_created_at, after_id])
+        
+        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        params.append(limit)
+        
+        # Pick the page of call logs first so the lookups only join those rows
+        query = f"""
+        WITH top AS (
+            SELECT {CALL_LOG_LIST_SELECT}
             FROM call_logs cl
-            LEFT JOIN partners p ON cl.partner_id = p.partner_id
-            LEFT JOIN program_events pe ON cl.program_event_id = pe.program_event_id
-            LEFT JOIN programs pr ON pe.program_id = pr.program_id
-            ORDER BY cl.created_at DESC
-            LIMIT %s;
-            """
-            return self.db.execute_query(query, (limit,))
+            {where_clause}
+            ORDER BY cl.created_at DESC, cl.call_log_id DESC
+            LIMIT %s
+        )
+        SELECT {CALL_LOG_LIST_SELECT}, p.partner_name, pe.event_datetime, pr.program_name
+        FROM top cl
+        LEFT JOIN partners p ON cl.partner_id = p.partner_id
+        LEFT JOIN program_events pe ON cl.program_event_id = pe.program_event_id
+        LEFT JOIN programs pr ON pe.program_id = pr.program_id
+        ORDER BY cl.created_at DESC, cl.call_log_id DESC;
+        """
+        if as_rows:
+            return list(map(CallLogRow._make, self.db.execute_query(query, tuple(params), dict_cursor=False)))
+        return self.db.execute_query(query, tuple(params))
+
+@functools.lru_cache(maxsize=1)
+def configure() -> None:
+    """Load environment variables from .env (runs once, before the first manager is built)"""
+    load_dotenv()
+
+@functools.lru_cache(maxsize=1)
+def get_pg_manager() -> PostgreSQLManager:
+    """Get the shared database manager, created on first use"""
+    configure()
+    return PostgreSQLManager()
+
+@functools.lru_cache(maxsize=1)
+def get_telecaller_db() -> TelecallerDBQueries:
+    """Get the shared query interface, created on first use"""
+    return TelecallerDBQueries(get_pg_manager())
+
+# Module attributes kept for existing `from ... import telecaller_db` callers,
+# resolved lazily so importing this module does no configuration work
+_LAZY_INSTANCES = {
+    'pg_manager': get_pg_manager,
+    'telecaller_db': get_telecaller_db,
+}
 
-# Initialize database manager and queries
-pg_manager = PostgreSQLManager()
-telecaller_db = TelecallerDBQueries(pg_manager)
+def __getattr__(name: str):
+    if name in _LAZY_INSTANCES:
+        return _LAZY_INSTANCES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
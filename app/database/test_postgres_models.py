@@ -0,0 +1,137 @@
+"""
+Tests for the PostgreSQL query layer, run against a recording fake manager
+Run with: python -m pytest app/database/test_postgres_models.py
+"""
+
+from datetime import datetime
+
+import pytest
+
+from app.database.postgres_models import CALL_LOG_INSERT_COLUMNS, CallLogRow, TelecallerDBQueries
+
+class FakeManager:
+    """Records each query and answers it with the next canned result"""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.queries = []
+
+    def execute_query(self, query, params=None, fetch='all', dict_cursor=True):
+        self.queries.append((query, params))
+        return self.results.pop(0)
+
+    def execute_prepared(self, name, query, params=(), fetch='all'):
+        self.queries.append((query, params))
+        return self.results.pop(0)
+
+def test_first_call_log_page_has_no_keyset_condition():
+    db = FakeManager([])
+    TelecallerDBQueries(db).get_call_logs(limit=20)
+
+    query, params = db.queries[0]
+    assert '(cl.created_at, cl.call_log_id) <' not in query
+    assert 'ORDER BY cl.created_at DESC, cl.call_log_id DESC' in query
+    assert params == (20,)
+
+def test_next_call_log_page_continues_after_the_last_row():
+    db = FakeManager([])
+    last_created_at = datetime(2024, 5, 1, 12, 30)
+
+    TelecallerDBQueries(db).get_call_logs(partner_id=7, limit=20, after_created_at=last_created_at, after_id=99)
+
+    query, params = db.queries[0]
+    assert 'cl.partner_id = %s AND (cl.created_at, cl.call_log_id) < (%s, %s)' in query
+    assert 'OFFSET' not in query
+    assert params == (7, last_created_at, 99, 20)
+
+@pytest.mark.parametrize('cursor', [{'after_created_at': datetime(2024, 5, 1)}, {'after_id': 99}])
+def test_partial_keyset_cursor_is_ignored(cursor):
+    db = FakeManager([])
+    TelecallerDBQueries(db).get_call_logs(limit=20, **cursor)
+
+    assert db.queries[0][1] == (20,)
+
+def test_call_logs_as_rows():
+    row = tuple(range(len(CallLogRow._fields)))
+    db = FakeManager([row])
+
+    logs = TelecallerDBQueries(db).get_call_logs(as_rows=True)
+
+    assert logs == [CallLogRow(*row)]
+    assert logs[0].call_log_id == 0
+
+def partner(partner_id):
+    return {'partner_id': partner_id, 'partner_name': f"Partner {partner_id}"}
+
+def test_partner_lookup_is_memoized():
+    db = FakeManager(partner(1))
+    queries = TelecallerDBQueries(db)
+
+    assert queries.get_partner_by_id(1) == partner(1)
+    assert queries.get_partner_by_id(1) == partner(1)
+    assert len(db.queries) == 1
+
+def test_missing_partner_is_looked_up_again():
+    db = FakeManager(None, partner(1))
+    queries = TelecallerDBQueries(db)
+
+    assert queries.get_partner_by_id(1) is None
+    assert queries.get_partner_by_id(1) == partner(1)
+    assert len(db.queries) == 2
+
+def test_partners_are_loaded_in_one_query():
+    db = FakeManager([partner(1), partner(2)])
+    queries = TelecallerDBQueries(db)
+
+    partners = queries.get_partners_by_ids([1, 2, 2, 3])
+
+    assert partners == {1: partner(1), 2: partner(2)}
+    assert len(db.queries) == 1
+    query, params = db.queries[0]
+    assert 'partner_id = ANY(%s)' in query
+    assert sorted(params[0]) == [1, 2, 3]
+
+def test_cached_partners_are_not_queried_again():
+    db = FakeManager(partner(1), [partner(2)])
+    queries = TelecallerDBQueries(db)
+    queries.get_partner_by_id(1)
+
+    partners = queries.get_partners_by_ids([1, 2])
+
+    assert partners == {1: partner(1), 2: partner(2)}
+    assert db.queries[1][1] == ([2],)
+    # The batch lookup fills the same cache the single lookup reads
+    assert queries.get_partner_by_id(2) == partner(2)
+    assert len(db.queries) == 2
+
+def test_fully_cached_batch_skips_the_database():
+    db = FakeManager([partner(1)])
+    queries = TelecallerDBQueries(db)
+    queries.get_partners_by_ids([1])
+
+    assert queries.get_partners_by_ids([1]) == {1: partner(1)}
+    assert len(db.queries) == 1
+
+def call_log(**overrides):
+    data = dict.fromkeys(CALL_LOG_INSERT_COLUMNS)
+    data.update(call_sid='CA123', call_status='initiated', **overrides)
+    return data
+
+def test_call_log_is_created_with_a_prepared_statement():
+    db = FakeManager({'call_log_id': 5})
+
+    call_log_id = TelecallerDBQueries(db).create_call_log(call_log(call_duration_seconds=12.6))
+
+    query, params = db.queries[0]
+    assert call_log_id == 5
+    assert '$14' in query and '%s' not in query
+    assert params[CALL_LOG_INSERT_COLUMNS.index('call_duration_seconds')] == 12.6
+
+def test_call_log_missing_a_column_is_rejected():
+    data = call_log()
+    del data['outcome']
+    db = FakeManager({'call_log_id': 5})
+
+    with pytest.raises(KeyError):
+        TelecallerDBQueries(db).create_call_log(data)
+    assert db.queries == []
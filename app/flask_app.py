@@ -1,29 +1,339 @@
 from flask import Flask, request, jsonify, render_template
+from flask.json.provider import DefaultJSONProvider
 from flask_sock import Sock
+from jinja2 import FileSystemBytecodeCache
+from twilio.rest import Client
 import logging
+import os
 from app.services.database_service import DatabaseService
 from app.services.twilio_service import TwilioService
 from app.services.rag_service import RAGService
 from app.services.conversation_flow import ConversationFlow
 from app.services.ses_templated_email_service import SESTemplatedEmailService
 from app.config.settings import AppConfig
+from app.utils.ttl_cache import TTLCache
+from app.utils.queued_logging import configure_queued_logging
+from app.utils.background_jobs import BackgroundJobs, wants_async
+from app.models.email_requests import (
+    SignupEmailRequest, ForgotPasswordEmailRequest, OTPEmailRequest,
+    OrderConfirmationEmailRequest, WelcomePackEmailRequest
+)
+from pydantic import ValidationError
 import json
 from datetime import datetime
 import base64
+import concurrent.futures
+import functools
+from collections import deque
+import hashlib
+import re
+import uuid
+from xml.sax.saxutils import quoteattr
 
 logger = logging.getLogger(__name__)
 
+# Optional C JSON codec for media stream messages (one per 20ms frame) and API responses
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Optional response compression for partner/event lists and the dashboard
+try:
+    from flask_compress import Compress
+    COMPRESS_AVAILABLE = True
+except ImportError:
+    COMPRESS_AVAILABLE = False
+
+if ORJSON_AVAILABLE:
+    stream_json_loads = orjson.loads
+    
+    def stream_json_dumps(obj):
+        # Twilio expects text frames, so send str rather than orjson's bytes
+        return orjson.dumps(obj).decode('utf-8')
+else:
+    stream_json_loads = json.loads
+    stream_json_dumps = json.dumps
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson for jsonify() and request.get_json()
+    Dates still go through Flask's default hook so responses keep their format;
+    pretty-printed (debug) output falls back to the stdlib encoder.
+    """
+    
+    def dumps(self, obj, **kwargs):
+        if kwargs.get('indent'):
+            return super().dumps(obj, **kwargs)
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+# Upper bound on simultaneous outbound Twilio call requests
+MAX_CONCURRENT_CALLS = 10
+
+# Event call batches processed at once; each uses up to MAX_CONCURRENT_CALLS requests
+CALL_JOB_WORKERS = 2
+
+# Worker threads that process Twilio call status callbacks
+STATUS_CALLBACK_WORKERS = 4
+
+# How long an Idempotency-Key on an email send is remembered
+IDEMPOTENCY_TTL_SECONDS = 600
+IDEMPOTENCY_PENDING = object()
+
+# Worker threads shared by all media streams for STT -> AI -> TTS turns
+STREAM_TURN_WORKERS = 8
+
+# Energy-based endpointing for Twilio's 20ms 8kHz mu-law media frames
+SPEECH_RMS_THRESHOLD = 500
+END_OF_UTTERANCE_SILENT_FRAMES = 25  # 500ms of trailing silence ends a turn
+MAX_UTTERANCE_BYTES = 80000  # Force a turn after 10s of continuous audio (8000 bytes/s)
+
+def _ulaw_to_linear(byte):
+    """Decode one G.711 mu-law byte to a 16-bit linear sample"""
+    byte = ~byte & 0xFF
+    sample = (((byte & 0x0F) << 3) + 0x84) << ((byte >> 4) & 0x07)
+    return 0x84 - sample if byte & 0x80 else sample - 0x84
+
+# Squared linear sample for every mu-law byte, so frame energy needs no audio codec module
+ULAW_SQUARED = [_ulaw_to_linear(byte) ** 2 for byte in range(256)]
+
+# Conversation history kept per call and sent as AI context; older turns drop off
+MAX_HISTORY_MESSAGES = 10
+
+# Fixed reply used whenever response generation fails; its audio is pre-warmed
+TECHNICAL_DIFFICULTIES_REPLY = "I apologize, but I'm having some technical difficulties. Let me transfer you to a human representative."
+
+# Closing instructions appended to every event call prompt
+CALL_PROMPT_CLOSING = "\n\nBe professional, friendly, and provide information about the program and event. Ask if they have any questions."
+
+# TwiML for the voice webhook; only the stream URL and name vary per call
+STREAM_TWIML_TEMPLATE = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<Response>'
+    '<Say voice="alice" language="en">Hello! Please hold while I connect you to our AI assistant.</Say>'
+    '<Start><Stream url={url} track="both_tracks" name={name}/></Start>'
+    '<Pause length="60"/>'
+    '</Response>'
+)
+
+ERROR_TWIML = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<Response>'
+    '<Say voice="alice">Sorry, there was an error connecting. Please try again later.</Say>'
+    '<Hangup/>'
+    '</Response>'
+)
+
+# Static body of GET /api/templated-email/status
+TEMPLATED_EMAIL_STATUS = {
+    'success': True,
+    'service': 'SES Templated Email Service',
+    'status': 'healthy',
+    'available_templates': [
+        'AccountSignupTemplate',
+        'ForgotPasswordTemplate',
+        'OTPTemplate',
+        'OrderConfirmationTemplate'
+    ],
+    'special_endpoints': [
+        'WelcomePackWithPDF (uses SendRawEmail)'
+    ],
+    'version': '1.0.0',
+    'endpoints': {
+        'POST /api/templated-email/create-templates': 'Create all SES email templates',
+        'POST /api/templated-email/send-signup': 'Send account signup email',
+        'POST /api/templated-email/send-forgot-password': 'Send password reset email',
+        'POST /api/templated-email/send-otp': 'Send OTP verification email',
+        'POST /api/templated-email/send-order-confirmation': 'Send order confirmation email',
+        'POST /api/templated-email/send-welcome-pack': 'Send welcome pack email with PDF',
+        'GET /api/templated-email/jobs/<job_id>': 'Get the result of an email sent with Prefer: respond-async',
+        'GET /api/templated-email/status': 'Get templated email service status'
+    }
+}
+
+# Fixed API error messages whose JSON bodies are built once at startup
+STATIC_ERROR_MESSAGES = (
+    'Program ID and Event ID are required',
+    'Event not found',
+    'No participants found for this event',
+    'Call job not found',
+    'Email job not found',
+    'A request with this Idempotency-Key is still being processed'
+)
+
+# Log line per terminal Twilio call status, called with (call_sid, duration)
+CALL_STATUS_LOGGERS = {
+    'completed': lambda call_sid, duration: logger.info(f"✅ Call {call_sid} completed successfully after {duration} seconds"),
+    'busy': lambda call_sid, duration: logger.warning(f"📞 Call {call_sid} was busy"),
+    'no-answer': lambda call_sid, duration: logger.warning(f"📞 Call {call_sid} - no answer"),
+    'failed': lambda call_sid, duration: logger.error(f"❌ Call {call_sid} failed")
+}
+
+_NON_DIGITS_RE = re.compile(r'\D+')
+
+def format_indian_phone(phone_number):
+    """Format phone number with +91 country code for India"""
+    if not phone_number:
+        return phone_number
+    
+    # Remove any spaces, dashes, or parentheses
+    clean_phone = _NON_DIGITS_RE.sub('', str(phone_number))
+    
+    # If it's a 10-digit number, add +91
+    if len(clean_phone) == 10:
+        return f"+91{clean_phone}"
+    # If it already has +91, keep it
+    elif str(phone_number).startswith('+91'):
+        return phone_number
+    # If it has 91 prefix but no +, add +
+    elif len(clean_phone) == 12 and clean_phone.startswith('91'):
+        return f"+{clean_phone}"
+    else:
+        return phone_number
+
+def parse_email_request(model):
+    """
+    Parse and validate a templated email request body in one pass
+    Returns (data, None) on success or (None, 400 response) when it is invalid
+    """
+    try:
+        return model.model_validate_json(request.get_data()).model_dump(), None
+    except ValidationError as e:
+        return None, (jsonify({
+            'success': False,
+            'error': model.required_message,
+            'details': e.errors(include_url=False, include_input=False)
+        }), 400)
+
 def create_flask_app(ngrok_url=None):
     """Create and configure Flask application with enhanced dashboard"""
+    configure_queued_logging()
     app = Flask(__name__, template_folder='../templates')
+    if ORJSON_AVAILABLE:
+        app.json = OrjsonProvider(app)
     sock = Sock(app)
     
+    if COMPRESS_AVAILABLE:
+        app.config.update(
+            COMPRESS_ALGORITHM=['br', 'gzip'],
+            COMPRESS_MIN_SIZE=500,
+            COMPRESS_LEVEL=4,
+            COMPRESS_BR_LEVEL=4,
+            COMPRESS_MIMETYPES=[
+                'text/html', 'text/css', 'text/xml', 'application/json',
+                'application/javascript', 'application/x-ndjson'
+            ],
+            COMPRESS_STREAMS=True
+        )
+        Compress(app)
+    
+    # Keep compiled templates across restarts; outside debug mode templates are not re-checked per render
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(os.getenv('JINJA_CACHE_DIR'))
+    
     # Initialize services
     config = AppConfig()
     db_service = DatabaseService()
     twilio_service = TwilioService(ngrok_url=ngrok_url)
     templated_email_service = SESTemplatedEmailService()
     
+    # Short-lived caches for the dashboard render and its JSON lookups
+    dashboard_cache = TTLCache(ttl=30, maxsize=1)
+    lookup_cache = TTLCache(ttl=60, maxsize=512)
+    # Synthesized audio keyed by (sha1(text), voice); greetings and fixed replies repeat across calls
+    tts_cache = TTLCache(ttl=86400, maxsize=256)
+    # Twilio's verified caller IDs change rarely; avoid a paginated API call per debug hit
+    verified_numbers_cache = TTLCache(ttl=300, maxsize=1)
+    
+    # Event call batches run in the background; their status is kept for an hour for polling
+    call_job_executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=CALL_JOB_WORKERS,
+        thread_name_prefix='call-job'
+    )
+    call_job_status = TTLCache(ttl=3600, maxsize=1024)
+    
+    # Slow sends (PDF rendering, SES) queued by clients that send Prefer: respond-async
+    email_jobs = BackgroundJobs(max_workers=4, name='email-job')
+    
+    # Twilio status callbacks are logged and stored off the request path
+    status_executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=STATUS_CALLBACK_WORKERS,
+        thread_name_prefix='call-status'
+    )
+    
+    # Error bodies for fixed messages are serialized once; others per response
+    static_error_bodies = {
+        message: app.json.dumps({'success': False, 'error': message}) + '\n'
+        for message in STATIC_ERROR_MESSAGES
+    }
+    
+    def error_response(message, status=500):
+        """Build the {'success': False, 'error': message} JSON response shared by the API routes"""
+        body = static_error_bodies.get(message)
+        if body is None:
+            body = app.json.dumps({'success': False, 'error': message}) + '\n'
+        return app.response_class(body, status=status, mimetype='application/json')
+    
+    # Responses to email sends keyed by Idempotency-Key, so client retries don't send twice
+    idempotency_cache = TTLCache(ttl=IDEMPOTENCY_TTL_SECONDS, maxsize=10000)
+    gunicorn_workers = int(os.getenv('GUNICORN_WORKERS', '1'))
+    if gunicorn_workers > 1:
+        # The cache is per process: a retry that reaches another worker is sent again
+        logger.error(
+            f"❌ GUNICORN_WORKERS={gunicorn_workers}: Idempotency-Key responses are kept per worker process, "
+            f"so retried email sends are only de-duplicated with a single worker"
+        )
+    
+    def idempotent(view):
+        """
+        Replay the stored response when a request repeats an Idempotency-Key
+        A retry that arrives while the first attempt is still running gets 409;
+        server errors are not stored so the client can retry them.
+        """
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            idempotency_key = request.headers.get('Idempotency-Key')
+            if not idempotency_key:
+                return view(*args, **kwargs)
+            
+            cache_key = (request.path, idempotency_key)
+            while not idempotency_cache.add(cache_key, IDEMPOTENCY_PENDING):
+                stored = idempotency_cache.get(cache_key)
+                if stored is IDEMPOTENCY_PENDING:
+                    return error_response('A request with this Idempotency-Key is still being processed', 409)
+                if stored is not None:
+                    body, status, mimetype = stored
+                    response = app.response_class(body, status=status, mimetype=mimetype)
+                    response.headers['Idempotent-Replayed'] = 'true'
+                    return response
+                # The entry expired between add and get; try to claim it again
+            
+            try:
+                response = app.make_response(view(*args, **kwargs))
+            except Exception:
+                idempotency_cache.pop(cache_key)
+                raise
+            if response.status_code >= 500:
+                idempotency_cache.pop(cache_key)
+            else:
+                idempotency_cache.set(cache_key, (response.get_data(), response.status_code, response.mimetype))
+            return response
+        return wrapper
+    
+    # Media stream turns run here so the WebSocket receive loop never blocks on them
+    turn_executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=STREAM_TURN_WORKERS,
+        thread_name_prefix='stream-turn'
+    )
+    
     # Initialize AI services with proper error handling
     try:
         if config.openai_api_key:
@@ -48,21 +358,24 @@ def create_flask_app(ngrok_url=None):
             'service': 'AI Telecaller System',
             'version': '2.0.0',
             'ngrok_url': ngrok_url,
-            'dashboard_url': f'{ngrok_url}/dashboard' if ngrok_url else '/dashboard'
+            'dashboard_url': f'{ngrok_url}/dashboard' if ngrok_url else '/dashboard',
+            'db_pool': db_service.get_pool_stats()
         })
     
     @app.route('/dashboard')
     def dashboard():
         """Enhanced dashboard with partner, program, and event data from database"""
         try:
-            # Get data from database
-            partners = db_service.get_all_partners() or []
-            programs = db_service.get_all_programs() or []
-            events = db_service.get_program_events() or []
+            cached_page = dashboard_cache.get('dashboard')
+            if cached_page is not None:
+                return cached_page
             
-            # Get recent calls and database stats
-            recent_calls = db_service.get_call_records(10) or []
-            db_stats = db_service.get_database_stats()
+            # Get partners, programs, events, recent calls and stats in one round-trip
+            snapshot = db_service.get_dashboard_snapshot()
+            partners = snapshot['partners']
+            programs = snapshot['programs']
+            events = snapshot['events']
+            recent_calls = snapshot['recent_calls']
             
             # System status
             system_status = {
@@ -73,13 +386,15 @@ def create_flask_app(ngrok_url=None):
                 'database_connected': True
             }
             
-            return render_template('dashboard.html',
+            page = render_template('dashboard.html',
                                  partners=partners,
                                  programs=programs,
                                  events=events,
                                  recent_calls=recent_calls,
                                  system_status=system_status,
                                  ngrok_url=ngrok_url)
+            dashboard_cache.set('dashboard', page)
+            return page
             
         except Exception as e:
             logger.error(f"❌ Dashboard error: {e}")
@@ -90,7 +405,10 @@ def create_flask_app(ngrok_url=None):
         """Get events for a specific program"""
         try:
             logger.info(f"🔍 Fetching events for program ID: {program_id}")
-            events = db_service.get_program_events(program_id)
+            events = lookup_cache.get_or_load(
+                ('program_events', program_id),
+                lambda: db_service.get_program_events(program_id)
+            )
             logger.info(f"📅 Found {len(events)} events for program {program_id}")
             return jsonify({
                 'success': True,
@@ -98,49 +416,45 @@ def create_flask_app(ngrok_url=None):
             })
         except Exception as e:
             logger.error(f"Error fetching program events: {e}")
-            return jsonify({
-                'success': False,
-                'error': str(e)
-            }), 500
+            return error_response(str(e))
 
     @app.route('/dashboard/event/<int:event_id>/participants')
     def get_event_participants_api(event_id):
         """Get participants for a specific event"""
         try:
-            participants = db_service.get_event_participants(event_id)
+            participants = lookup_cache.get_or_load(
+                ('event_participants', event_id),
+                lambda: db_service.get_event_participants(event_id)
+            )
             return jsonify({
                 'success': True,
                 'participants': participants
             })
         except Exception as e:
             logger.error(f"Error fetching event participants: {e}")
-            return jsonify({
-                'success': False,
-                'error': str(e)
-            }), 500
+            return error_response(str(e))
 
+    def fetch_verified_numbers():
+        """List the account's outgoing caller IDs (verified numbers) from Twilio"""
+        # Reuse TwilioService's client and its HTTP session when it has real credentials
+        client = twilio_service.client or Client(
+            os.getenv('TWILIO_ACCOUNT_SID'),
+            os.getenv('TWILIO_AUTH_TOKEN')
+        )
+        
+        return [
+            {
+                'phone_number': caller_id.phone_number,
+                'friendly_name': caller_id.friendly_name
+            }
+            for caller_id in client.outgoing_caller_ids.list()
+        ]
+    
     @app.route('/debug/verified-numbers')
     def get_verified_numbers():
         """Debug endpoint to check verified phone numbers in Twilio account"""
         try:
-            # Try to get verified numbers from Twilio
-            from twilio.rest import Client
-            import os
-            
-            account_sid = os.getenv('TWILIO_ACCOUNT_SID')
-            auth_token = os.getenv('TWILIO_AUTH_TOKEN')
-            
-            client = Client(account_sid, auth_token)
-            verified_numbers = []
-            
-            # Get outgoing caller IDs (verified numbers)
-            caller_ids = client.outgoing_caller_ids.list()
-            
-            for caller_id in caller_ids:
-                verified_numbers.append({
-                    'phone_number': caller_id.phone_number,
-                    'friendly_name': caller_id.friendly_name
-                })
+            verified_numbers = verified_numbers_cache.get_or_load('verified_numbers', fetch_verified_numbers)
             
             return jsonify({
                 'success': True,
@@ -156,6 +470,73 @@ def create_flask_app(ngrok_url=None):
                 'message': 'Could not retrieve verified numbers'
             }), 500
 
+    def place_event_call(job, event_id):
+        """Place one event call and record it in call_logs as soon as Twilio accepts it"""
+        call_response = twilio_service.make_call(**job)
+        if call_response and call_response.get('call_sid'):
+            # Recorded right away so the call's status callbacks find its row
+            db_service.record_call({
+                'call_sid': call_response['call_sid'],
+                'partner_id': job['call_metadata'].get('partner_id'),
+                'program_event_id': event_id,
+                'caller_number': call_response.get('from_number'),
+                'recipient_number': job['to_number'],
+                'call_status': call_response.get('status')
+            })
+        return call_response
+    
+    def run_call_job(job_id, call_jobs, event_id, event_name):
+        """Place a queued batch of event calls and record the outcome under job_id"""
+        call_sids = []
+        failed = 0
+        call_job_status.set(job_id, {'status': 'running', 'event_id': event_id, 'queued': len(call_jobs)})
+        
+        try:
+            # make_call is a blocking HTTPS request to Twilio; cap concurrency to stay under rate limits
+            with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_CONCURRENT_CALLS) as executor:
+                future_to_job = {
+                    executor.submit(place_event_call, job, event_id): job
+                    for job in call_jobs
+                }
+                
+                for future in concurrent.futures.as_completed(future_to_job):
+                    job = future_to_job[future]
+                    phone = job['to_number']
+                    try:
+                        call_response = future.result()
+                        
+                        if call_response and call_response.get('call_sid'):
+                            call_sids.append(call_response['call_sid'])
+                            logger.info(f"✅ Call initiated to {phone}: {call_response['call_sid']}")
+                        else:
+                            failed += 1
+                            logger.error(f"❌ Failed to get call SID for {phone}")
+                        
+                    except Exception as call_error:
+                        failed += 1
+                        logger.error(f"❌ Failed to call {phone}: {call_error}")
+            
+            dashboard_cache.clear()
+            
+            call_job_status.set(job_id, {
+                'status': 'completed',
+                'event_id': event_id,
+                'queued': len(call_jobs),
+                'total_calls': len(call_sids),
+                'failed': failed,
+                'call_sids': call_sids,
+                'message': f'Successfully initiated {len(call_sids)} calls for {event_name}'
+            })
+        except Exception as e:
+            logger.error(f"❌ Call job {job_id} failed: {e}")
+            call_job_status.set(job_id, {
+                'status': 'failed',
+                'event_id': event_id,
+                'queued': len(call_jobs),
+                'call_sids': call_sids,
+                'error': str(e)
+            })
+    
     @app.route('/dashboard/call-with-program', methods=['POST'])
     def make_call_with_program():
         """Make calls to all participants of a specific event"""
@@ -165,82 +546,81 @@ def create_flask_app(ngrok_url=None):
             event_id = data.get('event_id')
             
             if not program_id or not event_id:
-                return jsonify({
-                    'success': False,
-                    'error': 'Program ID and Event ID are required'
-                }), 400
+                return error_response('Program ID and Event ID are required', 400)
             
             # Get event details
-            events = db_service.get_program_events(program_id)
-            event = next((e for e in events if e.get('id') == event_id), None)
+            event = db_service.get_event_by_id(event_id, program_id=program_id)
             
             if not event:
-                return jsonify({
-                    'success': False,
-                    'error': 'Event not found'
-                }), 404
+                return error_response('Event not found', 404)
             
             # Get participants
             participants = db_service.get_event_participants(event_id)
-            call_sids = []
             
             if participants:
-                for participant in participants:
-                    if participant.get('phone'):
-                        try:
-                            program_name = event.get('program_name', 'Our Program')
-                            event_name = event.get('name', 'Event')
-                            
-                            system_prompt = f"""You are calling {participant.get('name', 'Partner')} from Global Learning Academy about the {program_name} program.
+                program_name = event.get('program_name', 'Our Program')
+                event_name = event.get('name', 'Event')
+                
+                # The prompt only varies by participant name and organization; build the event part once
+                event_prompt = f"""from Global Learning Academy about the {program_name} program.
 Event: {event_name}
 Event Date: {event.get('event_date', '')}
-Organization: {participant.get('organization', '')}
-
-Be professional, friendly, and provide information about the program and event. Ask if they have any questions."""
-                            
-                            call_response = twilio_service.make_call(
-                                to_number=participant['phone'],
-                                system_prompt=system_prompt,
-                                call_metadata={
-                                    'partner_name': participant.get('name', 'Partner'),
-                                    'program_name': program_name,
-                                    'event_name': event_name,
-                                    'event_date': event.get('event_date', ''),
-                                    'program_id': program_id,
-                                    'event_id': event_id,
-                                    'partner_id': participant.get('id'),
-                                    'organization': participant.get('organization', '')
-                                }
-                            )
-                            
-                            if call_response and call_response.get('call_sid'):
-                                call_sids.append(call_response['call_sid'])
-                                logger.info(f"✅ Call initiated to {participant['phone']}: {call_response['call_sid']}")
-                            else:
-                                logger.error(f"❌ Failed to get call SID for {participant['phone']}")
-                            
-                        except Exception as call_error:
-                            logger.error(f"❌ Failed to call {participant['phone']}: {call_error}")
-                            continue
+Organization: """
+                
+                # Build every call up front, then place them concurrently
+                call_jobs = []
+                for participant in participants:
+                    if participant.get('phone'):
+                        system_prompt = (
+                            f"You are calling {participant.get('name', 'Partner')} {event_prompt}"
+                            f"{participant.get('organization', '')}{CALL_PROMPT_CLOSING}"
+                        )
+                        
+                        call_jobs.append({
+                            'to_number': participant['phone'],
+                            'system_prompt': system_prompt,
+                            'call_metadata': {
+                                'partner_name': participant.get('name', 'Partner'),
+                                'program_name': program_name,
+                                'event_name': event_name,
+                                'event_date': event.get('event_date', ''),
+                                'program_id': program_id,
+                                'event_id': event_id,
+                                'partner_id': participant.get('id'),
+                                'organization': participant.get('organization', '')
+                            }
+                        })
+                
+                # Hand the Twilio requests to a background job and return straight away
+                job_id = uuid.uuid4().hex
+                call_job_status.set(job_id, {
+                    'status': 'queued',
+                    'event_id': event_id,
+                    'queued': len(call_jobs)
+                })
+                call_job_executor.submit(run_call_job, job_id, call_jobs, event_id, event_name)
                 
                 return jsonify({
                     'success': True,
-                    'total_calls': len(call_sids),
-                    'call_sids': call_sids,
-                    'message': f'Successfully initiated {len(call_sids)} calls for {event_name}'
-                })
+                    'job_id': job_id,
+                    'queued': len(call_jobs),
+                    'status_url': f'/dashboard/call-status/{job_id}',
+                    'message': f'Queued {len(call_jobs)} calls for {event_name}'
+                }), 202
             else:
-                return jsonify({
-                    'success': False,
-                    'error': 'No participants found for this event'
-                }), 404
+                return error_response('No participants found for this event', 404)
                 
         except Exception as e:
             logger.error(f"❌ Error making calls with program: {e}")
-            return jsonify({
-                'success': False,
-                'error': str(e)
-            }), 500
+            return error_response(str(e))
+
+    @app.route('/dashboard/call-status/<job_id>')
+    def get_call_job_status(job_id):
+        """Get the progress of a queued event call job"""
+        job = call_job_status.get(job_id)
+        if job is None:
+            return error_response('Call job not found', 404)
+        return jsonify({'success': True, 'job_id': job_id, **job})
 
     @app.route('/dashboard/call', methods=['POST'])
     def make_individual_call():
@@ -249,27 +629,6 @@ Be professional, friendly, and provide information about the program and event.
             data = request.get_json()
             phone = data.get('phone_number')
             
-            # Format phone number with Indian country code if needed
-            def format_indian_phone(phone_number):
-                """Format phone number with +91 country code for India"""
-                if not phone_number:
-                    return phone_number
-                    
-                # Remove any spaces, dashes, or parentheses
-                clean_phone = ''.join(c for c in str(phone_number) if c.isdigit())
-                
-                # If it's a 10-digit number, add +91
-                if len(clean_phone) == 10:
-                    return f"+91{clean_phone}"
-                # If it already has +91, keep it
-                elif phone_number.startswith('+91'):
-                    return phone_number
-                # If it has 91 prefix but no +, add +
-                elif len(clean_phone) == 12 and clean_phone.startswith('91'):
-                    return f"+{clean_phone}"
-                else:
-                    return phone_number
-            
             # Format the phone number properly
             phone = format_indian_phone(phone)
             partner_id = data.get('partner_id')
@@ -285,20 +644,17 @@ Be professional, friendly, and provide information about the program and event.
             event_name = ""
             
             if partner_id:
-                partners = db_service.get_all_partners()
-                partner = next((p for p in partners if p.get('id') == partner_id), None)
+                partner = db_service.get_partner_by_id(partner_id, active_only=True)
                 if partner:
                     partner_name = partner.get('name', 'Partner')
             
             if program_id:
-                programs = db_service.get_all_programs()
-                program = next((p for p in programs if p.get('id') == program_id), None)
+                program = db_service.get_program_by_id(program_id, active_only=True)
                 if program:
                     program_name = program.get('name', 'Our Program')
             
             if event_id:
-                events = db_service.get_program_events()
-                event = next((e for e in events if e.get('id') == event_id), None)
+                event = db_service.get_event_by_id(event_id)
                 if event:
                     event_name = event.get('name', '')
             
@@ -340,6 +696,7 @@ Be professional, friendly, and provide information about the program. Ask if the
             
             if call_response and call_response.get('call_sid'):
                 logger.info(f"✅ Call initiated successfully - SID: {call_response['call_sid']}")
+                dashboard_cache.clear()
                 return jsonify({
                     'success': True,
                     'message': f'Call initiated to {partner_name} ({phone}) about {program_name}',
@@ -365,10 +722,6 @@ Be professional, friendly, and provide information about the program. Ask if the
             logger.info(f"Request method: {request.method}")
             logger.info(f"Request data: {request.values}")
             
-            # Create TwiML response for real-time streaming
-            from twilio.twiml import VoiceResponse, Stream
-            response = VoiceResponse()
-            
             # Get call information
             call_sid = request.values.get('CallSid')
             from_number = request.values.get('From')
@@ -379,35 +732,19 @@ Be professional, friendly, and provide information about the program. Ask if the
             # Get call context from database if available
             call_context = get_call_context(call_sid, to_number, from_number)
             
-            # Start with a brief greeting while setting up streaming
-            response.say(
-                "Hello! Please hold while I connect you to our AI assistant.",
-                voice='alice',
-                language='en'
+            # Greet, start media streaming (both tracks) and keep the call alive for 60s
+            twiml = STREAM_TWIML_TEMPLATE.format(
+                url=quoteattr(f"{request.url_root.rstrip('/')}/stream"),
+                name=quoteattr(f"call_{call_sid}")
             )
             
-            # Start media streaming for real-time AI conversation
-            start_stream = Stream()
-            start_stream.url = f"{request.url_root.rstrip('/')}/stream"
-            start_stream.track = "both_tracks"  # Capture both inbound and outbound audio
-            start_stream.name = f"call_{call_sid}"
-            
-            response.append(start_stream)
-            
-            # Keep the call alive for streaming
-            response.pause(length=60)  # Allow up to 60 seconds of conversation
-            
             logger.info("✅ Real-time streaming TwiML response generated")
-            return str(response), 200, {'Content-Type': 'text/xml'}
+            return twiml, 200, {'Content-Type': 'text/xml'}
             
         except Exception as e:
             logger.error(f"❌ Voice webhook error: {e}")
             # Fallback response
-            from twilio.twiml import VoiceResponse
-            response = VoiceResponse()
-            response.say("Sorry, there was an error connecting. Please try again later.", voice='alice')
-            response.hangup()
-            return str(response), 200, {'Content-Type': 'text/xml'}
+            return ERROR_TWIML, 200, {'Content-Type': 'text/xml'}
     
     def get_call_context(call_sid, to_number, from_number):
         """Get context for the call from database"""
@@ -423,15 +760,8 @@ Be professional, friendly, and provide information about the program. Ask if the
             
             # Try to get partner information based on phone number
             try:
-                partners = db_service.get_all_partners()
-                partner = None
-                
                 # Match by phone number (try both directions)
-                for p in partners:
-                    partner_phone = p.get('phone', '')
-                    if partner_phone in [to_number, from_number]:
-                        partner = p
-                        break
+                partner = db_service.get_partner_by_phone_in([to_number, from_number])
                 
                 if partner:
                     call_context.update({
@@ -459,16 +789,19 @@ Be professional, friendly, and provide information about the program. Ask if the
         conversation_state = {
             'call_sid': None,
             'context': {},
-            'conversation_history': [],
-            'audio_buffer': [],
-            'is_speaking': False
+            'conversation_history': deque(maxlen=MAX_HISTORY_MESSAGES),
+            'audio_buffer': bytearray(),
+            'heard_speech': False,
+            'silent_frames': 0,
+            'is_speaking': False,
+            'turn': None
         }
         
         try:
             while True:
                 message = sock.receive()
                 if message:
-                    data = json.loads(message)
+                    data = stream_json_loads(message)
                     event_type = data.get('event')
                     
                     if event_type == 'connected':
@@ -484,14 +817,7 @@ Be professional, friendly, and provide information about the program. Ask if the
                         conversation_state['context'] = get_stream_context(stream_data)
                         
                         # Send initial AI greeting
-                        initial_response = generate_ai_response(
-                            "",  # No user input yet
-                            conversation_state['context'],
-                            conversation_state['conversation_history']
-                        )
-                        
-                        if initial_response:
-                            send_ai_audio_response(sock, initial_response, conversation_state)
+                        submit_turn(conversation_state, run_greeting_turn, sock, conversation_state)
                         
                     elif event_type == 'media':
                         # Handle incoming audio from caller
@@ -529,6 +855,69 @@ Be professional, friendly, and provide information about the program. Ask if the
             logger.error(f"Error getting stream context: {e}")
             return {}
     
+    def turn_in_flight(conversation_state):
+        """Check whether the call's previous turn is still running"""
+        turn = conversation_state.get('turn')
+        return turn is not None and not turn.done()
+    
+    def submit_turn(conversation_state, fn, *args):
+        """
+        Run a conversation turn on the shared turn executor
+        Returns False while the call's previous turn is still running so turns stay ordered
+        """
+        if turn_in_flight(conversation_state):
+            return False
+        conversation_state['turn'] = turn_executor.submit(fn, *args)
+        return True
+    
+    def run_greeting_turn(sock, conversation_state):
+        """Generate and send the opening AI greeting"""
+        try:
+            initial_response = generate_ai_response(
+                "",  # No user input yet
+                conversation_state['context'],
+                conversation_state['conversation_history']
+            )
+            
+            if initial_response:
+                send_ai_audio_response(sock, initial_response, conversation_state)
+                record_turn(conversation_state, None, initial_response)
+        except Exception as e:
+            logger.error(f"Error sending AI greeting: {e}")
+    
+    def run_audio_turn(audio_bytes, conversation_state, sock):
+        """Transcribe buffered caller audio, then generate and send the AI reply"""
+        try:
+            audio_text = transcribe_audio(audio_bytes)
+            
+            if audio_text and audio_text.strip():
+                # Generate AI response; the caller's words go in as user_input, not history
+                ai_response = generate_ai_response(
+                    audio_text,
+                    conversation_state['context'],
+                    conversation_state['conversation_history']
+                )
+                
+                if ai_response:
+                    send_ai_audio_response(sock, ai_response, conversation_state)
+                
+                # Bookkeeping only after the reply is on its way
+                record_turn(conversation_state, audio_text, ai_response)
+        except Exception as e:
+            logger.error(f"Error processing audio turn: {e}")
+    
+    def record_turn(conversation_state, user_text, ai_text):
+        """Log a finished turn and add it to the conversation history"""
+        history = conversation_state['conversation_history']
+        timestamp = datetime.now().isoformat()
+        
+        if user_text:
+            logger.info(f"👤 Caller said: {user_text}")
+            history.append({'role': 'user', 'content': user_text, 'timestamp': timestamp})
+        if ai_text:
+            logger.info(f"🤖 AI responded: {ai_text}")
+            history.append({'role': 'assistant', 'content': ai_text, 'timestamp': timestamp})
+    
     def handle_incoming_audio(media_data, conversation_state, sock):
         """Process incoming audio from the caller"""
         try:
@@ -536,44 +925,46 @@ Be professional, friendly, and provide information about the program. Ask if the
             if not payload:
                 return
             
-            # Add audio to buffer
-            conversation_state['audio_buffer'].append(payload)
+            # Decode once on arrival and track speech/silence for endpointing
+            frame = base64.b64decode(payload)
+            if is_speech_frame(frame):
+                conversation_state['heard_speech'] = True
+                conversation_state['silent_frames'] = 0
+            elif conversation_state['heard_speech']:
+                conversation_state['silent_frames'] += 1
+            else:
+                # Leading silence is never transcribed, so don't buffer it
+                return
             
-            # Process audio when we have enough data or silence is detected
-            if should_process_audio(conversation_state):
-                audio_text = transcribe_audio(conversation_state['audio_buffer'])
-                
-                if audio_text and audio_text.strip():
-                    logger.info(f"👤 Caller said: {audio_text}")
-                    
-                    # Add to conversation history
-                    conversation_state['conversation_history'].append({
-                        'role': 'user',
-                        'content': audio_text,
-                        'timestamp': datetime.now().isoformat()
-                    })
-                    
-                    # Generate AI response
-                    ai_response = generate_ai_response(
-                        audio_text,
-                        conversation_state['context'],
-                        conversation_state['conversation_history']
-                    )
-                    
-                    if ai_response:
-                        send_ai_audio_response(sock, ai_response, conversation_state)
-                
-                # Clear audio buffer
-                conversation_state['audio_buffer'] = []
+            # Add audio to buffer
+            conversation_state['audio_buffer'].extend(frame)
+            
+            # Process audio once the caller stops speaking;
+            # while a turn is in flight keep buffering instead of blocking the receive loop
+            if should_process_audio(conversation_state) and not turn_in_flight(conversation_state):
+                audio_buffer = conversation_state['audio_buffer']
+                if submit_turn(conversation_state, run_audio_turn, bytes(audio_buffer), conversation_state, sock):
+                    # Clear audio buffer in place, keeping its allocation for the next utterance
+                    audio_buffer.clear()
+                    conversation_state['heard_speech'] = False
+                    conversation_state['silent_frames'] = 0
                 
         except Exception as e:
             logger.error(f"Error handling incoming audio: {e}")
     
+    def is_speech_frame(frame):
+        """Classify a raw mu-law frame as speech by its RMS energy"""
+        if not frame:
+            return False
+        energy = sum(map(ULAW_SQUARED.__getitem__, frame))
+        return energy >= SPEECH_RMS_THRESHOLD * SPEECH_RMS_THRESHOLD * len(frame)
+    
     def should_process_audio(conversation_state):
         """Determine if we should process the buffered audio"""
-        # Simple implementation - process every N chunks or after silence
-        buffer_size = len(conversation_state['audio_buffer'])
-        return buffer_size >= 10  # Process every 10 audio chunks
+        # End the utterance after trailing silence, or cap very long ones
+        if conversation_state['silent_frames'] >= END_OF_UTTERANCE_SILENT_FRAMES:
+            return True
+        return len(conversation_state['audio_buffer']) >= MAX_UTTERANCE_BYTES
     
     def transcribe_audio(audio_buffer):
         """Transcribe audio buffer to text using speech recognition"""
@@ -586,11 +977,11 @@ Be professional, friendly, and provide information about the program. Ask if the
             logger.info("🎤 Transcribing audio...")
             
             # Placeholder implementation
+            # audio_buffer holds one utterance of raw 8kHz mu-law bytes.
             # In real implementation, you would:
-            # 1. Decode base64 audio payload
-            # 2. Convert to proper audio format
-            # 3. Send to STT service
-            # 4. Return transcribed text
+            # 1. Convert to the STT service's input format
+            # 2. Send to STT service
+            # 3. Return transcribed text
             
             return "I am interested in your programs"  # Placeholder
             
@@ -607,9 +998,8 @@ Be professional, friendly, and provide information about the program. Ask if the
             # Prepare conversation for AI
             messages = [{"role": "system", "content": system_prompt}]
             
-            # Add conversation history
-            for msg in conversation_history[-5:]:  # Last 5 messages for context
-                messages.append(msg)
+            # Add conversation history (already bounded to the most recent messages)
+            messages.extend(conversation_history)
             
             # Add current user input if provided
             if user_input.strip():
@@ -630,7 +1020,7 @@ Be professional, friendly, and provide information about the program. Ask if the
             
         except Exception as e:
             logger.error(f"Error generating AI response: {e}")
-            return "I apologize, but I'm having some technical difficulties. Let me transfer you to a human representative."
+            return TECHNICAL_DIFFICULTIES_REPLY
     
     def build_dynamic_system_prompt(context):
         """Build dynamic system prompt based on call context"""
@@ -660,15 +1050,6 @@ Remember: This is a live phone conversation, so keep responses natural and brief
     def send_ai_audio_response(sock, text_response, conversation_state):
         """Convert AI text response to audio and send via WebSocket"""
         try:
-            logger.info(f"🤖 AI responding: {text_response}")
-            
-            # Add to conversation history
-            conversation_state['conversation_history'].append({
-                'role': 'assistant',
-                'content': text_response,
-                'timestamp': datetime.now().isoformat()
-            })
-            
             # Convert text to speech
             audio_data = text_to_speech(text_response)
             
@@ -682,14 +1063,19 @@ Remember: This is a live phone conversation, so keep responses natural and brief
                     }
                 }
                 
-                sock.send(json.dumps(media_message))
+                sock.send(stream_json_dumps(media_message))
                 logger.info("📤 AI audio response sent")
             
         except Exception as e:
             logger.error(f"Error sending AI audio response: {e}")
     
-    def text_to_speech(text):
-        """Convert text to speech audio data"""
+    def text_to_speech(text, voice='alice'):
+        """Convert text to speech audio data, reusing audio already synthesized for the same phrase"""
+        cache_key = (hashlib.sha1(text.encode('utf-8')).hexdigest(), voice)
+        return tts_cache.get_or_load(cache_key, lambda: synthesize_speech(text, voice))
+    
+    def synthesize_speech(text, voice):
+        """Synthesize speech audio for text with the TTS service"""
         try:
             # Placeholder implementation
             # In real implementation, you would:
@@ -707,31 +1093,41 @@ Remember: This is a live phone conversation, so keep responses natural and brief
             logger.error(f"Error in text-to-speech: {e}")
             return None
     
-    @app.route('/webhook/status', methods=['POST'])
-    def call_status_webhook():
-        """Handle call status updates from Twilio"""
+    # Pre-warm TTS for fixed phrases off the startup path
+    turn_executor.submit(text_to_speech, TECHNICAL_DIFFICULTIES_REPLY)
+    
+    def process_call_status(values):
+        """Log a Twilio status callback and store the status on the call record"""
+        call_sid = values.get('CallSid')
+        call_status = values.get('CallStatus')
+        duration = values.get('CallDuration', '0')
+        
+        logger.info(f"📊 Call status update - SID: {call_sid}, Status: {call_status}, Duration: {duration}s")
+        
+        # Log terminal call statuses
+        log_call_status = CALL_STATUS_LOGGERS.get(call_status)
+        if log_call_status:
+            log_call_status(call_sid, duration)
+        
+        if call_sid and call_status:
+            db_service.update_call_status(
+                call_sid, call_status,
+                int(duration) if duration.isdigit() and call_status == 'completed' else None
+            )
+    
+    def run_call_status(values):
         try:
-            call_sid = request.values.get('CallSid')
-            call_status = request.values.get('CallStatus')
-            duration = request.values.get('CallDuration', '0')
-            
-            logger.info(f"📊 Call status update - SID: {call_sid}, Status: {call_status}, Duration: {duration}s")
-            
-            # Log different call statuses
-            if call_status == 'completed':
-                logger.info(f"✅ Call {call_sid} completed successfully after {duration} seconds")
-            elif call_status == 'busy':
-                logger.warning(f"📞 Call {call_sid} was busy")
-            elif call_status == 'no-answer':
-                logger.warning(f"📞 Call {call_sid} - no answer")
-            elif call_status == 'failed':
-                logger.error(f"❌ Call {call_sid} failed")
-            
-            return '', 200
-            
+            process_call_status(values)
         except Exception as e:
             logger.error(f"❌ Status webhook error: {e}")
-            return '', 500
+    
+    @app.route('/webhook/status', methods=['POST'])
+    def call_status_webhook():
+        """Handle call status updates from Twilio; acknowledged before they are processed"""
+        # Twilio retries slow callbacks, so answer right away and process in the background
+        # Twilio posts status callbacks as form fields; copy them once for the worker
+        status_executor.submit(run_call_status, request.form.to_dict())
+        return '', 200
 
     # ===============================
     # SES TEMPLATED EMAIL API ROUTES
@@ -767,22 +1163,16 @@ Remember: This is a live phone conversation, so keep responses natural and brief
             
         except Exception as e:
             logger.error(f"Error creating templates: {str(e)}")
-            return jsonify({
-                'success': False,
-                'error': str(e)
-            }), 500
+            return error_response(str(e))
 
     @app.route('/api/templated-email/send-signup', methods=['POST'])
+    @idempotent
     def send_signup_email():
         """Send account signup email"""
         try:
-            data = request.get_json()
-            
-            if not data.get('to_email'):
-                return jsonify({
-                    'success': False,
-                    'error': 'to_email is required'
-                }), 400
+            data, invalid = parse_email_request(SignupEmailRequest)
+            if invalid:
+                return invalid
             
             result = templated_email_service.send_account_signup_email(data)
             status_code = 200 if result.get('success') else 500
@@ -791,22 +1181,16 @@ Remember: This is a live phone conversation, so keep responses natural and brief
             
         except Exception as e:
             logger.error(f"Error sending signup email: {str(e)}")
-            return jsonify({
-                'success': False,
-                'error': str(e)
-            }), 500
+            return error_response(str(e))
 
     @app.route('/api/templated-email/send-forgot-password', methods=['POST'])
+    @idempotent
     def send_forgot_password_email():
         """Send forgot password email"""
         try:
-            data = request.get_json()
-            
-            if not data.get('to_email'):
-                return jsonify({
-                    'success': False,
-                    'error': 'to_email is required'
-                }), 400
+            data, invalid = parse_email_request(ForgotPasswordEmailRequest)
+            if invalid:
+                return invalid
             
             result = templated_email_service.send_forgot_password_email(data)
             status_code = 200 if result.get('success') else 500
@@ -815,22 +1199,16 @@ Remember: This is a live phone conversation, so keep responses natural and brief
             
         except Exception as e:
             logger.error(f"Error sending forgot password email: {str(e)}")
-            return jsonify({
-                'success': False,
-                'error': str(e)
-            }), 500
+            return error_response(str(e))
 
     @app.route('/api/templated-email/send-otp', methods=['POST'])
+    @idempotent
     def send_otp_email():
         """Send OTP email"""
         try:
-            data = request.get_json()
-            
-            if not data.get('to_email') or not data.get('otp'):
-                return jsonify({
-                    'success': False,
-                    'error': 'to_email and otp are required'
-                }), 400
+            data, invalid = parse_email_request(OTPEmailRequest)
+            if invalid:
+                return invalid
             
             result = templated_email_service.send_otp_email(data)
             status_code = 200 if result.get('success') else 500
@@ -839,22 +1217,24 @@ Remember: This is a live phone conversation, so keep responses natural and brief
             
         except Exception as e:
             logger.error(f"Error sending OTP email: {str(e)}")
-            return jsonify({
-                'success': False,
-                'error': str(e)
-            }), 500
+            return error_response(str(e))
 
     @app.route('/api/templated-email/send-order-confirmation', methods=['POST'])
+    @idempotent
     def send_order_confirmation_email():
         """Send order confirmation email"""
         try:
-            data = request.get_json()
+            data, invalid = parse_email_request(OrderConfirmationEmailRequest)
+            if invalid:
+                return invalid
             
-            if not data.get('to_email') or not data.get('orderId'):
+            if wants_async(request):
+                job_id = email_jobs.submit(templated_email_service.send_order_confirmation_email, data)
                 return jsonify({
-                    'success': False,
-                    'error': 'to_email and orderId are required'
-                }), 400
+                    'success': True,
+                    'job_id': job_id,
+                    'status_url': f'/api/templated-email/jobs/{job_id}'
+                }), 202
             
             result = templated_email_service.send_order_confirmation_email(data)
             status_code = 200 if result.get('success') else 500
@@ -863,22 +1243,24 @@ Remember: This is a live phone conversation, so keep responses natural and brief
             
         except Exception as e:
             logger.error(f"Error sending order confirmation email: {str(e)}")
-            return jsonify({
-                'success': False,
-                'error': str(e)
-            }), 500
+            return error_response(str(e))
 
     @app.route('/api/templated-email/send-welcome-pack', methods=['POST'])
+    @idempotent
     def send_welcome_pack_email():
         """Send welcome pack email with PDF attachment"""
         try:
-            data = request.get_json()
+            data, invalid = parse_email_request(WelcomePackEmailRequest)
+            if invalid:
+                return invalid
             
-            if not data.get('to_email'):
+            if wants_async(request):
+                job_id = email_jobs.submit(templated_email_service.send_welcome_pack_email, data)
                 return jsonify({
-                    'success': False,
-                    'error': 'to_email is required'
-                }), 400
+                    'success': True,
+                    'job_id': job_id,
+                    'status_url': f'/api/templated-email/jobs/{job_id}'
+                }), 202
             
             result = templated_email_service.send_welcome_pack_email(data)
             status_code = 200 if result.get('success') else 500
@@ -887,49 +1269,44 @@ Remember: This is a live phone conversation, so keep responses natural and brief
             
         except Exception as e:
             logger.error(f"Error sending welcome pack email: {str(e)}")
-            return jsonify({
-                'success': False,
-                'error': str(e)
-            }), 500
+            return error_response(str(e))
+
+    @app.route('/api/templated-email/jobs/<job_id>', methods=['GET'])
+    def get_email_job_status(job_id):
+        """Get the outcome of an email queued with Prefer: respond-async"""
+        job = email_jobs.status(job_id)
+        if job is None:
+            return error_response('Email job not found', 404)
+        return jsonify({'success': True, 'job_id': job_id, **job})
+
+    # The status payload never changes, so serialize it once per app
+    templated_email_status_body = app.json.dumps(TEMPLATED_EMAIL_STATUS)
+    templated_email_status_etag = hashlib.md5(templated_email_status_body.encode('utf-8')).hexdigest()
 
     @app.route('/api/templated-email/status', methods=['GET'])
     def templated_email_status():
         """Get templated email service status"""
-        try:
-            return jsonify({
-                'success': True,
-                'service': 'SES Templated Email Service',
-                'status': 'healthy',
-                'available_templates': [
-                    'AccountSignupTemplate',
-                    'ForgotPasswordTemplate',
-                    'OTPTemplate',
-                    'OrderConfirmationTemplate'
-                ],
-                'special_endpoints': [
-                    'WelcomePackWithPDF (uses SendRawEmail)'
-                ],
-                'version': '1.0.0',
-                'endpoints': {
-                    'POST /api/templated-email/create-templates': 'Create all SES email templates',
-                    'POST /api/templated-email/send-signup': 'Send account signup email',
-                    'POST /api/templated-email/send-forgot-password': 'Send password reset email',
-                    'POST /api/templated-email/send-otp': 'Send OTP verification email',
-                    'POST /api/templated-email/send-order-confirmation': 'Send order confirmation email',
-                    'POST /api/templated-email/send-welcome-pack': 'Send welcome pack email with PDF',
-                    'GET /api/templated-email/status': 'Get templated email service status'
-                }
-            })
-        except Exception as e:
-            logger.error(f"Error getting templated email status: {str(e)}")
-            return jsonify({
-                'success': False,
-                'error': str(e)
-            }), 500
+        response = app.response_class(templated_email_status_body, mimetype='application/json')
+        response.set_etag(templated_email_status_etag)
+        response.cache_control.public = True
+        response.cache_control.max_age = 300
+        return response.make_conditional(request)
+
+    # Compile the dashboard template now rather than on the first page load
+    try:
+        app.jinja_env.get_template('dashboard.html')
+    except Exception as e:
+        logger.warning(f"Could not precompile dashboard template: {e}")
 
     logger.info("Flask application configured")
     return app
 
 if __name__ == '__main__':
+    # Werkzeug's dev server handles one request at a time; production runs under gunicorn
+    if os.getenv('FLASK_DEV_SERVER', 'false').lower() != 'true':
+        raise SystemExit(
+            "Run the app with: gunicorn -c gunicorn_conf.py 'app.flask_app:create_flask_app()'\n"
+            "(set FLASK_DEV_SERVER=true to use the Flask development server locally)"
+        )
     app = create_flask_app()
     app.run(debug=True, host='0.0.0.0', port=5000)
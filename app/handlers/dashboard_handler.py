@@ -3,36 +3,64 @@ Web Dashboard for AI Telecaller System
 Provides interface to view partners, events and initiate calls
 """
 
+import concurrent.futures
 import logging
-from flask import render_template, request, jsonify, redirect, url_for
-from app.services.database_service import DatabaseService
-from app.services.twilio_service import TwilioService
+from flask import render_template, request, jsonify, redirect, url_for, current_app, Response, stream_with_context
+from app.services.database_service import get_database_service
+from app.services.twilio_service import twilio_service
 from app.config.settings import AppConfig
+from app.utils.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Streamed alternative to JSON arrays for large list responses, one object per line
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+# Concurrent Twilio requests per bulk call batch
+BULK_CALL_WORKERS = 10
+
+# System status shown on the dashboard is refreshed at most this often
+SYSTEM_STATUS_TTL_SECONDS = 15
+SYSTEM_STATUS_CHECK_TIMEOUT_SECONDS = 2
+
+system_status_cache = TTLCache(ttl=SYSTEM_STATUS_TTL_SECONDS, maxsize=1)
+# The status checks are independent round-trips, so they run side by side
+status_check_executor = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix='status-check')
+
+def _wants_ndjson():
+    """Check whether the client prefers NDJSON over a single JSON document"""
+    return request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+def _ndjson_response(rows):
+    """Stream rows as NDJSON, serializing each with the app's JSON provider"""
+    dumps = current_app.json.dumps
+    return Response(
+        stream_with_context(dumps(row) + '\n' for row in rows),
+        mimetype=NDJSON_MIMETYPE
+    )
+
 class DashboardHandler:
     """Handle web dashboard routes and functionality"""
     
     def __init__(self):
         self.config = AppConfig()
-        self.db_service = DatabaseService()
-        self.twilio_service = TwilioService()
+        # Shared across handlers so each one reuses the same connection pool and Twilio client
+        self.db_service = get_database_service()
+        self.twilio_service = twilio_service
     
     def dashboard_home(self):
         """Main dashboard page with partners and events"""
         try:
-            # Get all partners from database
-            partners_data = self.db_service.get_all_partners()
-            
-            # Get recent call logs
-            recent_calls = self._get_recent_calls()
+            # Only partners and recent calls are rendered here; the /dashboard
+            # snapshot would also load programs and events
+            partners = self.db_service.get_all_partners()
+            recent_calls = self.db_service.get_call_records(10)
             
-            # Get system status
+            # Get system status (cached)
             system_status = self._get_system_status()
             
             return render_template('dashboard.html', 
-                                 partners=partners_data,
+                                 partners=partners,
                                  recent_calls=recent_calls,
                                  system_status=system_status)
         except Exception as e:
@@ -101,22 +129,18 @@ class DashboardHandler:
             partner_ids = data.get('partner_ids', [])
             event_id = data.get('event_id')
             
-            results = []
-            for partner_id in partner_ids:
-                partner = self.db_service.get_partner_by_id(partner_id)
-                if partner and partner.get('phone'):
-                    call_result = self.twilio_service.make_call(
-                        to_number=partner['phone'],
-                        partner_id=partner_id,
-                        event_id=event_id
-                    )
-                    results.append({
-                        'partner_id': partner_id,
-                        'phone': partner['phone'],
-                        'status': 'success' if call_result else 'failed',
-                        'call_sid': call_result.get('call_sid') if call_result else None
-                    })
+            # Ids may arrive as strings; partners are looked up and keyed by int
+            try:
+                if not isinstance(partner_ids, list):
+                    raise TypeError
+                partner_ids = [int(partner_id) for partner_id in partner_ids]
+            except (TypeError, ValueError):
+                return jsonify({'error': 'partner_ids must be a list of integers'}), 400
+            
+            if _wants_ndjson():
+                return _ndjson_response(self._iter_bulk_calls(partner_ids, event_id))
             
+            results = self._place_bulk_calls(partner_ids, event_id)
             return jsonify({
                 'success': True,
                 'results': results,
@@ -127,9 +151,81 @@ class DashboardHandler:
             logger.error(f"Bulk call error: {e}")
             return jsonify({'error': str(e)}), 500
     
+    def _place_bulk_calls(self, partner_ids, event_id):
+        """Call each partner that has a phone number; returns one result per call"""
+        callable_partners = self._get_callable_partners(partner_ids)
+        event = self._get_bulk_call_event(event_id)
+        
+        # Each make_call is a blocking HTTPS request to Twilio, so overlap them on a bounded pool
+        with concurrent.futures.ThreadPoolExecutor(max_workers=BULK_CALL_WORKERS) as executor:
+            return list(executor.map(
+                lambda item: self._call_partner(item[0], item[1], event_id, event),
+                callable_partners
+            ))
+    
+    def _iter_bulk_calls(self, partner_ids, event_id):
+        """Like _place_bulk_calls, but yield each result as soon as its call returns"""
+        callable_partners = self._get_callable_partners(partner_ids)
+        event = self._get_bulk_call_event(event_id)
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=BULK_CALL_WORKERS) as executor:
+            futures = [
+                executor.submit(self._call_partner, partner_id, partner, event_id, event)
+                for partner_id, partner in callable_partners
+            ]
+            for future in concurrent.futures.as_completed(futures):
+                yield future.result()
+    
+    def _get_callable_partners(self, partner_ids):
+        """Get (partner_id, partner) pairs, in request order, for partners with a phone number"""
+        partners = self.db_service.get_partners_by_ids(partner_ids)
+        return [
+            (partner_id, partners[partner_id])
+            for partner_id in partner_ids
+            if partner_id in partners and partners[partner_id].get('phone')
+        ]
+    
+    def _get_bulk_call_event(self, event_id):
+        """Load the event a bulk call is about once, for every partner's prompt"""
+        return self.db_service.get_event_by_id(event_id) if event_id else None
+    
+    def _call_partner(self, partner_id, partner, event_id, event=None):
+        """Place one bulk call to a partner with a phone number"""
+        partner_name = partner.get('name', 'Partner')
+        program_name = event.get('program_name', 'Our Program') if event else 'Our Program'
+        event_name = event.get('name', '') if event else ''
+        
+        system_prompt = f"""You are calling {partner_name} from Global Learning Academy about the {program_name} program.
+{f'Event: {event_name}' if event_name else ''}
+
+Be professional, friendly, and provide information about the program. Ask if they have any questions."""
+        
+        call_result = self.twilio_service.make_call(
+            to_number=partner['phone'],
+            system_prompt=system_prompt,
+            call_metadata={
+                'partner_name': partner_name,
+                'program_name': program_name,
+                'event_name': event_name,
+                'phone': partner['phone'],
+                'partner_id': partner_id,
+                'event_id': event_id
+            }
+        )
+        
+        # make_call reports Twilio errors in the result (no call_sid) rather than raising
+        return {
+            'partner_id': partner_id,
+            'phone': partner['phone'],
+            'status': 'success' if call_result.get('call_sid') else 'failed',
+            'call_sid': call_result.get('call_sid')
+        }
+    
     def get_partners_api(self):
         """API endpoint to get partners data"""
         try:
+            if _wants_ndjson():
+                return _ndjson_response(self.db_service.iter_all_partners())
             partners = self.db_service.get_all_partners()
             return jsonify(partners)
         except Exception as e:
@@ -145,21 +241,25 @@ class DashboardHandler:
             logger.error(f"Get events API error: {e}")
             return jsonify({'error': str(e)}), 500
     
-    def _get_recent_calls(self):
-        """Get recent call logs"""
-        try:
-            # This would get recent calls from your call logs
-            return self.db_service.get_recent_calls(limit=10)
-        except Exception as e:
-            logger.warning(f"Could not get recent calls: {e}")
-            return []
-    
     def _get_system_status(self):
-        """Get current system status"""
-        return {
-            'status': 'online',
-            'twilio_connected': self.twilio_service.test_connection(),
-            'database_connected': self.db_service.test_connection(),
-            'total_partners': len(self.db_service.get_all_partners() or []),
-            'total_events': len(self.db_service.get_all_events() or [])
+        """Get current system status, cached for SYSTEM_STATUS_TTL_SECONDS"""
+        return system_status_cache.get_or_load('system_status', self._load_system_status)
+    
+    def _load_system_status(self):
+        """Run the connection checks and row counts behind the system status concurrently"""
+        checks = {
+            'twilio_connected': (self.twilio_service.test_connection, False),
+            'database_connected': (self.db_service.test_connection, False),
+            'total_partners': (self.db_service.count_partners, 0),
+            'total_events': (self.db_service.count_events, 0)
         }
+        futures = {name: status_check_executor.submit(check) for name, (check, _) in checks.items()}
+        
+        status = {'status': 'online'}
+        for name, future in futures.items():
+            try:
+                status[name] = future.result(timeout=SYSTEM_STATUS_CHECK_TIMEOUT_SECONDS)
+            except Exception as e:
+                logger.warning(f"System status check {name} failed: {e}")
+                status[name] = checks[name][1]
+        return status
@@ -3,21 +3,89 @@ Enhanced Main Handler for LangGraph AI Telecaller
 Integrates with PostgreSQL database and LangGraph service
 """
 
+import concurrent.futures
+import functools
 import json
 import logging
 import os
 from typing import Dict, Any, Optional
-from datetime import datetime
+from datetime import date, datetime
 from pathlib import Path
+from xml.sax.saxutils import escape
+
+from app.utils.ttl_cache import TTLCache
+
+# Optional C JSON codec for request bodies and responses
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# TwiML for the call webhook, built once; only the AI reply varies per turn and
+# is concatenated between these two halves
+WEBHOOK_TWIML_PREFIX = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<Response>'
+    '<Say voice="alice">'
+)
+WEBHOOK_TWIML_SUFFIX = (
+    '</Say>'
+    '<Gather input="speech" timeout="5" speechTimeout="2" action="/call/webhook" method="POST">'
+    '<Say voice="alice">Please respond when you\'re ready.</Say>'
+    '</Gather>'
+    '<Redirect>/call/webhook</Redirect>'
+    '</Response>'
+)
+
+FALLBACK_TWIML = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<Response>'
+    '<Say voice="alice">I apologize, but I\'m experiencing technical difficulties. Let me transfer you to a human representative. Thank you for your patience.</Say>'
+    '<Hangup/>'
+    '</Response>'
+)
+
+WEBHOOK_ERROR_TWIML = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<Response>'
+    '<Say voice="alice">I apologize, but there was an error processing your call. Please try again later.</Say>'
+    '<Hangup/>'
+    '</Response>'
+)
+
+XML_HEADERS = {'Content-Type': 'application/xml'}
+
+JSON_HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': 'Content-Type',
+    'Access-Control-Allow-Methods': 'GET,POST,OPTIONS'
+}
+
+def json_default(value: Any) -> str:
+    """Serialize DB values json can't: dates as ISO 8601, anything else (Decimal, UUID) as str"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+if ORJSON_AVAILABLE:
+    decode_json = orjson.loads
+    
+    def encode_json(obj: Any) -> str:
+        # API Gateway needs a str body; orjson writes datetimes and UUIDs itself
+        return orjson.dumps(obj, default=json_default, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+else:
+    decode_json = json.loads
+    # One compact encoder for every response instead of json.dumps building one per call
+    encode_json = json.JSONEncoder(separators=(',', ':'), default=json_default).encode
+
 # Import services
 try:
     from app.database.postgres_models import telecaller_db, pg_manager
-    from app.services.langgraph_telecaller_service import langgraph_telecaller
-    from app.services.twilio_service import TwilioService
     DATABASE_MODE = "postgresql"
     logger.info("✅ Using PostgreSQL database (lwl_pg_us_2)")
 except Exception as e:
@@ -33,8 +101,73 @@ except Exception as e:
         logger.error(f"❌ Failed to initialize fallback database: {fallback_error}")
         raise
 
-# Initialize services
-twilio_service = TwilioService()
+# Twilio and LangGraph (LangChain, OpenAI) are imported on first use, so cold
+# starts that only serve /health, /programs, /partners or /call/status skip them
+@functools.lru_cache(maxsize=1)
+def get_twilio_service():
+    """Shared TwilioService instance"""
+    from app.services.twilio_service import twilio_service
+    return twilio_service
+
+@functools.lru_cache(maxsize=1)
+def get_langgraph_telecaller():
+    """Shared LangGraph telecaller agent"""
+    from app.services.langgraph_telecaller_service import langgraph_telecaller
+    return langgraph_telecaller
+
+# Load balancer probes hit /health every few seconds; reuse results briefly
+HEALTH_CACHE_TTL_SECONDS = 10
+health_cache = TTLCache(ttl=HEALTH_CACHE_TTL_SECONDS, maxsize=2)
+
+# Background work only survives the response outside Lambda, where the
+# execution environment is frozen as soon as the handler returns
+IN_LAMBDA = bool(os.getenv('AWS_LAMBDA_FUNCTION_NAME'))
+
+# The reply to a call's first turn depends only on the program/partner and a
+# greeting, so it is reused across calls. A turn counts as first only when this
+# process has not handled the call_sid before and the agent holds no history for
+# it; Gather timeouts and greetings later in a call always reach the agent.
+AI_REPLY_CACHE_TTL_SECONDS = 300
+CALL_TURN_TTL_SECONDS = 3600
+CACHEABLE_UTTERANCES = frozenset({'', 'hello', 'hi', 'hey'})
+ai_reply_cache = TTLCache(ttl=AI_REPLY_CACHE_TTL_SECONDS, maxsize=1024)
+answered_calls = TTLCache(ttl=CALL_TURN_TTL_SECONDS, maxsize=10000)
+
+# Environment read once at import (after the service imports have loaded .env)
+WEBHOOK_URL = os.getenv('WEBHOOK_URL', 'http://localhost:5000/call/webhook')
+AI_MODEL = os.getenv('AI_MODEL', 'gpt-4o-mini')
+HEALTH_ENVIRONMENT = {
+    'OPENAI_API_KEY': bool(os.getenv('OPENAI_API_KEY')),
+    'TWILIO_ACCOUNT_SID': bool(os.getenv('TWILIO_ACCOUNT_SID')),
+    'DB_HOST': bool(os.getenv('DB_HOST')),
+    'DB_NAME': os.getenv('DB_NAME', 'unknown')
+}
+
+# Call-ended log updates run here so Twilio's webhook gets its response first
+webhook_executor = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix='call-webhook')
+
+# call_sid -> program/partner ids, filled when a call is started so every
+# webhook turn of that call avoids a call_logs query
+CALL_CONTEXT_TTL_SECONDS = 3600
+call_context_cache = TTLCache(ttl=CALL_CONTEXT_TTL_SECONDS, maxsize=10000)
+
+START_CALL_REQUIRED_FIELDS = frozenset({'to_number'})
+
+# Upper bound on concurrent Twilio calls per campaign request
+CAMPAIGN_CALL_WORKERS = 16
+
+def route_handler(error_message: str):
+    """Turn an uncaught exception in a route handler into a logged 500 response"""
+    def decorator(handler):
+        @functools.wraps(handler)
+        def wrapper(*args, **kwargs):
+            try:
+                return handler(*args, **kwargs)
+            except Exception as e:
+                logger.error(f"{error_message}: {e}")
+                return create_response(500, {'error': error_message, 'details': str(e)})
+        return wrapper
+    return decorator
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
@@ -45,7 +178,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     - POST /call/webhook - Handle Twilio webhooks
     - GET /call/status/{call_id} - Get call status
     - POST /campaign/execute - Execute a campaign
-    - GET /health - Health check
+    - GET /health - Health check (?deep=1 also exercises the AI service)
     - GET /programs - Get available programs
     - GET /partners - Get partners
     """
@@ -55,210 +188,217 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         http_method = event.get('httpMethod', 'GET')
         path = event.get('path', '/')
         query_params = event.get('queryStringParameters', {}) or {}
-        body = event.get('body')
-        
-        if body:
-            try:
-                body = json.loads(body)
-            except json.JSONDecodeError:
-                body = {}
-        else:
-            body = {}
+        body = parse_body(event.get('body'))
         
         logger.info(f"Processing {http_method} {path}")
         
-        # Route the request
-        if path == '/health':
-            return handle_health_check()
-        elif path == '/programs':
-            return handle_get_programs(query_params)
-        elif path == '/partners':
-            return handle_get_partners(query_params)
-        elif path == '/call/start' and http_method == 'POST':
-            return handle_start_call(body)
-        elif path == '/call/webhook' and http_method == 'POST':
-            return handle_call_webhook(body)
-        elif path.startswith('/call/status/'):
-            call_id = path.split('/')[-1]
-            return handle_get_call_status(call_id)
-        elif path == '/campaign/execute' and http_method == 'POST':
-            return handle_execute_campaign(body)
-        else:
-            return create_response(404, {'error': 'Route not found'})
+        # Route the request: exact routes first, then the /call/status/{call_id} prefix
+        route = ROUTES.get((http_method, path)) or ROUTES.get((None, path))
+        if route:
+            return route(body, query_params)
+        if path.startswith(CALL_STATUS_PREFIX):
+            return handle_get_call_status(path[len(CALL_STATUS_PREFIX):])
+        return create_response(404, {'error': 'Route not found'})
             
     except Exception as e:
         logger.error(f"Handler error: {e}")
         return create_response(500, {'error': 'Internal server error', 'details': str(e)})
 
-def handle_health_check() -> Dict[str, Any]:
-    """Health check endpoint"""
-    try:
-        # Test database connection
-        db_status = "unknown"
-        
-        if DATABASE_MODE == "postgresql":
-            try:
-                programs = telecaller_db.get_programs(limit=1)
-                db_status = "connected"
-            except Exception as e:
-                db_status = f"error: {str(e)}"
-        else:
-            db_status = "embedded_fallback"
-        
-        # Test AI service
-        ai_status = "unknown"
+def parse_body(body: Any) -> Dict[str, Any]:
+    """
+    Request body as a dict: API Gateway sends a JSON string, while the local Flask
+    proxy and direct invocations may pass a dict that needs no parsing
+    """
+    if isinstance(body, dict):
+        return body
+    if isinstance(body, (str, bytes)) and body:
+        try:
+            parsed = decode_json(body)
+        except ValueError:
+            return {}
+        return parsed if isinstance(parsed, dict) else {}
+    return {}
+
+def handle_health_check(query_params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Health check endpoint; healthy results are cached for HEALTH_CACHE_TTL_SECONDS
+    The AI service is only exercised (a real model call) with ?deep=1
+    """
+    deep = (query_params or {}).get('deep') in ('1', 'true')
+    response = health_cache.get(deep)
+    if response is None:
+        response = run_health_check(deep)
+        # Failures are re-checked on the next probe so recovery shows up immediately
+        if response['statusCode'] == 200 and decode_json(response['body']).get('status') == 'healthy':
+            health_cache.set(deep, response)
+    return response
+
+@route_handler('Health check failed')
+def run_health_check(deep: bool) -> Dict[str, Any]:
+    """Probe the database and, for deep checks, the AI service"""
+    # Test database connection
+    db_status = "unknown"
+    
+    if DATABASE_MODE == "postgresql":
+        try:
+            programs = telecaller_db.get_programs(limit=1)
+            db_status = "connected"
+        except Exception as e:
+            db_status = f"error: {str(e)}"
+    else:
+        db_status = "embedded_fallback"
+    
+    # Test AI service
+    ai_status = "not_checked"
+    if deep:
         try:
             # Quick test of the LangGraph service
-            test_result = langgraph_telecaller.process_call(
+            test_result = get_langgraph_telecaller().process_call(
                 {"test": "health_check"}, 
                 "Hello"
             )
             ai_status = "operational" if test_result.get("success") else "error"
         except Exception as e:
             ai_status = f"error: {str(e)}"
-        
-        return create_response(200, {
-            'status': 'healthy',
-            'timestamp': datetime.now().isoformat(),
-            'database': {
-                'mode': DATABASE_MODE,
-                'status': db_status
-            },
-            'ai_service': {
-                'status': ai_status,
-                'model': os.getenv('AI_MODEL', 'gpt-4o-mini')
-            },
-            'environment': {
-                'OPENAI_API_KEY': bool(os.getenv('OPENAI_API_KEY')),
-                'TWILIO_ACCOUNT_SID': bool(os.getenv('TWILIO_ACCOUNT_SID')),
-                'DB_HOST': bool(os.getenv('DB_HOST')),
-                'DB_NAME': os.getenv('DB_NAME', 'unknown')
-            }
-        })
-        
-    except Exception as e:
-        logger.error(f"Health check failed: {e}")
-        return create_response(500, {'error': 'Health check failed', 'details': str(e)})
+    
+    healthy = db_status in ('connected', 'embedded_fallback') and not ai_status.startswith('error')
+    return create_response(200, {
+        'status': 'healthy' if healthy else 'degraded',
+        'timestamp': datetime.now().isoformat(),
+        'database': {
+            'mode': DATABASE_MODE,
+            'status': db_status
+        },
+        'ai_service': {
+            'status': ai_status,
+            'model': AI_MODEL
+        },
+        'environment': HEALTH_ENVIRONMENT
+    })
 
+@route_handler('Failed to fetch programs')
 def handle_get_programs(query_params: Dict[str, Any]) -> Dict[str, Any]:
     """Get available programs"""
-    try:
-        limit = int(query_params.get('limit', 50))
-        
-        if DATABASE_MODE == "postgresql":
-            programs = telecaller_db.get_programs(limit=limit)
-        else:
-            # Fallback for embedded database
-            programs = []
-        
-        return create_response(200, {
-            'programs': programs,
-            'count': len(programs),
-            'database_mode': DATABASE_MODE
-        })
-        
-    except Exception as e:
-        logger.error(f"Error fetching programs: {e}")
-        return create_response(500, {'error': 'Failed to fetch programs', 'details': str(e)})
+    limit = int(query_params.get('limit', 50))
+    
+    if DATABASE_MODE == "postgresql":
+        programs = telecaller_db.get_programs(limit=limit)
+    else:
+        # Fallback for embedded database
+        programs = []
+    
+    return create_response(200, {
+        'programs': programs,
+        'count': len(programs),
+        'database_mode': DATABASE_MODE
+    })
 
+@route_handler('Failed to fetch partners')
 def handle_get_partners(query_params: Dict[str, Any]) -> Dict[str, Any]:
     """Get available partners"""
-    try:
-        partner_type = query_params.get('type')
-        limit = int(query_params.get('limit', 50))
-        
-        if DATABASE_MODE == "postgresql":
-            partners = telecaller_db.get_partners(partner_type=partner_type, limit=limit)
-        else:
-            # Fallback for embedded database
-            partners = []
-        
-        return create_response(200, {
-            'partners': partners,
-            'count': len(partners),
-            'filter': {'type': partner_type} if partner_type else None,
-            'database_mode': DATABASE_MODE
-        })
-        
-    except Exception as e:
-        logger.error(f"Error fetching partners: {e}")
-        return create_response(500, {'error': 'Failed to fetch partners', 'details': str(e)})
+    partner_type = query_params.get('type')
+    limit = int(query_params.get('limit', 50))
+    
+    if DATABASE_MODE == "postgresql":
+        partners = telecaller_db.get_partners(partner_type=partner_type, limit=limit)
+    else:
+        # Fallback for embedded database
+        partners = []
+    
+    return create_response(200, {
+        'partners': partners,
+        'count': len(partners),
+        'filter': {'type': partner_type} if partner_type else None,
+        'database_mode': DATABASE_MODE
+    })
 
+@route_handler('Failed to process call request')
 def handle_start_call(body: Dict[str, Any]) -> Dict[str, Any]:
     """Start a new AI telecaller call"""
+    # Validate required parameters
+    missing_fields = START_CALL_REQUIRED_FIELDS - body.keys()
+    if missing_fields:
+        return create_response(400, {
+            'error': 'Missing required fields',
+            'missing': sorted(missing_fields)
+        })
+    
+    result = start_call(body['to_number'], body.get('program_event_id'), body.get('partner_id'))
+    return create_response(200 if result['success'] else 500, result)
+
+def start_call(to_number: str, program_event_id: Any, partner_id: Any) -> Dict[str, Any]:
+    """
+    Place the Twilio call and log it; returns the response body with a 'success' flag
+    Shared by the /call/start route and campaigns, which need the call_sid directly
+    """
+    # Prepare call context
+    call_context = {
+        'to_number': to_number,
+        'program_event_id': program_event_id,
+        'partner_id': partner_id,
+        'call_start_time': datetime.now(),
+        'initiated_by': 'api'
+    }
+    
+    # Start the call using Twilio
     try:
-        # Validate required parameters
-        required_fields = ['to_number']
-        missing_fields = [field for field in required_fields if field not in body]
-        if missing_fields:
-            return create_response(400, {
-                'error': 'Missing required fields',
-                'missing': missing_fields
-            })
-        
-        # Extract call parameters
-        to_number = body['to_number']
-        program_event_id = body.get('program_event_id')
-        partner_id = body.get('partner_id')
-        
-        # Prepare call context
-        call_context = {
-            'to_number': to_number,
-            'program_event_id': program_event_id,
-            'partner_id': partner_id,
-            'call_start_time': datetime.now(),
-            'initiated_by': 'api'
-        }
+        twilio_service = get_twilio_service()
+        call_result = twilio_service.make_call(
+            to_number=to_number,
+            webhook_url=WEBHOOK_URL,
+            call_context=call_context
+        )
         
-        # Start the call using Twilio
-        try:
-            call_result = twilio_service.make_call(
-                to_number=to_number,
-                webhook_url=os.getenv('WEBHOOK_URL', 'http://localhost:5000/call/webhook'),
-                call_context=call_context
-            )
+        if call_result.get('success'):
+            call_context['call_sid'] = call_result['call_sid']
             
-            if call_result.get('success'):
-                call_context['call_sid'] = call_result['call_sid']
-                
-                # Log the call initiation
-                if DATABASE_MODE == "postgresql":
-                    call_log_data = {
-                        'program_event_id': program_event_id,
-                        'partner_id': partner_id,
-                        'call_sid': call_result['call_sid'],
-                        'caller_number': twilio_service.from_number,
-                        'recipient_number': to_number,
-                        'call_start_time': datetime.now(),
-                        'call_status': 'initiated',
-                        'ai_prompt_used': 'LangGraph AI Telecaller'
-                    }
-                    
-                    call_log_id = telecaller_db.create_call_log(call_log_data)
-                    logger.info(f"Call logged with ID: {call_log_id}")
-                
-                return create_response(200, {
-                    'success': True,
+            # Log the call initiation
+            if DATABASE_MODE == "postgresql":
+                call_log_data = {
+                    'program_event_id': program_event_id,
+                    'partner_id': partner_id,
                     'call_sid': call_result['call_sid'],
-                    'status': 'initiated',
-                    'message': 'Call started successfully'
-                })
-            else:
-                return create_response(500, {
-                    'error': 'Failed to start call',
-                    'details': call_result.get('error')
-                })
+                    'caller_number': twilio_service.from_number,
+                    'recipient_number': to_number,
+                    'call_start_time': datetime.now(),
+                    'call_end_time': None,
+                    'call_duration_seconds': None,
+                    'call_status': 'initiated',
+                    'conversation_summary': None,
+                    'outcome': None,
+                    'recording_url': None,
+                    'transcription_path': None,
+                    'ai_prompt_used': 'LangGraph AI Telecaller'
+                }
                 
-        except Exception as e:
-            logger.error(f"Error starting call: {e}")
-            return create_response(500, {
+                call_log_id = telecaller_db.create_call_log(call_log_data)
+                logger.info(f"Call logged with ID: {call_log_id}")
+                # The webhook for this call usually lands on this instance; let it skip the lookup
+                call_context_cache.set(call_result['call_sid'], {
+                    'program_event_id': program_event_id,
+                    'partner_id': partner_id
+                })
+            
+            return {
+                'success': True,
+                'call_sid': call_result['call_sid'],
+                'status': 'initiated',
+                'message': 'Call started successfully'
+            }
+        else:
+            return {
+                'success': False,
                 'error': 'Failed to start call',
-                'details': str(e)
-            })
+                'details': call_result.get('error')
+            }
             
     except Exception as e:
-        logger.error(f"Error in start_call: {e}")
-        return create_response(500, {'error': 'Failed to process call request', 'details': str(e)})
+        logger.error(f"Error starting call: {e}")
+        return {
+            'success': False,
+            'error': 'Failed to start call',
+            'details': str(e)
+        }
 
 def handle_call_webhook(body: Dict[str, Any]) -> Dict[str, Any]:
     """Handle Twilio call webhooks using LangGraph"""
@@ -283,69 +423,43 @@ def handle_call_webhook(body: Dict[str, Any]) -> Dict[str, Any]:
             # Add program/partner context if available (from call log)
             if DATABASE_MODE == "postgresql":
                 try:
-                    call_logs = telecaller_db.get_call_logs(limit=1)
-                    matching_log = next((log for log in call_logs if log.get('call_sid') == call_sid), None)
-                    if matching_log:
-                        call_context['program_event_id'] = matching_log.get('program_event_id')
-                        call_context['partner_id'] = matching_log.get('partner_id')
+                    call_context.update(get_call_log_context(call_sid))
                 except Exception as e:
                     logger.warning(f"Could not fetch call context: {e}")
             
             # Process with LangGraph AI
-            ai_result = langgraph_telecaller.process_call(call_context, user_input)
+            ai_result = process_call_input(call_context, user_input)
             
             if ai_result.get('success'):
                 ai_response = ai_result['response']
                 
-                # Generate TwiML response
-                twiml_response = f"""
-                <?xml version="1.0" encoding="UTF-8"?>
-                <Response>
-                    <Say voice="alice">{ai_response}</Say>
-                    <Gather input="speech" timeout="5" speechTimeout="2" action="/call/webhook" method="POST">
-                        <Say voice="alice">Please respond when you're ready.</Say>
-                    </Gather>
-                    <Redirect>/call/webhook</Redirect>
-                </Response>
-                """
-                
+                # The AI reply is free text, so escape it before placing it in the TwiML
                 return {
                     'statusCode': 200,
-                    'headers': {'Content-Type': 'application/xml'},
-                    'body': twiml_response
+                    'headers': XML_HEADERS,
+                    'body': WEBHOOK_TWIML_PREFIX + escape(ai_response) + WEBHOOK_TWIML_SUFFIX
                 }
             else:
                 # Fallback response
-                fallback_twiml = """
-                <?xml version="1.0" encoding="UTF-8"?>
-                <Response>
-                    <Say voice="alice">I apologize, but I'm experiencing technical difficulties. Let me transfer you to a human representative. Thank you for your patience.</Say>
-                    <Hangup/>
-                </Response>
-                """
-                
                 return {
                     'statusCode': 200,
-                    'headers': {'Content-Type': 'application/xml'},
-                    'body': fallback_twiml
+                    'headers': XML_HEADERS,
+                    'body': FALLBACK_TWIML
                 }
         
         elif call_status in ['completed', 'failed', 'busy', 'no-answer']:
             # Call ended - update call log
             if DATABASE_MODE == "postgresql":
-                try:
-                    call_logs = telecaller_db.get_call_logs(limit=50)
-                    matching_log = next((log for log in call_logs if log.get('call_sid') == call_sid), None)
-                    if matching_log:
-                        update_data = {
-                            'call_status': call_status,
-                            'call_end_time': datetime.now(),
-                            'call_duration_seconds': body.get('CallDuration', 0)
-                        }
-                        telecaller_db.update_call_log(matching_log['call_log_id'], update_data)
-                        logger.info(f"Call log updated for {call_sid}")
-                except Exception as e:
-                    logger.error(f"Error updating call log: {e}")
+                update_data = {
+                    'call_status': call_status,
+                    'call_end_time': datetime.now(),
+                    'call_duration_seconds': body.get('CallDuration', 0)
+                }
+                if IN_LAMBDA:
+                    # Lambda freezes once the handler returns, so finish the write first
+                    update_ended_call_log(call_sid, update_data)
+                else:
+                    webhook_executor.submit(update_ended_call_log, call_sid, update_data)
             
             return create_response(200, {'message': 'Call completed'})
         
@@ -355,138 +469,189 @@ def handle_call_webhook(body: Dict[str, Any]) -> Dict[str, Any]:
     except Exception as e:
         logger.error(f"Webhook error: {e}")
         # Always return a valid TwiML response for Twilio
-        error_twiml = """
-        <?xml version="1.0" encoding="UTF-8"?>
-        <Response>
-            <Say voice="alice">I apologize, but there was an error processing your call. Please try again later.</Say>
-            <Hangup/>
-        </Response>
-        """
-        
         return {
             'statusCode': 200,
-            'headers': {'Content-Type': 'application/xml'},
-            'body': error_twiml
+            'headers': XML_HEADERS,
+            'body': WEBHOOK_ERROR_TWIML
         }
 
+def get_call_log_context(call_sid: str) -> Dict[str, Any]:
+    """Program/partner ids for a call, from the start-call cache or its call log"""
+    context = call_context_cache.get(call_sid)
+    if context is None:
+        matching_log = telecaller_db.get_call_log_by_sid(call_sid)
+        if not matching_log:
+            return {}
+        context = {
+            'program_event_id': matching_log.get('program_event_id'),
+            'partner_id': matching_log.get('partner_id')
+        }
+        call_context_cache.set(call_sid, context)
+    return context
+
+def process_call_input(call_context: Dict[str, Any], user_input: str) -> Dict[str, Any]:
+    """Run the LangGraph agent, reusing the cached reply for a call's opening turn"""
+    telecaller = get_langgraph_telecaller()
+    call_sid = call_context.get('call_sid')
+    # Marks the call as answered; False for every turn after the first
+    first_turn = bool(call_sid) and answered_calls.add(call_sid, True)
+    
+    utterance = user_input.strip().lower().rstrip('.!?')
+    program_event_id = call_context.get('program_event_id')
+    partner_id = call_context.get('partner_id')
+    if (
+        not first_turn
+        or utterance not in CACHEABLE_UTTERANCES
+        or program_event_id is None
+        or partner_id is None
+        or telecaller.checkpointer.get_tuple({'configurable': {'thread_id': call_sid}}) is not None
+    ):
+        return telecaller.process_call(call_context, user_input)
+    
+    cache_key = (program_event_id, partner_id, utterance)
+    response = ai_reply_cache.get(cache_key)
+    if response is not None:
+        return {'success': True, 'response': response}
+    
+    ai_result = telecaller.process_call(call_context, user_input)
+    # Only successful replies are reused; failures retry on the next call
+    if ai_result.get('success'):
+        ai_reply_cache.set(cache_key, ai_result['response'])
+    return ai_result
+
+def update_ended_call_log(call_sid: str, update_data: Dict[str, Any]) -> None:
+    """Store the final status of an ended call on its call log"""
+    try:
+        if telecaller_db.update_call_log_by_sid(call_sid, update_data):
+            logger.info(f"Call log updated for {call_sid}")
+    except Exception as e:
+        logger.error(f"Error updating call log: {e}")
+
+@route_handler('Failed to fetch call status')
 def handle_get_call_status(call_id: str) -> Dict[str, Any]:
     """Get status of a specific call"""
-    try:
-        if DATABASE_MODE == "postgresql":
-            call_logs = telecaller_db.get_call_logs(limit=100)
-            matching_log = next((log for log in call_logs if log.get('call_sid') == call_id), None)
-            
-            if matching_log:
-                return create_response(200, {
-                    'call_sid': call_id,
-                    'status': matching_log.get('call_status'),
-                    'duration': matching_log.get('call_duration_seconds'),
-                    'outcome': matching_log.get('outcome'),
-                    'summary': matching_log.get('conversation_summary'),
-                    'created_at': matching_log.get('created_at').isoformat() if matching_log.get('created_at') else None
-                })
-            else:
-                return create_response(404, {'error': 'Call not found'})
+    if DATABASE_MODE == "postgresql":
+        matching_log = telecaller_db.get_call_log_by_sid(call_id)
+        
+        if matching_log:
+            return create_response(200, {
+                'call_sid': call_id,
+                'status': matching_log.get('call_status'),
+                'duration': matching_log.get('call_duration_seconds'),
+                'outcome': matching_log.get('outcome'),
+                'summary': matching_log.get('conversation_summary'),
+                'created_at': matching_log.get('created_at').isoformat() if matching_log.get('created_at') else None
+            })
         else:
-            return create_response(503, {'error': 'Call status not available in embedded mode'})
-            
-    except Exception as e:
-        logger.error(f"Error fetching call status: {e}")
-        return create_response(500, {'error': 'Failed to fetch call status', 'details': str(e)})
+            return create_response(404, {'error': 'Call not found'})
+    else:
+        return create_response(503, {'error': 'Call status not available in embedded mode'})
 
+@route_handler('Failed to execute campaign')
 def handle_execute_campaign(body: Dict[str, Any]) -> Dict[str, Any]:
     """Execute a telecaller campaign"""
+    # Extract campaign parameters
+    program_event_id = body.get('program_event_id')
+    partner_ids = body.get('partner_ids', [])
+    
+    if not program_event_id:
+        return create_response(400, {'error': 'program_event_id is required'})
+    
+    if not partner_ids:
+        return create_response(400, {'error': 'partner_ids list is required'})
+    
+    # JSON clients may send ids as strings; the batch lookup binds an int[] and keys rows by int
     try:
-        # Extract campaign parameters
-        program_event_id = body.get('program_event_id')
-        partner_ids = body.get('partner_ids', [])
-        
-        if not program_event_id:
-            return create_response(400, {'error': 'program_event_id is required'})
-        
-        if not partner_ids:
-            return create_response(400, {'error': 'partner_ids list is required'})
-        
-        results = []
-        
-        for partner_id in partner_ids:
-            try:
-                # Get partner details
-                if DATABASE_MODE == "postgresql":
-                    partner = telecaller_db.get_partner_by_id(partner_id)
-                    if not partner:
-                        results.append({
-                            'partner_id': partner_id,
-                            'success': False,
-                            'error': 'Partner not found'
-                        })
-                        continue
-                    
-                    # Extract phone number from contact field
-                    contact = partner.get('contact', '')
-                    # Simple phone number extraction (you may need more sophisticated parsing)
-                    phone_number = contact if contact.startswith('+') else f"+1{contact.replace('-', '').replace(' ', '')}"
-                    
-                    # Start call
-                    call_data = {
-                        'to_number': phone_number,
-                        'program_event_id': program_event_id,
-                        'partner_id': partner_id
-                    }
-                    
-                    call_result = handle_start_call(call_data)
-                    
-                    if call_result.get('statusCode') == 200:
-                        body_data = json.loads(call_result.get('body', '{}'))
-                        results.append({
-                            'partner_id': partner_id,
-                            'partner_name': partner.get('partner_name'),
-                            'success': True,
-                            'call_sid': body_data.get('call_sid')
-                        })
-                    else:
-                        results.append({
-                            'partner_id': partner_id,
-                            'success': False,
-                            'error': 'Failed to start call'
-                        })
-                        
-            except Exception as e:
-                logger.error(f"Error calling partner {partner_id}: {e}")
-                results.append({
-                    'partner_id': partner_id,
-                    'success': False,
-                    'error': str(e)
-                })
-        
-        successful_calls = len([r for r in results if r.get('success')])
-        
-        return create_response(200, {
-            'campaign_id': f"campaign_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
-            'program_event_id': program_event_id,
-            'total_calls': len(partner_ids),
-            'successful_calls': successful_calls,
-            'failed_calls': len(partner_ids) - successful_calls,
-            'results': results
-        })
+        if not isinstance(partner_ids, list):
+            raise TypeError
+        partner_ids = [int(partner_id) for partner_id in partner_ids]
+    except (TypeError, ValueError):
+        return create_response(400, {'error': 'partner_ids must be a list of integers'})
+    
+    results = []
+    if DATABASE_MODE == "postgresql":
+        # One query for every partner instead of a lookup per call
+        partners = telecaller_db.get_partners_by_ids(partner_ids)
         
+        # Each partner's call is an independent Twilio request plus DB writes; overlap them
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(CAMPAIGN_CALL_WORKERS, len(partner_ids))) as executor:
+            results = list(executor.map(
+                lambda partner_id: call_campaign_partner(partner_id, partners.get(partner_id), program_event_id),
+                partner_ids
+            ))
+    
+    successful_calls = len([r for r in results if r.get('success')])
+    
+    return create_response(200, {
+        'campaign_id': f"campaign_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+        'program_event_id': program_event_id,
+        'total_calls': len(partner_ids),
+        'successful_calls': successful_calls,
+        'failed_calls': len(partner_ids) - successful_calls,
+        'results': results
+    })
+
+def call_campaign_partner(partner_id: Any, partner: Optional[Dict[str, Any]], program_event_id: Any) -> Dict[str, Any]:
+    """Start the campaign call for one already-loaded partner"""
+    try:
+        if not partner:
+            return {
+                'partner_id': partner_id,
+                'success': False,
+                'error': 'Partner not found'
+            }
+
+        # Extract phone number from contact field
+        contact = partner.get('contact', '')
+        # Simple phone number extraction (you may need more sophisticated parsing)
+        phone_number = contact if contact.startswith('+') else f"+1{contact.replace('-', '').replace(' ', '')}"
+
+        call_result = start_call(phone_number, program_event_id, partner_id)
+
+        if call_result['success']:
+            return {
+                'partner_id': partner_id,
+                'partner_name': partner.get('partner_name'),
+                'success': True,
+                'call_sid': call_result['call_sid']
+            }
+        else:
+            return {
+                'partner_id': partner_id,
+                'success': False,
+                'error': 'Failed to start call'
+            }
+
     except Exception as e:
-        logger.error(f"Error executing campaign: {e}")
-        return create_response(500, {'error': 'Failed to execute campaign', 'details': str(e)})
+        logger.error(f"Error calling partner {partner_id}: {e}")
+        return {
+            'partner_id': partner_id,
+            'success': False,
+            'error': str(e)
+        }
 
 def create_response(status_code: int, body: Dict[str, Any]) -> Dict[str, Any]:
     """Create standardized Lambda response"""
     return {
         'statusCode': status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-            'Access-Control-Allow-Headers': 'Content-Type',
-            'Access-Control-Allow-Methods': 'GET,POST,OPTIONS'
-        },
-        'body': json.dumps(body, default=str)
+        'headers': JSON_HEADERS,
+        'body': encode_json(body)
     }
 
+# (method, path) -> handler(body, query_params), built once at import;
+# a None method matches any method
+ROUTES = {
+    (None, '/health'): lambda body, query_params: handle_health_check(query_params),
+    (None, '/programs'): lambda body, query_params: handle_get_programs(query_params),
+    (None, '/partners'): lambda body, query_params: handle_get_partners(query_params),
+    ('POST', '/call/start'): lambda body, query_params: handle_start_call(body),
+    ('POST', '/call/webhook'): lambda body, query_params: handle_call_webhook(body),
+    ('POST', '/campaign/execute'): lambda body, query_params: handle_execute_campaign(body),
+}
+
+# GET /call/status/{call_id}; the id is whatever follows the prefix
+CALL_STATUS_PREFIX = '/call/status/'
+
 # Flask app for local development
 if __name__ == "__main__":
     from flask import Flask, request
@@ -0,0 +1,109 @@
+"""
+Tests for the dashboard handler's bulk calls and system status
+Run with: python -m pytest app/handlers/test_dashboard_handler.py
+"""
+
+from unittest import mock
+
+import pytest
+
+pytest.importorskip('flask')
+pytest.importorskip('twilio')
+
+from flask import Flask
+
+from app.handlers import dashboard_handler
+from app.services.twilio_service import TwilioService
+
+class FakeDatabaseService:
+    def __init__(self):
+        self.partners = {
+            1: {'id': 1, 'name': 'Active School', 'phone': '+911234567890'},
+            2: {'id': 2, 'name': 'No Phone School', 'phone': None},
+        }
+
+    def get_partners_by_ids(self, partner_ids):
+        return {partner_id: self.partners[partner_id] for partner_id in partner_ids if partner_id in self.partners}
+
+    def get_event_by_id(self, event_id):
+        return {'id': event_id, 'name': 'Open Day', 'program_name': 'Data Science'}
+
+    def test_connection(self):
+        return True
+
+    def get_all_partners(self):
+        return list(self.partners.values())
+
+    def get_call_records(self, limit):
+        return [{'call_sid': 'CA1'}]
+
+    def count_partners(self):
+        return len(self.partners)
+
+    def count_events(self):
+        return 3
+
+@pytest.fixture
+def handler(monkeypatch):
+    db_service = FakeDatabaseService()
+    # autospec keeps the fake to TwilioService.make_call's real signature
+    twilio = mock.create_autospec(TwilioService, instance=True)
+    monkeypatch.setattr(dashboard_handler, 'get_database_service', lambda: db_service)
+    monkeypatch.setattr(dashboard_handler, 'twilio_service', twilio)
+    dashboard_handler.system_status_cache.clear()
+    yield dashboard_handler.DashboardHandler()
+    dashboard_handler.system_status_cache.clear()
+
+def bulk_call(handler, body):
+    with Flask(__name__).test_request_context(method='POST', json=body):
+        return handler.bulk_call()
+
+def test_bulk_call_passes_prompt_and_metadata_to_make_call(handler):
+    handler.twilio_service.make_call.return_value = {'call_sid': 'CA1', 'status': 'queued'}
+
+    response = bulk_call(handler, {'partner_ids': ['1', 2], 'event_id': 7})
+
+    assert response.get_json()['results'] == [
+        {'partner_id': 1, 'phone': '+911234567890', 'status': 'success', 'call_sid': 'CA1'}
+    ]
+    kwargs = handler.twilio_service.make_call.call_args.kwargs
+    assert kwargs['to_number'] == '+911234567890'
+    assert 'Active School' in kwargs['system_prompt'] and 'Data Science' in kwargs['system_prompt']
+    assert kwargs['call_metadata']['partner_id'] == 1
+    assert kwargs['call_metadata']['event_id'] == 7
+
+def test_bulk_call_reports_calls_twilio_rejected(handler):
+    handler.twilio_service.make_call.return_value = {'call_sid': None, 'status': 'FAILED'}
+
+    response = bulk_call(handler, {'partner_ids': [1]})
+
+    assert response.get_json()['results'][0]['status'] == 'failed'
+
+def test_system_status_runs_every_check(handler):
+    handler.twilio_service.test_connection.return_value = True
+
+    assert handler._get_system_status() == {
+        'status': 'online',
+        'twilio_connected': True,
+        'database_connected': True,
+        'total_partners': 2,
+        'total_events': 3
+    }
+
+def test_failed_check_only_marks_its_own_field(handler):
+    handler.twilio_service.test_connection.side_effect = RuntimeError('DNS failure')
+
+    status = handler._get_system_status()
+
+    assert status['twilio_connected'] is False
+    assert status['database_connected'] is True
+
+def test_dashboard_home_loads_only_what_it_renders(handler, monkeypatch):
+    rendered = {}
+    monkeypatch.setattr(dashboard_handler, 'render_template', lambda name, **context: rendered.update(context) or name)
+    handler.twilio_service.test_connection.return_value = True
+
+    # FakeDatabaseService has no get_dashboard_snapshot, so calling it would fail the render
+    assert handler.dashboard_home() == 'dashboard.html'
+    assert rendered['partners'] == handler.db_service.get_all_partners()
+    assert rendered['recent_calls'] == [{'call_sid': 'CA1'}]
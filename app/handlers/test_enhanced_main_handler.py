@@ -0,0 +1,149 @@
+"""
+Tests for the Lambda handler: AI reply cache, health cache and campaign partner lookup
+Run with: python -m pytest app/handlers/test_enhanced_main_handler.py
+"""
+
+import pytest
+
+from app.handlers import enhanced_main_handler as handler
+
+class FakeCheckpointer:
+    def __init__(self):
+        self.threads = set()
+
+    def get_tuple(self, config):
+        return config['configurable']['thread_id'] if config['configurable']['thread_id'] in self.threads else None
+
+class FakeTelecaller:
+    """Stands in for the LangGraph agent; records every turn it is asked to answer"""
+
+    def __init__(self):
+        self.checkpointer = FakeCheckpointer()
+        self.turns = []
+
+    def process_call(self, call_context, user_input=None):
+        self.turns.append((call_context.get('call_sid'), user_input))
+        self.checkpointer.threads.add(call_context.get('call_sid'))
+        return {'success': True, 'response': f"reply {len(self.turns)}"}
+
+@pytest.fixture
+def telecaller(monkeypatch):
+    fake = FakeTelecaller()
+    monkeypatch.setattr(handler, 'get_langgraph_telecaller', lambda: fake)
+    handler.ai_reply_cache.clear()
+    handler.answered_calls.clear()
+    yield fake
+    handler.ai_reply_cache.clear()
+    handler.answered_calls.clear()
+
+def context(call_sid, program_event_id=1, partner_id=2):
+    return {'call_sid': call_sid, 'program_event_id': program_event_id, 'partner_id': partner_id}
+
+def test_opening_turn_is_reused_across_calls(telecaller):
+    first = handler.process_call_input(context('CA1'), '')
+    second = handler.process_call_input(context('CA2'), '')
+
+    assert second['response'] == first['response']
+    assert telecaller.turns == [('CA1', '')]
+
+def test_mid_call_hello_reaches_the_agent(telecaller):
+    handler.process_call_input(context('CA1'), 'Hello')
+    handler.process_call_input(context('CA2'), 'Hello')   # cache hit
+    result = handler.process_call_input(context('CA2'), 'Hello')
+
+    assert telecaller.turns == [('CA1', 'Hello'), ('CA2', 'Hello')]
+    assert result['response'] == 'reply 2'
+
+def test_gather_timeout_is_not_answered_with_the_opening(telecaller):
+    handler.process_call_input(context('CA1'), '')
+    handler.process_call_input(context('CA1'), '')
+
+    assert telecaller.turns == [('CA1', ''), ('CA1', '')]
+
+def test_turn_with_agent_history_is_not_cached(telecaller):
+    # Another process answered earlier turns of this call
+    telecaller.checkpointer.threads.add('CA1')
+    handler.ai_reply_cache.set((1, 2, ''), 'cached opening')
+
+    result = handler.process_call_input(context('CA1'), '')
+
+    assert result['response'] == 'reply 1'
+
+def test_unknown_call_context_is_not_cached(telecaller):
+    handler.process_call_input(context('CA1', None, None), '')
+    handler.process_call_input(context('CA2', None, None), '')
+
+    assert len(telecaller.turns) == 2
+    assert handler.ai_reply_cache.get((None, None, '')) is None
+
+@pytest.fixture
+def health_checks(monkeypatch):
+    statuses = []
+    def run_health_check(deep):
+        statuses.append(deep)
+        return handler.create_response(200, {'status': results.pop(0)})
+    results = []
+    monkeypatch.setattr(handler, 'run_health_check', run_health_check)
+    handler.health_cache.clear()
+    yield results, statuses
+    handler.health_cache.clear()
+
+def test_healthy_result_is_cached(health_checks):
+    results, statuses = health_checks
+    results.extend(['healthy'])
+
+    handler.handle_health_check({})
+    handler.handle_health_check({})
+
+    assert statuses == [False]
+
+def test_degraded_result_is_rechecked(health_checks):
+    results, statuses = health_checks
+    results.extend(['degraded', 'healthy'])
+
+    first = handler.handle_health_check({})
+    second = handler.handle_health_check({})
+
+    assert statuses == [False, False]
+    assert handler.decode_json(first['body'])['status'] == 'degraded'
+    assert handler.decode_json(second['body'])['status'] == 'healthy'
+
+class FakeTelecallerDB:
+    def __init__(self):
+        self.lookups = []
+
+    def get_partners_by_ids(self, partner_ids):
+        self.lookups.append(partner_ids)
+        return {partner_id: {'partner_id': partner_id} for partner_id in partner_ids if partner_id != 404}
+
+@pytest.fixture
+def campaign(monkeypatch):
+    db = FakeTelecallerDB()
+    calls = []
+    def call_campaign_partner(partner_id, partner, program_event_id):
+        calls.append((partner_id, partner))
+        return {'partner_id': partner_id, 'success': partner is not None}
+    monkeypatch.setattr(handler, 'DATABASE_MODE', 'postgresql')
+    monkeypatch.setattr(handler, 'telecaller_db', db, raising=False)
+    monkeypatch.setattr(handler, 'call_campaign_partner', call_campaign_partner)
+    return db, calls
+
+def test_campaign_loads_partners_in_one_lookup(campaign):
+    db, calls = campaign
+
+    response = handler.handle_execute_campaign({'program_event_id': 5, 'partner_ids': ['1', 2, 404]})
+    body = handler.decode_json(response['body'])
+
+    assert response['statusCode'] == 200
+    assert db.lookups == [[1, 2, 404]]
+    assert sorted(calls, key=lambda call: call[0]) == [(1, {'partner_id': 1}), (2, {'partner_id': 2}), (404, None)]
+    assert (body['successful_calls'], body['failed_calls']) == (2, 1)
+
+@pytest.mark.parametrize('partner_ids', ['1,2', ['one'], [None]])
+def test_campaign_rejects_non_integer_partner_ids(campaign, partner_ids):
+    db, calls = campaign
+
+    response = handler.handle_execute_campaign({'program_event_id': 5, 'partner_ids': partner_ids})
+
+    assert response['statusCode'] == 400
+    assert db.lookups == [] and calls == []
@@ -0,0 +1,41 @@
+"""
+Request bodies for the templated email API routes
+Only the required fields are declared; any other keys are kept and passed
+through to the email service as template data
+"""
+
+from typing import Annotated, ClassVar, Union
+
+from pydantic import BaseModel, ConfigDict, Field
+
+NonEmptyStr = Annotated[str, Field(min_length=1)]
+
+class TemplatedEmailRequest(BaseModel):
+    """Base request: every templated email needs a recipient"""
+    model_config = ConfigDict(extra='allow')
+
+    # Error text returned with the 400 when validation fails
+    required_message: ClassVar[str] = 'to_email is required'
+
+    to_email: NonEmptyStr
+
+class SignupEmailRequest(TemplatedEmailRequest):
+    """POST /api/templated-email/send-signup"""
+
+class ForgotPasswordEmailRequest(TemplatedEmailRequest):
+    """POST /api/templated-email/send-forgot-password"""
+
+class OTPEmailRequest(TemplatedEmailRequest):
+    """POST /api/templated-email/send-otp"""
+    required_message: ClassVar[str] = 'to_email and otp are required'
+
+    otp: Union[NonEmptyStr, int]
+
+class OrderConfirmationEmailRequest(TemplatedEmailRequest):
+    """POST /api/templated-email/send-order-confirmation"""
+    required_message: ClassVar[str] = 'to_email and orderId are required'
+
+    orderId: Union[NonEmptyStr, int]
+
+class WelcomePackEmailRequest(TemplatedEmailRequest):
+    """POST /api/templated-email/send-welcome-pack"""
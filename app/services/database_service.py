@@ -3,15 +3,146 @@ PostgreSQL Database Service for AI Telecaller System
 Handles database operations for partners, programs, events, and call records
 """
 
+import functools
 import logging
 import os
+import sqlite3
+import threading
 import psycopg2
 import psycopg2.extras
-from typing import List, Dict, Any, Optional
+from contextlib import contextmanager
+from psycopg2.pool import PoolError, ThreadedConnectionPool
+from typing import List, Dict, Any, Iterator, Optional
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+PARTNER_COLUMNS = """
+        partner_id as id, 
+        partner_name as name, 
+        contact_type as type, 
+        is_active as active, 
+        contact_phone as phone,
+        contact_email as email,
+        contact_person_name as contact_person,
+        create_date as created_at,
+        update_date as updated_at
+"""
+
+ACTIVE_PARTNERS_SQL = f"""
+    SELECT {PARTNER_COLUMNS}
+    FROM partners
+    WHERE is_active = true
+    ORDER BY partner_name
+"""
+
+# Single-row lookup in the same shape as ACTIVE_PARTNERS_SQL; the second
+# parameter restricts it to active partners
+PARTNER_BY_ID_SQL = f"""
+    SELECT {PARTNER_COLUMNS}
+    FROM partners
+    WHERE partner_id = %s AND (is_active = true OR NOT %s)
+    LIMIT 1
+"""
+
+PROGRAM_COLUMNS = """
+        program_id as id, 
+        name, 
+        description, 
+        program_category_id as type, 
+        is_active as active, 
+        create_date as created_at
+"""
+
+ACTIVE_PROGRAMS_SQL = f"""
+    SELECT {PROGRAM_COLUMNS}
+    FROM programs
+    WHERE is_active = true
+    ORDER BY name
+"""
+
+PROGRAM_BY_ID_SQL = f"""
+    SELECT {PROGRAM_COLUMNS}
+    FROM programs
+    WHERE program_id = %s AND (is_active = true OR NOT %s)
+    LIMIT 1
+"""
+
+ACTIVE_EVENTS_SQL = """
+    SELECT 
+        pe.program_event_id as id, 
+        pe.program_id, 
+        pe.event_name as name, 
+        pe.start_date as event_date, 
+        pe.end_date, 
+        pe.program_delivery as location, 
+        pe.seats as capacity,
+        pe.is_active as active, 
+        pe.create_date as created_at, 
+        p.name as program_name
+    FROM program_events pe
+    JOIN programs p ON pe.program_id = p.program_id
+    WHERE pe.is_active = true
+    ORDER BY pe.start_date
+"""
+
+# Row counts for status checks, without fetching the rows themselves
+COUNT_ACTIVE_PARTNERS_SQL = "SELECT COUNT(*) FROM partners WHERE is_active = true"
+COUNT_ACTIVE_EVENTS_SQL = """
+    SELECT COUNT(*)
+    FROM program_events pe
+    JOIN programs p ON pe.program_id = p.program_id
+    WHERE pe.is_active = true
+"""
+
+# Columns written by record_call
+CALL_RECORD_COLUMNS = (
+    'call_sid', 'partner_id', 'program_event_id', 'caller_number',
+    'recipient_number', 'call_status'
+)
+
+# Twilio status callbacks can arrive before the call they describe is recorded,
+# and call_sid has no unique constraint to upsert on. record_call and
+# update_call_status hold this per-call lock for their transaction and
+# update the row if it exists, inserting it otherwise.
+LOCK_CALL_LOG_SQL = "SELECT pg_advisory_xact_lock(hashtext(%s))"
+
+RECORD_CALL_UPDATE_SQL = """
+    UPDATE call_logs
+    SET partner_id = %(partner_id)s,
+        program_event_id = %(program_event_id)s,
+        caller_number = %(caller_number)s,
+        recipient_number = %(recipient_number)s,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE call_sid = %(call_sid)s
+"""
+
+RECORD_CALL_INSERT_SQL = f"""
+    INSERT INTO call_logs ({', '.join(CALL_RECORD_COLUMNS)}, created_at)
+    VALUES ({', '.join(f'%({column})s' for column in CALL_RECORD_COLUMNS)}, CURRENT_TIMESTAMP)
+"""
+
+UPDATE_CALL_STATUS_SQL = """
+    UPDATE call_logs
+    SET call_status = %s,
+        call_duration_seconds = COALESCE(%s, call_duration_seconds),
+        updated_at = CURRENT_TIMESTAMP
+    WHERE call_sid = %s
+"""
+
+INSERT_CALL_STATUS_SQL = """
+    INSERT INTO call_logs (call_status, call_duration_seconds, call_sid, created_at)
+    VALUES (%s, %s, %s, CURRENT_TIMESTAMP)
+"""
+
+# All dashboard lists in one statement; json_agg keeps each list's ORDER BY
+DASHBOARD_SNAPSHOT_SQL = f"""
+    SELECT
+        (SELECT COALESCE(json_agg(p), '[]'::json) FROM ({ACTIVE_PARTNERS_SQL}) p) AS partners,
+        (SELECT COALESCE(json_agg(g), '[]'::json) FROM ({ACTIVE_PROGRAMS_SQL}) g) AS programs,
+        (SELECT COALESCE(json_agg(e), '[]'::json) FROM ({ACTIVE_EVENTS_SQL}) e) AS events
+"""
+
 class DatabaseService:
     """PostgreSQL database service for managing telecaller data"""
     
@@ -29,14 +160,78 @@ class DatabaseService:
         if database_url:
             self.database_url = database_url
         
+        self.pool_min = int(os.getenv('DB_POOL_MIN', 1))
+        self.pool_max = int(os.getenv('DB_POOL_MAX', 10))
+        self.pool_timeout = float(os.getenv('DB_POOL_TIMEOUT', 2))
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        # ThreadedConnectionPool raises as soon as it is exhausted; callers queue here instead
+        self._pool_slots = threading.BoundedSemaphore(self.pool_max)
+        # Checkout counters reported by get_pool_stats
+        self._stats_lock = threading.Lock()
+        self._in_use = 0
+        self._waiting = 0
+        
         self.use_sqlite = False
         self._test_connection()
         logger.info(f"✅ Database service initialized")
     
+    def get_pool(self) -> ThreadedConnectionPool:
+        """Get the shared connection pool, creating it on first use"""
+        if self._pool is None or self._pool.closed:
+            with self._pool_lock:
+                if self._pool is None or self._pool.closed:
+                    self._pool = ThreadedConnectionPool(self.pool_min, self.pool_max, **self.db_config)
+        return self._pool
+    
+    @contextmanager
+    def _connection(self):
+        """
+        Borrow a pooled PostgreSQL connection, committing or rolling back on exit
+        Waits up to pool_timeout seconds for a free connection when all are in use
+        """
+        with self._stats_lock:
+            self._waiting += 1
+        try:
+            acquired = self._pool_slots.acquire(timeout=self.pool_timeout)
+        finally:
+            with self._stats_lock:
+                self._waiting -= 1
+        if not acquired:
+            raise PoolError(f"No database connection free after {self.pool_timeout}s (DB_POOL_MAX={self.pool_max})")
+        try:
+            pool = self.get_pool()
+            conn = pool.getconn()
+            with self._stats_lock:
+                self._in_use += 1
+            try:
+                with conn:
+                    yield conn
+            finally:
+                with self._stats_lock:
+                    self._in_use -= 1
+                pool.putconn(conn, close=conn.closed != 0)
+        finally:
+            self._pool_slots.release()
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get connection pool usage for health checks and metrics, from _connection()'s own counters"""
+        if self.use_sqlite:
+            return {'backend': 'sqlite', 'in_use': 0, 'waiting': 0, 'free': self.pool_max, 'max': self.pool_max}
+        with self._stats_lock:
+            in_use, waiting = self._in_use, self._waiting
+        return {
+            'backend': 'postgresql',
+            'in_use': in_use,
+            'waiting': waiting,
+            'free': self.pool_max - in_use,
+            'max': self.pool_max
+        }
+    
     def _test_connection(self):
         """Test PostgreSQL database connection"""
         try:
-            with psycopg2.connect(**self.db_config) as conn:
+            with self._connection() as conn:
                 with conn.cursor() as cursor:
                     cursor.execute("SELECT version();")
                     version = cursor.fetchone()
@@ -48,6 +243,21 @@ class DatabaseService:
             logger.warning("🔄 Falling back to SQLite for local testing")
             self._init_sqlite_fallback()
     
+    def test_connection(self) -> bool:
+        """Check that the active backend (PostgreSQL or the SQLite fallback) answers a query"""
+        try:
+            if self.use_sqlite:
+                with sqlite3.connect(self.database_path) as conn:
+                    conn.execute("SELECT 1")
+                return True
+            with self._connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Database connection check failed: {e}")
+            return False
+    
     def _explore_database_schema(self, conn):
         """Explore and log the actual database schema"""
         try:
@@ -87,7 +297,6 @@ class DatabaseService:
 
     def _init_sqlite_fallback(self):
         """Initialize SQLite fallback for local testing"""
-        import sqlite3
         self.use_sqlite = True
         self.database_path = "telecaller.db"
         
@@ -226,7 +435,6 @@ class DatabaseService:
     def _get_partners_sqlite(self) -> List[Dict[str, Any]]:
         """Get partners from SQLite"""
         try:
-            import sqlite3
             with sqlite3.connect(self.database_path) as conn:
                 conn.row_factory = sqlite3.Row
                 cursor = conn.cursor()
@@ -264,23 +472,9 @@ class DatabaseService:
     def _get_partners_postgresql(self) -> List[Dict[str, Any]]:
         """Get partners from PostgreSQL"""
         try:
-            with psycopg2.connect(**self.db_config) as conn:
+            with self._connection() as conn:
                 with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
-                    cursor.execute("""
-                        SELECT 
-                            partner_id as id, 
-                            partner_name as name, 
-                            contact_type as type, 
-                            is_active as active, 
-                            contact_phone as phone,
-                            contact_email as email,
-                            contact_person_name as contact_person,
-                            create_date as created_at,
-                            update_date as updated_at
-                        FROM partners
-                        WHERE is_active = true
-                        ORDER BY partner_name
-                    """)
+                    cursor.execute(ACTIVE_PARTNERS_SQL)
                     
                     partners = []
                     for row in cursor.fetchall():
@@ -293,24 +487,56 @@ class DatabaseService:
             logger.error(f"❌ Error getting partners from PostgreSQL: {e}")
             return []
     
-    def get_partner_by_id(self, partner_id):
-        """Get a specific partner by ID"""
+    def iter_all_partners(self, itersize: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Yield active partners one at a time, in the same shape as get_all_partners()
+        PostgreSQL rows come from a server-side cursor in itersize chunks, so
+        memory stays flat however many partners there are
+        """
+        if self.use_sqlite:
+            with sqlite3.connect(self.database_path) as conn:
+                conn.row_factory = sqlite3.Row
+                cursor = conn.execute("""
+                    SELECT id, name, type, active, phone, email, contact_person, 
+                           created_at, updated_at, status_id
+                    FROM partners
+                    WHERE active = 1
+                    ORDER BY name
+                """)
+                for row in cursor:
+                    partner = dict(row)
+                    partner['active'] = bool(partner['active'])
+                    yield partner
+            return
+        
+        with self._connection() as conn:
+            with conn.cursor(name='iter_all_partners', cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+                cursor.itersize = itersize
+                cursor.execute(ACTIVE_PARTNERS_SQL)
+                for row in cursor:
+                    yield dict(row)
+    
+    def get_partner_by_id(self, partner_id, active_only: bool = False):
+        """
+        Get a specific partner by ID
+        With active_only=True deactivated partners are treated as missing, as
+        the get_all_partners() listing does, so no calls are placed for them
+        """
         try:
             if self.use_sqlite:
-                return self._get_partner_by_id_sqlite(partner_id)
+                return self._get_partner_by_id_sqlite(partner_id, active_only)
             else:
-                return self._get_partner_by_id_postgresql(partner_id)
+                return self._get_partner_by_id_postgresql(partner_id, active_only)
         except Exception as e:
             logger.error(f"Error getting partner by ID {partner_id}: {e}")
             return None
 
-    def _get_partner_by_id_sqlite(self, partner_id):
+    def _get_partner_by_id_sqlite(self, partner_id, active_only: bool = False):
         """Get a specific partner by ID from SQLite"""
         try:
-            import sqlite3
             with sqlite3.connect(self.database_path) as conn:
                 cursor = conn.cursor()
-                cursor.execute("SELECT * FROM partners WHERE id = ?", (partner_id,))
+                cursor.execute("SELECT * FROM partners WHERE id = ? AND (active = 1 OR NOT ?)", (partner_id, active_only))
                 row = cursor.fetchone()
                 if row:
                     columns = [description[0] for description in cursor.description]
@@ -320,26 +546,12 @@ class DatabaseService:
             logger.error(f"❌ Error getting partner {partner_id} from SQLite: {e}")
             return None
 
-    def _get_partner_by_id_postgresql(self, partner_id):
+    def _get_partner_by_id_postgresql(self, partner_id, active_only: bool = False):
         """Get a specific partner by ID from PostgreSQL"""
         try:
-            from psycopg2.extras import RealDictCursor
-            with psycopg2.connect(**self.db_config) as conn:
-                cursor = conn.cursor(cursor_factory=RealDictCursor)
-                cursor.execute("""
-                    SELECT 
-                        partner_id as id, 
-                        partner_name as name, 
-                        contact_type as type, 
-                        is_active as active, 
-                        contact_phone as phone,
-                        contact_email as email,
-                        contact_person_name as contact_person,
-                        create_date as created_at,
-                        update_date as updated_at
-                    FROM partners 
-                    WHERE partner_id = %s
-                """, (partner_id,))
+            with self._connection() as conn:
+                cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+                cursor.execute(PARTNER_BY_ID_SQL, (partner_id, active_only))
                 result = cursor.fetchone()
                 return dict(result) if result else None
         except Exception as e:
@@ -357,24 +569,26 @@ class DatabaseService:
             logger.error(f"❌ Error getting programs: {e}")
             return []
     
-    def get_program_by_id(self, program_id: int) -> Dict[str, Any]:
-        """Get a specific program by ID"""
+    def get_program_by_id(self, program_id: int, active_only: bool = False) -> Dict[str, Any]:
+        """
+        Get a specific program by ID, in the same shape as get_all_programs() rows
+        With active_only=True deactivated programs are treated as missing
+        """
         try:
             if self.use_sqlite:
-                return self._get_program_by_id_sqlite(program_id)
+                return self._get_program_by_id_sqlite(program_id, active_only)
             else:
-                return self._get_program_by_id_postgresql(program_id)
+                return self._get_program_by_id_postgresql(program_id, active_only)
         except Exception as e:
             logger.error(f"Error getting program by ID {program_id}: {e}")
             return None
 
-    def _get_program_by_id_sqlite(self, program_id):
+    def _get_program_by_id_sqlite(self, program_id, active_only: bool = False):
         """Get a specific program by ID from SQLite"""
         try:
-            import sqlite3
             with sqlite3.connect(self.database_path) as conn:
                 cursor = conn.cursor()
-                cursor.execute("SELECT * FROM programs WHERE id = ?", (program_id,))
+                cursor.execute("SELECT * FROM programs WHERE id = ? AND (active = 1 OR NOT ?)", (program_id, active_only))
                 row = cursor.fetchone()
                 if row:
                     columns = [description[0] for description in cursor.description]
@@ -384,23 +598,12 @@ class DatabaseService:
             logger.error(f"❌ Error getting program {program_id} from SQLite: {e}")
             return None
 
-    def _get_program_by_id_postgresql(self, program_id):
+    def _get_program_by_id_postgresql(self, program_id, active_only: bool = False):
         """Get a specific program by ID from PostgreSQL"""
         try:
-            from psycopg2.extras import RealDictCursor
-            with psycopg2.connect(**self.db_config) as conn:
-                cursor = conn.cursor(cursor_factory=RealDictCursor)
-                cursor.execute("""
-                    SELECT 
-                        program_id as id, 
-                        program_name as name, 
-                        program_description as description,
-                        program_duration as duration,
-                        create_date as created_at,
-                        update_date as updated_at
-                    FROM programs 
-                    WHERE program_id = %s
-                """, (program_id,))
+            with self._connection() as conn:
+                cursor = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+                cursor.execute(PROGRAM_BY_ID_SQL, (program_id, active_only))
                 result = cursor.fetchone()
                 return dict(result) if result else None
         except Exception as e:
@@ -410,7 +613,6 @@ class DatabaseService:
     def _get_programs_sqlite(self) -> List[Dict[str, Any]]:
         """Get programs from SQLite"""
         try:
-            import sqlite3
             with sqlite3.connect(self.database_path) as conn:
                 conn.row_factory = sqlite3.Row
                 cursor = conn.cursor()
@@ -443,20 +645,9 @@ class DatabaseService:
     def _get_programs_postgresql(self) -> List[Dict[str, Any]]:
         """Get programs from PostgreSQL"""
         try:
-            with psycopg2.connect(**self.db_config) as conn:
+            with self._connection() as conn:
                 with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
-                    cursor.execute("""
-                        SELECT 
-                            program_id as id, 
-                            name, 
-                            description, 
-                            program_category_id as type, 
-                            is_active as active, 
-                            create_date as created_at
-                        FROM programs
-                        WHERE is_active = true
-                        ORDER BY name
-                    """)
+                    cursor.execute(ACTIVE_PROGRAMS_SQL)
                     
                     programs = []
                     for row in cursor.fetchall():
@@ -483,7 +674,6 @@ class DatabaseService:
     def _get_program_events_sqlite(self, program_id: int = None) -> List[Dict[str, Any]]:
         """Get program events from SQLite"""
         try:
-            import sqlite3
             with sqlite3.connect(self.database_path) as conn:
                 conn.row_factory = sqlite3.Row
                 cursor = conn.cursor()
@@ -535,7 +725,7 @@ class DatabaseService:
     def _get_program_events_postgresql(self, program_id: int = None) -> List[Dict[str, Any]]:
         """Get program events from PostgreSQL"""
         try:
-            with psycopg2.connect(**self.db_config) as conn:
+            with self._connection() as conn:
                 with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
                     if program_id:
                         cursor.execute("""
@@ -556,23 +746,7 @@ class DatabaseService:
                             ORDER BY pe.start_date
                         """, (program_id,))
                     else:
-                        cursor.execute("""
-                            SELECT 
-                                pe.program_event_id as id, 
-                                pe.program_id, 
-                                pe.event_name as name, 
-                                pe.start_date as event_date, 
-                                pe.end_date, 
-                                pe.program_delivery as location, 
-                                pe.seats as capacity,
-                                pe.is_active as active, 
-                                pe.create_date as created_at, 
-                                p.name as program_name
-                            FROM program_events pe
-                            JOIN programs p ON pe.program_id = p.program_id
-                            WHERE pe.is_active = true
-                            ORDER BY pe.start_date
-                        """)
+                        cursor.execute(ACTIVE_EVENTS_SQL)
                     
                     events = []
                     for row in cursor.fetchall():
@@ -585,6 +759,71 @@ class DatabaseService:
             logger.error(f"❌ Error getting program events from PostgreSQL: {e}")
             return []
     
+    def get_event_by_id(self, event_id: int, program_id: int = None) -> Optional[Dict[str, Any]]:
+        """
+        Get an active program event by ID, optionally requiring it to belong to program_id
+        Deactivated events are treated as missing so no calls are placed for them
+        """
+        try:
+            if self.use_sqlite:
+                return self._get_event_by_id_sqlite(event_id, program_id)
+            else:
+                return self._get_event_by_id_postgresql(event_id, program_id)
+        except Exception as e:
+            logger.error(f"Error getting event by ID {event_id}: {e}")
+            return None
+
+    def _get_event_by_id_sqlite(self, event_id: int, program_id: int = None) -> Optional[Dict[str, Any]]:
+        """Get a specific program event by ID from SQLite"""
+        try:
+            with sqlite3.connect(self.database_path) as conn:
+                conn.row_factory = sqlite3.Row
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT pe.id, pe.program_id, pe.name, pe.description, 
+                           pe.start_date, pe.end_date, pe.location, pe.capacity,
+                           pe.active, pe.created_at, p.name as program_name
+                    FROM program_events pe
+                    JOIN programs p ON pe.program_id = p.id
+                    WHERE pe.id = ? AND pe.active = 1 AND (? IS NULL OR pe.program_id = ?)
+                    LIMIT 1
+                """, (event_id, program_id, program_id))
+                row = cursor.fetchone()
+                return dict(row) if row else None
+        except Exception as e:
+            logger.error(f"❌ Error getting event {event_id} from SQLite: {e}")
+            return None
+
+    def _get_event_by_id_postgresql(self, event_id: int, program_id: int = None) -> Optional[Dict[str, Any]]:
+        """Get a specific program event by ID from PostgreSQL"""
+        try:
+            with self._connection() as conn:
+                with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+                    cursor.execute("""
+                        SELECT 
+                            pe.program_event_id as id, 
+                            pe.program_id, 
+                            pe.event_name as name, 
+                            pe.start_date, 
+                            pe.end_date, 
+                            pe.program_delivery as location, 
+                            pe.seats as capacity,
+                            pe.is_active as active, 
+                            pe.create_date as created_at, 
+                            p.name as program_name
+                        FROM program_events pe
+                        JOIN programs p ON pe.program_id = p.program_id
+                        WHERE pe.program_event_id = %s
+                          AND pe.is_active = true
+                          AND (%s IS NULL OR pe.program_id = %s)
+                        LIMIT 1
+                    """, (event_id, program_id, program_id))
+                    row = cursor.fetchone()
+                    return dict(row) if row else None
+        except Exception as e:
+            logger.error(f"❌ Error getting event {event_id} from PostgreSQL: {e}")
+            return None
+    
     def get_partner_by_phone(self, phone: str) -> Optional[Dict[str, Any]]:
         """Get partner by phone number"""
         try:
@@ -599,7 +838,6 @@ class DatabaseService:
     def _get_partner_by_phone_sqlite(self, phone: str) -> Optional[Dict[str, Any]]:
         """Get partner by phone from SQLite"""
         try:
-            import sqlite3
             with sqlite3.connect(self.database_path) as conn:
                 conn.row_factory = sqlite3.Row
                 cursor = conn.cursor()
@@ -632,7 +870,7 @@ class DatabaseService:
     def _get_partner_by_phone_postgresql(self, phone: str) -> Optional[Dict[str, Any]]:
         """Get partner by phone from PostgreSQL"""
         try:
-            with psycopg2.connect(**self.db_config) as conn:
+            with self._connection() as conn:
                 with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
                     cursor.execute("""
                         SELECT id, name, type, phone, email, contact_person, active, status_id
@@ -650,6 +888,126 @@ class DatabaseService:
             logger.error(f"❌ Error getting partner by phone from PostgreSQL: {e}")
             return None
     
+    def get_partners_by_ids(self, partner_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Get several partners in one query, keyed by partner ID (unknown IDs are omitted)"""
+        partner_ids = list(dict.fromkeys(partner_ids))
+        if not partner_ids:
+            return {}
+        try:
+            if self.use_sqlite:
+                return self._get_partners_by_ids_sqlite(partner_ids)
+            else:
+                return self._get_partners_by_ids_postgresql(partner_ids)
+        except Exception as e:
+            logger.error(f"❌ Error getting partners by ID: {e}")
+            return {}
+    
+    def _get_partners_by_ids_sqlite(self, partner_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Get partners by ID from SQLite"""
+        try:
+            with sqlite3.connect(self.database_path) as conn:
+                conn.row_factory = sqlite3.Row
+                cursor = conn.cursor()
+                
+                placeholders = ', '.join('?' for _ in partner_ids)
+                cursor.execute(f"SELECT * FROM partners WHERE id IN ({placeholders})", partner_ids)
+                
+                return {row['id']: dict(row) for row in cursor.fetchall()}
+                
+        except Exception as e:
+            logger.error(f"❌ Error getting partners by ID from SQLite: {e}")
+            return {}
+    
+    def _get_partners_by_ids_postgresql(self, partner_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Get partners by ID from PostgreSQL"""
+        try:
+            with self._connection() as conn:
+                with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+                    cursor.execute("""
+                        SELECT 
+                            partner_id as id, 
+                            partner_name as name, 
+                            contact_type as type, 
+                            is_active as active, 
+                            contact_phone as phone,
+                            contact_email as email,
+                            contact_person_name as contact_person,
+                            create_date as created_at,
+                            update_date as updated_at
+                        FROM partners 
+                        WHERE partner_id = ANY(%s)
+                    """, (partner_ids,))
+                    
+                    return {row['id']: dict(row) for row in cursor.fetchall()}
+                    
+        except Exception as e:
+            logger.error(f"❌ Error getting partners by ID from PostgreSQL: {e}")
+            return {}
+    
+    def get_partner_by_phone_in(self, phones: List[str]) -> Optional[Dict[str, Any]]:
+        """Get the first active partner whose phone matches any of the given numbers"""
+        phones = [phone for phone in phones if phone]
+        if not phones:
+            return None
+        try:
+            if self.use_sqlite:
+                return self._get_partner_by_phone_in_sqlite(phones)
+            else:
+                return self._get_partner_by_phone_in_postgresql(phones)
+        except Exception as e:
+            logger.error(f"❌ Error getting partner by phone: {e}")
+            return None
+    
+    def _get_partner_by_phone_in_sqlite(self, phones: List[str]) -> Optional[Dict[str, Any]]:
+        """Get partner matching any of several phones from SQLite"""
+        try:
+            with sqlite3.connect(self.database_path) as conn:
+                conn.row_factory = sqlite3.Row
+                cursor = conn.cursor()
+                
+                placeholders = ', '.join('?' for _ in phones)
+                cursor.execute(f"""
+                    SELECT id, name, type, phone, email, contact_person, active, status_id
+                    FROM partners
+                    WHERE phone IN ({placeholders}) AND active = 1
+                    ORDER BY name
+                    LIMIT 1
+                """, phones)
+                
+                row = cursor.fetchone()
+                return dict(row) if row else None
+                
+        except Exception as e:
+            logger.error(f"❌ Error getting partner by phone from SQLite: {e}")
+            return None
+    
+    def _get_partner_by_phone_in_postgresql(self, phones: List[str]) -> Optional[Dict[str, Any]]:
+        """Get partner matching any of several phones from PostgreSQL"""
+        try:
+            with self._connection() as conn:
+                with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+                    cursor.execute("""
+                        SELECT 
+                            partner_id as id, 
+                            partner_name as name, 
+                            contact_type as type, 
+                            is_active as active, 
+                            contact_phone as phone,
+                            contact_email as email,
+                            contact_person_name as contact_person
+                        FROM partners
+                        WHERE contact_phone = ANY(%s) AND is_active = true
+                        ORDER BY partner_name
+                        LIMIT 1
+                    """, (phones,))
+                    
+                    row = cursor.fetchone()
+                    return dict(row) if row else None
+                    
+        except Exception as e:
+            logger.error(f"❌ Error getting partner by phone from PostgreSQL: {e}")
+            return None
+    
     # Legacy methods for compatibility
     def get_all_events(self) -> List[Dict[str, Any]]:
         """Legacy method - returns program events for compatibility"""
@@ -659,6 +1017,85 @@ class DatabaseService:
         """Get recent call records - placeholder"""
         return []
     
+    def record_call(self, call: Dict[str, Any]) -> bool:
+        """
+        Record an initiated call in call_logs as soon as Twilio accepts it
+        The dict supplies CALL_RECORD_COLUMNS (missing keys are stored as NULL).
+        If a status callback already created the row, its details are filled
+        in and the newer callback status is kept.
+        """
+        if self.use_sqlite:
+            logger.debug("Call records are not kept in the SQLite fallback")
+            return False
+        
+        row = {column: call.get(column) for column in CALL_RECORD_COLUMNS}
+        try:
+            with self._connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(LOCK_CALL_LOG_SQL, (row['call_sid'],))
+                    cursor.execute(RECORD_CALL_UPDATE_SQL, row)
+                    if cursor.rowcount == 0:
+                        cursor.execute(RECORD_CALL_INSERT_SQL, row)
+            return True
+        except Exception as e:
+            logger.error(f"❌ Error recording call {row['call_sid']}: {e}")
+            return False
+    
+    def count_partners(self) -> int:
+        """Count active partners"""
+        return self._count(
+            "SELECT COUNT(*) FROM partners WHERE active = 1",
+            COUNT_ACTIVE_PARTNERS_SQL
+        )
+    
+    def count_events(self) -> int:
+        """Count active program events"""
+        return self._count(
+            """
+                SELECT COUNT(*)
+                FROM program_events pe
+                JOIN programs p ON pe.program_id = p.id
+                WHERE pe.active = 1
+            """,
+            COUNT_ACTIVE_EVENTS_SQL
+        )
+    
+    def _count(self, sqlite_sql: str, postgresql_sql: str) -> int:
+        """Run a single-value COUNT query against the active backend"""
+        try:
+            if self.use_sqlite:
+                with sqlite3.connect(self.database_path) as conn:
+                    return conn.execute(sqlite_sql).fetchone()[0]
+            with self._connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(postgresql_sql)
+                    return cursor.fetchone()[0]
+        except Exception as e:
+            logger.error(f"❌ Error counting rows: {e}")
+            return 0
+    
+    def update_call_status(self, call_sid: str, call_status: str, duration_seconds: int = None) -> bool:
+        """
+        Store the latest Twilio status (and final duration) on a call
+        A callback for a call that is not recorded yet creates its row;
+        record_call adds the call details when it catches up
+        """
+        if self.use_sqlite:
+            logger.debug("Call records are not kept in the SQLite fallback")
+            return False
+        params = (call_status, duration_seconds, call_sid)
+        try:
+            with self._connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(LOCK_CALL_LOG_SQL, (call_sid,))
+                    cursor.execute(UPDATE_CALL_STATUS_SQL, params)
+                    if cursor.rowcount == 0:
+                        cursor.execute(INSERT_CALL_STATUS_SQL, params)
+                    return True
+        except Exception as e:
+            logger.error(f"❌ Error updating status of call {call_sid}: {e}")
+            return False
+    
     def get_database_stats(self) -> Dict[str, int]:
         """Get database statistics"""
         try:
@@ -676,6 +1113,45 @@ class DatabaseService:
             logger.error(f"❌ Error getting database stats: {e}")
             return {'partners': 0, 'programs': 0, 'events': 0, 'calls': 0}
 
+    def get_dashboard_snapshot(self) -> Dict[str, Any]:
+        """
+        Get everything the /dashboard page renders: partners, programs, events
+        and recent calls. PostgreSQL returns the three lists in one round-trip.
+        
+        The PostgreSQL lists come back through json_agg, so date and timestamp
+        fields (created_at, updated_at, event_date, end_date) are ISO 8601
+        strings rather than the date/datetime objects get_all_partners returns.
+        """
+        try:
+            if self.use_sqlite:
+                partners = self.get_all_partners()
+                programs = self.get_all_programs()
+                events = self.get_program_events()
+            else:
+                partners, programs, events = self._get_dashboard_lists_postgresql()
+        except Exception as e:
+            logger.error(f"❌ Error getting dashboard snapshot: {e}")
+            partners, programs, events = [], [], []
+        
+        return {
+            'partners': partners,
+            'programs': programs,
+            'events': events,
+            'recent_calls': self.get_call_records(10)
+        }
+    
+    def _get_dashboard_lists_postgresql(self):
+        """Get active partners, programs and events from PostgreSQL in one statement"""
+        with self._connection() as conn:
+            with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+                cursor.execute(DASHBOARD_SNAPSHOT_SQL)
+                row = cursor.fetchone()
+                logger.info(
+                    f"📊 Dashboard snapshot: {len(row['partners'])} partners, "
+                    f"{len(row['programs'])} programs, {len(row['events'])} events"
+                )
+                return row['partners'], row['programs'], row['events']
+    
     def get_event_participants(self, event_id: int) -> List[Dict[str, Any]]:
         """Get participants (partners) for a specific event"""
         try:
@@ -690,7 +1166,7 @@ class DatabaseService:
     def _get_event_participants_postgresql(self, event_id: int) -> List[Dict[str, Any]]:
         """Get participants for an event from PostgreSQL"""
         try:
-            with psycopg2.connect(**self.db_config) as conn:
+            with self._connection() as conn:
                 with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
                     query = """
                     SELECT DISTINCT
@@ -728,3 +1204,8 @@ class DatabaseService:
                 'is_active': True
             }
         ]
+
+@functools.lru_cache(maxsize=1)
+def get_database_service() -> DatabaseService:
+    """Get the shared database service (and its connection pool), created on first use"""
+    return DatabaseService()
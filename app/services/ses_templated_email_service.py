@@ -3,13 +3,17 @@ AWS SES Templated Email Service for AI Telecaller System
 Supports 5 templated email types with customizable variables and PDF attachments
 """
 
-import boto3
 import os
 import logging
 import json
 import base64
 from botocore.exceptions import ClientError
-from typing import Dict, Any, Optional
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, Any, List, Optional, Tuple
+from app.utils.aws_clients import get_ses_client
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.application import MIMEApplication
@@ -25,6 +29,82 @@ import io
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Coalesce concurrent templated sends into SendBulkTemplatedEmail calls (opt-in)
+SES_BULK_BATCHING = os.getenv('SES_BULK_BATCHING', 'false').lower() == 'true'
+SES_BULK_WINDOW_SECONDS = int(os.getenv('SES_BULK_WINDOW_MS', '50')) / 1000
+SES_BULK_MAX_DESTINATIONS = 50  # SendBulkTemplatedEmail limit per call
+SES_BULK_WAIT_SECONDS = 30
+
+class SESBulkBatcher:
+    """
+    Collects templated sends for a short window and delivers them with
+    SendBulkTemplatedEmail, up to 50 destinations per (sender, template) call
+    Each submit() returns a Future resolving to the recipient's SES MessageId
+    """
+    
+    def __init__(self, ses_client, window_seconds: float = SES_BULK_WINDOW_SECONDS,
+                 max_destinations: int = SES_BULK_MAX_DESTINATIONS):
+        self.ses_client = ses_client
+        self.window_seconds = window_seconds
+        self.max_destinations = max_destinations
+        self._queue: "queue.Queue[Tuple[str, str, str, Dict[str, Any], Future]]" = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name='ses-bulk-batcher', daemon=True)
+        self._worker.start()
+    
+    def submit(self, sender_email: str, to_email: str, template: str, template_data: Dict[str, Any]) -> Future:
+        """Queue one templated email for the next bulk send"""
+        future = Future()
+        self._queue.put((sender_email, to_email, template, template_data, future))
+        return future
+    
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.window_seconds
+            while len(batch) < self.max_destinations:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            groups: Dict[Tuple[str, str], List] = {}
+            for item in batch:
+                groups.setdefault((item[0], item[2]), []).append(item)
+            for (sender_email, template), items in groups.items():
+                self._send_group(sender_email, template, items)
+    
+    def _send_group(self, sender_email: str, template: str, items: List):
+        """Send one SendBulkTemplatedEmail call and resolve each item's Future"""
+        try:
+            response = self.ses_client.send_bulk_templated_email(
+                Source=sender_email,
+                Template=template,
+                DefaultTemplateData='{}',
+                Destinations=[
+                    {
+                        'Destination': {'ToAddresses': [to_email]},
+                        'ReplacementTemplateData': json.dumps(template_data)
+                    }
+                    for _, to_email, _, template_data, _ in items
+                ]
+            )
+            logger.info(f"📧 Bulk sent {len(items)} {template} emails")
+            for (_, to_email, _, _, future), status in zip(items, response['Status']):
+                if status.get('Status') == 'Success':
+                    future.set_result(status['MessageId'])
+                else:
+                    future.set_exception(RuntimeError(
+                        f"{status.get('Status')}: {status.get('Error', 'send failed')} ({to_email})"
+                    ))
+        except Exception as e:
+            logger.error(f"Error sending bulk {template} emails: {e}")
+            for *_, future in items:
+                if not future.done():
+                    future.set_exception(e)
+
 class SESTemplatedEmailService:
     """
     AWS SES Templated Email Service supporting:
@@ -39,7 +119,7 @@ class SESTemplatedEmailService:
         """Initialize SES client and configuration"""
         try:
             self.aws_region = os.getenv('AWS_REGION', 'us-west-2')
-            self.ses_client = boto3.client('ses', region_name=self.aws_region)
+            self.ses_client = get_ses_client(self.aws_region)
             self.default_sender = os.getenv('SES_SENDER_EMAIL', 'support@f5universe.com')
             logger.info(f"✅ SES Templated Email service initialized for region: {self.aws_region}")
         except Exception as e:
@@ -48,12 +128,30 @@ class SESTemplatedEmailService:
             self.aws_region = os.getenv('AWS_REGION', 'us-west-2')
             self.default_sender = os.getenv('SES_SENDER_EMAIL', 'support@f5universe.com')
         
+        # Shared batcher for templated sends when SES_BULK_BATCHING is enabled
+        self.bulk_batcher = SESBulkBatcher(self.ses_client) if SES_BULK_BATCHING and self.ses_client else None
+        
         # Default brand settings
         self.default_brand_logo = "https://app.chatmaven.ai/assets/logo.png"
         self.default_bg_color = "#f8f9fa"
         
         logger.info("SESTemplatedEmailService initialized")
 
+    def _send_templated_email(self, sender_email: str, to_email: str, template: str,
+                              template_data: Dict[str, Any]) -> str:
+        """Send one templated email, through the bulk batcher when enabled; returns the MessageId"""
+        if self.bulk_batcher:
+            future = self.bulk_batcher.submit(sender_email, to_email, template, template_data)
+            return future.result(timeout=SES_BULK_WAIT_SECONDS)
+        
+        response = self.ses_client.send_templated_email(
+            Source=sender_email,
+            Destination={'ToAddresses': [to_email]},
+            Template=template,
+            TemplateData=json.dumps(template_data)
+        )
+        return response['MessageId']
+
     def create_ses_templates(self) -> Dict[str, Any]:
         """
         Create all 5 SES email templates
@@ -130,17 +228,12 @@ class SESTemplatedEmailService:
             }
             
             # Send templated email
-            response = self.ses_client.send_templated_email(
-                Source=sender_email,
-                Destination={'ToAddresses': [to_email]},
-                Template='AccountSignupTemplate',
-                TemplateData=json.dumps(template_data)
-            )
+            message_id = self._send_templated_email(sender_email, to_email, 'AccountSignupTemplate', template_data)
             
             return {
                 'success': True,
                 'message': f'Account signup email sent to {to_email}',
-                'message_id': response['MessageId'],
+                'message_id': message_id,
                 'template': 'AccountSignupTemplate'
             }
             
@@ -179,17 +272,12 @@ class SESTemplatedEmailService:
             }
             
             # Send templated email
-            response = self.ses_client.send_templated_email(
-                Source=sender_email,
-                Destination={'ToAddresses': [to_email]},
-                Template='ForgotPasswordTemplate',
-                TemplateData=json.dumps(template_data)
-            )
+            message_id = self._send_templated_email(sender_email, to_email, 'ForgotPasswordTemplate', template_data)
             
             return {
                 'success': True,
                 'message': f'Password reset email sent to {to_email}',
-                'message_id': response['MessageId'],
+                'message_id': message_id,
                 'template': 'ForgotPasswordTemplate'
             }
             
@@ -228,17 +316,12 @@ class SESTemplatedEmailService:
             }
             
             # Send templated email
-            response = self.ses_client.send_templated_email(
-                Source=sender_email,
-                Destination={'ToAddresses': [to_email]},
-                Template='OTPTemplate',
-                TemplateData=json.dumps(template_data)
-            )
+            message_id = self._send_templated_email(sender_email, to_email, 'OTPTemplate', template_data)
             
             return {
                 'success': True,
                 'message': f'OTP email sent to {to_email}',
-                'message_id': response['MessageId'],
+                'message_id': message_id,
                 'template': 'OTPTemplate'
             }
             
@@ -283,17 +366,12 @@ class SESTemplatedEmailService:
             }
             
             # Send templated email
-            response = self.ses_client.send_templated_email(
-                Source=sender_email,
-                Destination={'ToAddresses': [to_email]},
-                Template='OrderConfirmationTemplate',
-                TemplateData=json.dumps(template_data)
-            )
+            message_id = self._send_templated_email(sender_email, to_email, 'OrderConfirmationTemplate', template_data)
             
             return {
                 'success': True,
                 'message': f'Order confirmation email sent to {to_email}',
-                'message_id': response['MessageId'],
+                'message_id': message_id,
                 'template': 'OrderConfirmationTemplate'
             }
             
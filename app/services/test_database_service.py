@@ -0,0 +1,135 @@
+"""
+Tests for DatabaseService's lookups and call log writes against a real PostgreSQL
+Set TEST_DATABASE_URL to a scratch database to run them; tables are created
+in their own schema and dropped afterwards
+Run with: TEST_DATABASE_URL=postgresql://... python -m pytest app/services/test_database_service.py
+"""
+
+import os
+
+import psycopg2
+import psycopg2.extensions
+import pytest
+
+from app.services.database_service import DatabaseService
+
+TEST_DATABASE_URL = os.getenv('TEST_DATABASE_URL')
+SCHEMA = 'test_database_service'
+
+pytestmark = pytest.mark.skipif(not TEST_DATABASE_URL, reason='TEST_DATABASE_URL is not set')
+
+# Only the columns DatabaseService reads, named as in the production tables
+SCHEMA_SQL = f"""
+    DROP SCHEMA IF EXISTS {SCHEMA} CASCADE;
+    CREATE SCHEMA {SCHEMA};
+    CREATE TABLE {SCHEMA}.partners (
+        partner_id serial PRIMARY KEY,
+        partner_name text NOT NULL,
+        contact_type text,
+        is_active boolean NOT NULL DEFAULT true,
+        contact_phone text,
+        contact_email text,
+        contact_person_name text,
+        create_date timestamp DEFAULT CURRENT_TIMESTAMP,
+        update_date timestamp DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE {SCHEMA}.programs (
+        program_id serial PRIMARY KEY,
+        name text NOT NULL,
+        description text,
+        program_category_id int,
+        is_active boolean NOT NULL DEFAULT true,
+        create_date timestamp DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE {SCHEMA}.call_logs (
+        call_log_id serial PRIMARY KEY,
+        call_sid text,
+        partner_id int,
+        program_event_id int,
+        caller_number text,
+        recipient_number text,
+        call_status text,
+        call_duration_seconds int,
+        created_at timestamp,
+        updated_at timestamp
+    );
+    INSERT INTO {SCHEMA}.partners (partner_id, partner_name, contact_phone, is_active)
+    VALUES (1, 'Active School', '+911234567890', true), (2, 'Closed School', '+919876543210', false);
+    INSERT INTO {SCHEMA}.programs (program_id, name, description, is_active)
+    VALUES (1, 'Data Science', 'Twelve-week course', true), (2, 'Retired Course', 'No longer offered', false);
+"""
+
+def run_sql(statement, params=None):
+    with psycopg2.connect(TEST_DATABASE_URL) as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(statement, params)
+            rows = cursor.fetchall() if cursor.description else None
+    conn.close()
+    return rows
+
+@pytest.fixture
+def db_service(monkeypatch):
+    dsn = psycopg2.extensions.parse_dsn(TEST_DATABASE_URL)
+    monkeypatch.setenv('DB_HOST', dsn.get('host', 'localhost'))
+    monkeypatch.setenv('DB_PORT', dsn.get('port', '5432'))
+    monkeypatch.setenv('DB_NAME', dsn.get('dbname', 'postgres'))
+    monkeypatch.setenv('DB_USER', dsn.get('user', 'postgres'))
+    monkeypatch.setenv('DB_PASSWORD', dsn.get('password', ''))
+    # libpq reads PGOPTIONS, so the service's pooled connections see only the test tables
+    monkeypatch.setenv('PGOPTIONS', f"-c search_path={SCHEMA}")
+    run_sql(SCHEMA_SQL)
+    service = DatabaseService()
+    assert not service.use_sqlite
+    yield service
+    service.get_pool().closeall()
+    run_sql(f"DROP SCHEMA {SCHEMA} CASCADE")
+
+def test_program_by_id_matches_the_program_listing(db_service):
+    listed = {program['id']: program for program in db_service.get_all_programs()}
+
+    program = db_service.get_program_by_id(1)
+
+    assert program == listed[1]
+    assert program['name'] == 'Data Science'
+
+def test_inactive_program_is_only_returned_when_asked(db_service):
+    assert db_service.get_program_by_id(2)['name'] == 'Retired Course'
+    assert db_service.get_program_by_id(2, active_only=True) is None
+    assert db_service.get_program_by_id(1, active_only=True)['name'] == 'Data Science'
+
+def test_partner_by_id_matches_the_partner_listing(db_service):
+    listed = {partner['id']: partner for partner in db_service.get_all_partners()}
+
+    assert db_service.get_partner_by_id(1) == listed[1]
+
+def test_inactive_partner_is_only_returned_when_asked(db_service):
+    assert db_service.get_partner_by_id(2)['name'] == 'Closed School'
+    assert db_service.get_partner_by_id(2, active_only=True) is None
+    assert db_service.get_partner_by_id(1, active_only=True)['phone'] == '+911234567890'
+
+def call_logs():
+    return run_sql(f"""
+        SELECT call_sid, partner_id, program_event_id, recipient_number, call_status, call_duration_seconds
+        FROM {SCHEMA}.call_logs ORDER BY call_log_id
+    """)
+
+def placed_call(status='queued'):
+    return {
+        'call_sid': 'CA1', 'partner_id': 1, 'program_event_id': 7,
+        'caller_number': '+15550001111', 'recipient_number': '+911234567890', 'call_status': status
+    }
+
+def test_status_callback_updates_a_recorded_call(db_service):
+    assert db_service.record_call(placed_call())
+    assert db_service.update_call_status('CA1', 'completed', 42)
+
+    assert call_logs() == [('CA1', 1, 7, '+911234567890', 'completed', 42)]
+
+def test_early_status_callback_is_kept_when_the_call_is_recorded(db_service):
+    assert db_service.update_call_status('CA1', 'ringing')
+    assert db_service.record_call(placed_call('queued'))
+
+    assert call_logs() == [('CA1', 1, 7, '+911234567890', 'ringing', None)]
+
+def test_connection_check(db_service):
+    assert db_service.test_connection()
@@ -0,0 +1,37 @@
+"""
+Tests for TwilioService's connection check
+Run with: python -m pytest app/services/test_twilio_service.py
+"""
+
+from unittest import mock
+
+import pytest
+
+pytest.importorskip('twilio')
+
+from twilio.base.exceptions import TwilioException
+
+from app.services.twilio_service import TwilioService
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.delenv('TWILIO_ACCOUNT_SID', raising=False)
+    monkeypatch.delenv('TWILIO_AUTH_TOKEN', raising=False)
+    return TwilioService()
+
+def test_mock_mode_is_not_connected(service):
+    assert service.mock_mode
+    assert not service.test_connection()
+
+def test_connection_fetches_the_account(service):
+    service.client = mock.Mock()
+    service.config.account_sid = 'AC123'
+
+    assert service.test_connection()
+    service.client.api.accounts.assert_called_once_with('AC123')
+
+def test_rejected_credentials_are_not_connected(service):
+    service.client = mock.Mock()
+    service.client.api.accounts.return_value.fetch.side_effect = TwilioException('Authenticate')
+
+    assert not service.test_connection()
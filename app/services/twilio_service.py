@@ -1,6 +1,9 @@
+import functools
 import os
 import logging
 from typing import Dict, Any, Optional
+from requests.adapters import HTTPAdapter
+from twilio.http.http_client import TwilioHttpClient
 from twilio.rest import Client
 from twilio.base.exceptions import TwilioException
 from datetime import datetime
@@ -11,6 +14,19 @@ from app.models.data_models import TwilioCallResponse, CallStatus
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Keep-alive connections to api.twilio.com shared by every TwilioService; sized for
+# concurrent call batches plus request threads (urllib3's default pool keeps only 10)
+TWILIO_HTTP_POOL_SIZE = int(os.getenv('TWILIO_HTTP_POOL_SIZE', '50'))
+TWILIO_HTTP_TIMEOUT = float(os.getenv('TWILIO_HTTP_TIMEOUT', '10'))
+
+@functools.lru_cache(maxsize=1)
+def get_twilio_http_client() -> TwilioHttpClient:
+    """Get the shared pooled HTTP client for Twilio REST calls, created on first use"""
+    http_client = TwilioHttpClient(pool_connections=True, timeout=TWILIO_HTTP_TIMEOUT)
+    # No automatic retries: a retried POST /Calls could place the same call twice
+    http_client.session.mount('https://', HTTPAdapter(pool_maxsize=TWILIO_HTTP_POOL_SIZE, max_retries=0))
+    return http_client
+
 class TwilioConfig:
     """Twilio configuration class"""
     
@@ -54,7 +70,11 @@ class TwilioService:
             self.client = None
         else:
             try:
-                self.client = Client(self.config.account_sid, self.config.auth_token)
+                self.client = Client(
+                    self.config.account_sid,
+                    self.config.auth_token,
+                    http_client=get_twilio_http_client()
+                )
                 logger.info("✅ TwilioService initialized with real credentials")
                 logger.info("Twilio client initialized successfully")
             except Exception as e:
@@ -223,6 +243,20 @@ class TwilioService:
             logger.error(f"Failed to end call {call_sid}: {e}")
             return False
     
+    def test_connection(self) -> bool:
+        """Check that the Twilio credentials work by fetching the account (False in mock mode)"""
+        
+        if not self.client:
+            return False
+        
+        try:
+            self.client.api.accounts(self.config.account_sid).fetch()
+            return True
+            
+        except TwilioException as e:
+            logger.warning(f"Twilio connection check failed: {e}")
+            return False
+    
     def _create_twiml_url(self, ai_prompt: str, call_metadata: Dict[str, Any] = None) -> str:
         """
         Create TwiML URL for the call
@@ -5,13 +5,13 @@ Single endpoint with multiple template types and consistent body format
 """
 
 import json
-import boto3
 import smtplib
 import logging
 import os
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import Dict, Any
+from app.utils.aws_clients import get_ses_client
 
 # Set up logging
 logger = logging.getLogger()
@@ -22,7 +22,7 @@ class UnifiedTemplatedEmailService:
     
     def __init__(self):
         """Initialize email clients"""
-        self.ses_client = boto3.client('ses', region_name=os.getenv('AWS_REGION', 'us-west-2'))
+        self.ses_client = get_ses_client(os.getenv('AWS_REGION', 'us-west-2'))
         
     def send_templated_email(self, email_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -0,0 +1,146 @@
+"""
+Tests for Idempotency-Key handling on the templated email routes
+Run with: python -m pytest app/test_flask_app.py
+"""
+
+import sys
+import threading
+import types
+
+import pytest
+
+for module in ('flask', 'flask_sock', 'twilio', 'pydantic'):
+    pytest.importorskip(module)
+
+# The RAG and conversation services pull in chromadb and langchain, and the SES
+# service reportlab, at import; the tests replace all three, so import the app
+# against empty stand-ins
+STUBBED_SERVICES = {
+    'app.services.rag_service': 'RAGService',
+    'app.services.conversation_flow': 'ConversationFlow',
+    'app.services.ses_templated_email_service': 'SESTemplatedEmailService',
+}
+stubbed = [name for name in STUBBED_SERVICES if name not in sys.modules]
+for name in stubbed:
+    stub = types.ModuleType(name)
+    setattr(stub, STUBBED_SERVICES[name], None)
+    sys.modules[name] = stub
+try:
+    from app import flask_app
+finally:
+    for name in stubbed:
+        del sys.modules[name]
+
+class FakeService:
+    def __init__(self, *args, **kwargs):
+        self.client = None
+
+class FakeEmailService(FakeService):
+    """Counts OTP sends; each send returns the next canned result"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.sent = []
+        self.results = []
+        self.before_send = None
+
+    def send_otp_email(self, data):
+        if self.before_send:
+            self.before_send()
+        self.sent.append(data)
+        return self.results.pop(0) if self.results else {'success': True, 'message_id': len(self.sent)}
+
+@pytest.fixture
+def services(monkeypatch):
+    email_service = FakeEmailService()
+    monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+    monkeypatch.delenv('GUNICORN_WORKERS', raising=False)
+    monkeypatch.setattr(flask_app, 'DatabaseService', FakeService)
+    monkeypatch.setattr(flask_app, 'TwilioService', FakeService)
+    monkeypatch.setattr(flask_app, 'SESTemplatedEmailService', lambda: email_service)
+    return email_service
+
+@pytest.fixture
+def client(services):
+    app = flask_app.create_flask_app()
+    return app.test_client(), services
+
+def send_otp(test_client, key=None):
+    headers = {'Idempotency-Key': key} if key else {}
+    return test_client.post('/api/templated-email/send-otp', json={'to_email': 'a@example.com', 'otp': '123456'},
+                            headers=headers)
+
+def test_retry_with_same_key_replays_the_response(client):
+    test_client, email_service = client
+
+    first = send_otp(test_client, 'key-1')
+    retry = send_otp(test_client, 'key-1')
+
+    assert len(email_service.sent) == 1
+    assert retry.status_code == first.status_code == 200
+    assert retry.get_data() == first.get_data()
+    assert retry.headers['Idempotent-Replayed'] == 'true'
+    assert 'Idempotent-Replayed' not in first.headers
+
+def test_different_keys_and_missing_keys_send_again(client):
+    test_client, email_service = client
+
+    send_otp(test_client, 'key-1')
+    send_otp(test_client, 'key-2')
+    send_otp(test_client)
+    send_otp(test_client)
+
+    assert len(email_service.sent) == 4
+
+def test_server_error_is_not_replayed(client):
+    test_client, email_service = client
+    email_service.results = [{'success': False, 'error': 'SES throttled'}]
+
+    failed = send_otp(test_client, 'key-1')
+    retry = send_otp(test_client, 'key-1')
+
+    assert failed.status_code == 500
+    assert retry.status_code == 200
+    assert len(email_service.sent) == 2
+
+def test_validation_error_is_replayed(client):
+    test_client, email_service = client
+    headers = {'Idempotency-Key': 'key-1'}
+
+    first = test_client.post('/api/templated-email/send-otp', json={'to_email': 'a@example.com'}, headers=headers)
+    retry = test_client.post('/api/templated-email/send-otp', json={'to_email': 'a@example.com'}, headers=headers)
+
+    assert first.status_code == retry.status_code == 400
+    assert retry.headers['Idempotent-Replayed'] == 'true'
+    assert email_service.sent == []
+
+def test_retry_while_the_first_request_runs_gets_409(client):
+    test_client, email_service = client
+    started, release = threading.Event(), threading.Event()
+    def block():
+        started.set()
+        release.wait(5)
+    email_service.before_send = block
+    first = []
+    worker = threading.Thread(target=lambda: first.append(send_otp(test_client, 'key-1')))
+    worker.start()
+    started.wait(5)
+
+    retry = send_otp(test_client, 'key-1')
+    release.set()
+    worker.join(5)
+
+    assert retry.status_code == 409
+    assert first[0].status_code == 200
+    assert len(email_service.sent) == 1
+
+def test_multiple_workers_are_reported(services, monkeypatch):
+    errors = []
+    monkeypatch.setattr(flask_app.logger, 'error', errors.append)
+
+    flask_app.create_flask_app()
+    assert errors == []
+
+    monkeypatch.setenv('GUNICORN_WORKERS', '4')
+    flask_app.create_flask_app()
+    assert len(errors) == 1 and 'GUNICORN_WORKERS=4' in errors[0]
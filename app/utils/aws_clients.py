@@ -0,0 +1,32 @@
+"""
+Shared AWS clients
+boto3 clients are thread-safe, so one per region keeps its HTTPS connections
+alive across sends (and across warm Lambda invocations) instead of
+re-handshaking for every service instance
+"""
+
+import functools
+import os
+
+import boto3
+from botocore.config import Config
+
+# Sized for the email job pool plus concurrent request threads
+SES_MAX_POOL_CONNECTIONS = int(os.getenv('SES_MAX_POOL_CONNECTIONS', '50'))
+
+SES_CLIENT_CONFIG = Config(
+    max_pool_connections=SES_MAX_POOL_CONNECTIONS,
+    tcp_keepalive=True,
+    connect_timeout=3,
+    read_timeout=10,
+    retries={'max_attempts': 5, 'mode': 'adaptive'}
+)
+
+@functools.lru_cache(maxsize=None)
+def get_ses_client(region_name: str = None):
+    """Get the shared SES client for a region, created on first use"""
+    return boto3.client(
+        'ses',
+        region_name=region_name or os.getenv('AWS_REGION', 'us-west-2'),
+        config=SES_CLIENT_CONFIG
+    )
@@ -0,0 +1,47 @@
+"""
+In-process background jobs with pollable status
+Used to take slow SES/Twilio work off the HTTP request path
+"""
+
+import concurrent.futures
+import logging
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+from app.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+class BackgroundJobs:
+    """Run callables on a bounded thread pool and keep their outcome for polling"""
+
+    def __init__(self, max_workers: int = 4, status_ttl: float = 3600, name: str = 'background-job'):
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix=name
+        )
+        self._status = TTLCache(ttl=status_ttl, maxsize=4096)
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> str:
+        """Queue fn(*args, **kwargs) and return its job id"""
+        job_id = uuid.uuid4().hex
+        self._status.set(job_id, {'status': 'queued'})
+        self._executor.submit(self._run, job_id, fn, args, kwargs)
+        return job_id
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job's status dict, or None if it is unknown or expired"""
+        return self._status.get(job_id)
+
+    def _run(self, job_id: str, fn: Callable[..., Any], args: tuple, kwargs: dict):
+        self._status.set(job_id, {'status': 'running'})
+        try:
+            result = fn(*args, **kwargs)
+            self._status.set(job_id, {'status': 'completed', 'result': result})
+        except Exception as e:
+            logger.error(f"Background job {job_id} failed: {e}")
+            self._status.set(job_id, {'status': 'failed', 'error': str(e)})
+
+def wants_async(request) -> bool:
+    """Check whether the client asked for a 202 + job id (RFC 7240 Prefer: respond-async)"""
+    return 'respond-async' in request.headers.get('Prefer', '').lower()
@@ -0,0 +1,63 @@
+"""
+Move log output off request threads
+Root handlers are swapped for a QueueHandler; a QueueListener thread does the
+formatting and stream writes, so a log call no longer blocks on stderr
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+_listener = None
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line (tracebacks arrive already merged into msg)"""
+
+    def format(self, record):
+        entry = {
+            'ts': record.created,
+            'lvl': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage()
+        }
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(entry, default=str).decode('utf-8')
+        return json.dumps(entry, default=str)
+
+def configure_queued_logging(json_format: bool = None) -> None:
+    """
+    Route root logging through a queue drained by a background listener
+    json_format defaults to LOG_FORMAT=json; safe to call more than once
+    """
+    global _listener
+    if _listener is not None:
+        return
+    if json_format is None:
+        json_format = os.getenv('LOG_FORMAT', 'text').lower() == 'json'
+
+    root = logging.getLogger()
+    handlers = root.handlers[:] or [logging.StreamHandler(sys.stderr)]
+    if json_format:
+        for handler in handlers:
+            handler.setFormatter(JsonFormatter())
+
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(queue.SimpleQueue()))
+
+    _listener = logging.handlers.QueueListener(
+        root.handlers[0].queue, *handlers, respect_handler_level=True
+    )
+    _listener.start()
+    # Flush whatever is still queued when the process exits
+    atexit.register(_listener.stop)
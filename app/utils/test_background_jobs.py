@@ -0,0 +1,47 @@
+"""
+Tests for the pollable background job runner
+Run with: python -m pytest app/utils/test_background_jobs.py
+"""
+
+import threading
+
+from app.utils.background_jobs import BackgroundJobs, wants_async
+
+def wait_for(jobs, job_id, status):
+    for _ in range(200):
+        if jobs.status(job_id)['status'] == status:
+            return jobs.status(job_id)
+        threading.Event().wait(0.01)
+    raise AssertionError(f"job {job_id} never reached {status}: {jobs.status(job_id)}")
+
+def test_job_result_is_kept_for_polling():
+    jobs = BackgroundJobs(max_workers=1)
+    release = threading.Event()
+
+    job_id = jobs.submit(lambda value: release.wait(5) and value, 'sent')
+    assert jobs.status(job_id)['status'] in ('queued', 'running')
+    release.set()
+
+    assert wait_for(jobs, job_id, 'completed')['result'] == 'sent'
+
+def test_failed_job_reports_its_error():
+    jobs = BackgroundJobs(max_workers=1)
+
+    def fail():
+        raise RuntimeError('SES throttled')
+
+    job_id = jobs.submit(fail)
+
+    assert wait_for(jobs, job_id, 'failed')['error'] == 'SES throttled'
+
+def test_unknown_job_has_no_status():
+    assert BackgroundJobs(max_workers=1).status('missing') is None
+
+class FakeRequest:
+    def __init__(self, headers):
+        self.headers = headers
+
+def test_wants_async_reads_the_prefer_header():
+    assert wants_async(FakeRequest({'Prefer': 'respond-async, wait=10'}))
+    assert wants_async(FakeRequest({'Prefer': 'Respond-Async'}))
+    assert not wants_async(FakeRequest({}))
@@ -0,0 +1,74 @@
+"""
+Tests for the in-process TTL cache
+Run with: python -m pytest app/utils/test_ttl_cache.py
+"""
+
+import types
+
+import pytest
+
+from app.utils import ttl_cache
+from app.utils.ttl_cache import TTLCache
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace the cache's monotonic clock with one the test moves by hand"""
+    fake = types.SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(ttl_cache, 'time', types.SimpleNamespace(monotonic=lambda: fake.now))
+    return fake
+
+def test_entry_expires_after_ttl(clock):
+    cache = TTLCache(ttl=10)
+    cache.set('key', 'value')
+
+    clock.now += 9
+    assert cache.get('key') == 'value'
+    clock.now += 1
+    assert cache.get('key') is None
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = TTLCache(ttl=10, maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+
+    assert cache.get('a') == 1
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
+
+def test_add_only_stores_missing_or_expired_keys(clock):
+    cache = TTLCache(ttl=10)
+
+    assert cache.add('key', 'first')
+    assert not cache.add('key', 'second')
+    assert cache.get('key') == 'first'
+
+    clock.now += 10
+    assert cache.add('key', 'third')
+    assert cache.get('key') == 'third'
+
+def test_get_or_load_caches_values_but_not_none(clock):
+    cache = TTLCache(ttl=10)
+    calls = []
+    def loader(value):
+        def load():
+            calls.append(value)
+            return value
+        return load
+
+    assert cache.get_or_load('hit', loader('row')) == 'row'
+    assert cache.get_or_load('hit', loader('other')) == 'row'
+    assert cache.get_or_load('miss', loader(None)) is None
+    assert cache.get_or_load('miss', loader(None)) is None
+    assert calls == ['row', None, None]
+
+def test_pop_and_clear(clock):
+    cache = TTLCache(ttl=10)
+    cache.set('a', 1)
+    cache.set('b', 2)
+
+    assert cache.pop('a') == 1
+    assert cache.pop('a') is None
+    cache.clear()
+    assert cache.get('b') is None
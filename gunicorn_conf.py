@@ -0,0 +1,27 @@
+"""
+Gunicorn configuration for the telecaller Flask app
+
+    gunicorn -c gunicorn_conf.py 'app.flask_app:create_flask_app()'
+
+One process with many threads by default: call/email job status, caches and
+Twilio media streams all live in process memory, and every open media stream
+WebSocket holds a worker thread for the length of the call. Raise
+GUNICORN_WORKERS only behind a load balancer with sticky sessions.
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+
+workers = int(os.getenv('GUNICORN_WORKERS', '1'))
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', '32'))
+
+# Twilio and SES calls can hold a request for several seconds
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '60'))
+graceful_timeout = 30
+keepalive = 30
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.getenv('LOG_LEVEL', 'info').lower()
@@ -0,0 +1,14 @@
+-- Materialized snapshot of getcallstobedone() for the IVR scheduler
+-- Read by DatabaseAccess.call_getcallstobedone() when USE_CALLS_TODO_MATVIEW=true
+-- and refreshed out of band by scripts/refresh_calls_todo.py (--loop refreshes every
+-- CALLS_TODO_REFRESH_SECONDS, default 30); readers never refresh it
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_calls_todo AS
+SELECT * FROM getcallstobedone();
+
+-- REFRESH ... CONCURRENTLY requires a unique index on the view
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_calls_todo_event
+    ON mv_calls_todo (scheduled_job_event_id);
+
+CREATE INDEX IF NOT EXISTS idx_mv_calls_todo_call_datetime
+    ON mv_calls_todo (call_datetime);
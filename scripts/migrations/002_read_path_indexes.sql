@@ -0,0 +1,34 @@
+-- Indexes backing the filter + ORDER BY of DatabaseAccess read queries
+-- Verify with EXPLAIN ANALYZE after applying, e.g.:
+--   EXPLAIN ANALYZE SELECT * FROM program_events
+--   WHERE start_date >= CURRENT_DATE AND start_date <= CURRENT_DATE + 30
+--   ORDER BY start_date;
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- get_scheduled_jobs / get_scheduled_job_events: ORDER BY scheduled_at
+CREATE INDEX IF NOT EXISTS idx_scheduled_jobs_scheduled_at
+    ON scheduled_jobs (scheduled_at);
+
+-- get_scheduled_job_events(job_id): WHERE scheduled_job_id ORDER BY scheduled_job_event_id
+CREATE INDEX IF NOT EXISTS idx_scheduled_job_events_job
+    ON scheduled_job_events (scheduled_job_id, scheduled_job_event_id);
+
+-- get_upcoming_events / get_program_events: range and ORDER BY on start_date
+CREATE INDEX IF NOT EXISTS idx_program_events_start_date
+    ON program_events (start_date);
+
+CREATE INDEX IF NOT EXISTS idx_program_events_program_start
+    ON program_events (program_id, start_date);
+
+-- get_partners(partner_type): WHERE is_active AND contact_type
+CREATE INDEX IF NOT EXISTS idx_partners_active_type
+    ON partners (is_active, contact_type);
+
+-- get_call_logs(scheduled_job_id): WHERE scheduled_job_id ORDER BY call_log_id DESC
+CREATE INDEX IF NOT EXISTS idx_call_logs_job_log
+    ON call_logs (scheduled_job_id, call_log_id DESC);
+
+-- search_programs_by_name: LOWER(name) LIKE LOWER(:search_term)
+CREATE INDEX IF NOT EXISTS idx_programs_name_trgm
+    ON programs USING gin (LOWER(name) gin_trgm_ops);
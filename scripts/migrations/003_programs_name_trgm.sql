@@ -0,0 +1,9 @@
+-- search_programs_by_name matches with ILIKE, which pg_trgm indexes directly,
+-- so the LOWER(name) expression index from 002 is no longer needed
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_programs_name_ilike_trgm
+    ON programs USING gin (name gin_trgm_ops);
+
+DROP INDEX IF EXISTS idx_programs_name_trgm;
@@ -0,0 +1,17 @@
+-- Indexes for the TelecallerDBQueries (postgres_models.py) filter + sort paths
+-- CREATE INDEX CONCURRENTLY cannot run inside a transaction block: apply with
+-- psql in autocommit mode, then confirm the LIMIT queries use them, e.g.:
+--   EXPLAIN (ANALYZE, BUFFERS)
+--   SELECT * FROM call_logs WHERE partner_id = 1 ORDER BY created_at DESC LIMIT 50;
+
+-- get_program_events(program_id): WHERE program_id ORDER BY event_datetime DESC
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_program_events_pid_time
+    ON program_events (program_id, event_datetime DESC);
+
+-- get_call_logs(partner_id): WHERE partner_id ORDER BY created_at DESC
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_call_logs_partner_created
+    ON call_logs (partner_id, created_at DESC);
+
+-- get_call_logs() without a partner filter: ORDER BY created_at DESC
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_call_logs_created
+    ON call_logs (created_at DESC);
@@ -0,0 +1,11 @@
+-- Keyset pagination in get_call_logs orders by (created_at, call_log_id);
+-- extend the 004 indexes with the tiebreaker so each page is a range scan
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_call_logs_partner_created_id
+    ON call_logs (partner_id, created_at DESC, call_log_id DESC);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_call_logs_created_id
+    ON call_logs (created_at DESC, call_log_id DESC);
+
+DROP INDEX CONCURRENTLY IF EXISTS ix_call_logs_partner_created;
+DROP INDEX CONCURRENTLY IF EXISTS ix_call_logs_created;
@@ -0,0 +1,8 @@
+-- Index for DatabaseService.get_partner_by_phone_in (voice webhook call context)
+-- CREATE INDEX CONCURRENTLY cannot run inside a transaction block: apply with
+-- psql in autocommit mode, then confirm the lookup uses it, e.g.:
+--   EXPLAIN ANALYZE SELECT partner_id FROM partners
+--   WHERE contact_phone = ANY('{+917276082005}') AND is_active = true;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_partners_contact_phone
+    ON partners (contact_phone);
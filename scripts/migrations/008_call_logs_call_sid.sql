@@ -0,0 +1,9 @@
+-- Index for call log lookups by Twilio CallSid:
+--   TelecallerDBQueries.get_call_log_by_sid (webhook and call status routes)
+--   DatabaseService.update_call_status (Flask status callback)
+-- CREATE INDEX CONCURRENTLY cannot run inside a transaction block: apply with
+-- psql in autocommit mode, then confirm the lookup uses it, e.g.:
+--   EXPLAIN ANALYZE SELECT call_log_id FROM call_logs WHERE call_sid = 'CA123';
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_call_logs_call_sid
+    ON call_logs (call_sid);
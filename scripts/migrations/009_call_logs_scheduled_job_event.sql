@@ -0,0 +1,9 @@
+-- Index for the live "already called" filter applied to mv_calls_todo:
+--   DatabaseAccess.call_getcallstobedone (USE_CALLS_TODO_MATVIEW=true)
+-- mv_calls_todo is now refreshed by scripts/refresh_calls_todo.py (cron or
+-- --loop) rather than by the pollers that read it.
+-- CREATE INDEX CONCURRENTLY cannot run inside a transaction block: apply with
+-- psql in autocommit mode.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_call_logs_scheduled_job_event
+    ON call_logs (scheduled_job_event_id);
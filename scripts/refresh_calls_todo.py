@@ -0,0 +1,40 @@
+"""
+Refresh the mv_calls_todo materialized view outside the request path
+
+    python scripts/refresh_calls_todo.py             # refresh once (cron / EventBridge)
+    python scripts/refresh_calls_todo.py --loop      # refresh every CALLS_TODO_REFRESH_SECONDS
+
+DatabaseAccess.call_getcallstobedone() only reads the view when
+USE_CALLS_TODO_MATVIEW=true; pollers never refresh it themselves.
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.database.postgres_data_access import CALLS_TODO_REFRESH_SECONDS, db_access
+
+logger = logging.getLogger(__name__)
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--loop', action='store_true', help='keep refreshing on an interval')
+    parser.add_argument('--interval', type=int, default=CALLS_TODO_REFRESH_SECONDS,
+                        help='seconds between refreshes with --loop')
+    args = parser.parse_args()
+
+    if not args.loop:
+        return 0 if db_access.refresh_calls_todo() else 1
+
+    while True:
+        started = time.monotonic()
+        if not db_access.refresh_calls_todo():
+            logger.warning("mv_calls_todo refresh failed; retrying next interval")
+        time.sleep(max(0.0, args.interval - (time.monotonic() - started)))
+
+if __name__ == '__main__':
+    sys.exit(main())